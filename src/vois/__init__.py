@@ -1 +1,20 @@
-__version__ = '1.0.44'
\ No newline at end of file
+__version__ = '1.0.44'
+
+import importlib
+
+# Submodules and subpackages that can be accessed as attributes of the package (i.e. vois.svgMap) without
+# an explicit import: they are imported only when accessed for the first time (PEP 562)
+_lazy_modules = ['assetCache', 'colors', 'cssUtils', 'download', 'eucountries', 'geojsonUtils', 'interMap', 'ipytrees', 'jsBridge', 'leafletMap',
+                 'profiling', 'scheduler', 'svgBarChart', 'svgBubblesChart', 'svgGraph', 'svgHeatmap', 'svgMap', 'svgPackedCirclesChart',
+                 'svgRankChart', 'svgUtils', 'svgWriter', 'textpopup', 'treemapPlotly', 'urlOpen', 'urlUpdate',
+                 'geo', 'templates', 'vuetify']
+
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_modules))
@@ -0,0 +1,273 @@
+"""Process-wide cache of the images and SVG files encoded as data URLs, with generation of thumbnails"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2025
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+from collections import OrderedDict
+from io import BytesIO
+import threading
+import hashlib
+import base64
+import re
+import os
+
+
+# Maximum total size in characters of the data URLs kept in memory (the least recently used ones are discarded first)
+max_memory = 128*1024*1024
+
+# Folder where the thumbnails are persisted on disk (None means that the thumbnails are kept only in memory)
+cache_folder = None
+
+# Quality of the JPEG thumbnails
+thumbnail_quality = 85
+
+# MIME types of the image files
+MIME_TYPES = { 'jpg': 'jpeg', 'jpeg': 'jpeg', 'png': 'png', 'gif': 'gif', 'webp': 'webp', 'bmp': 'bmp', 'svg': 'svg+xml', 'ico': 'x-icon' }
+
+
+# Cache: key --> data URL
+_cache = OrderedDict()
+_size  = 0
+_lock  = threading.Lock()
+
+
+# Returns the key of a file, or None if the file doesn't exist
+def fileKey(filepath, *variant):
+    """
+    Returns the key that identifies the current version of a file in the cache: the absolute path, the modification time and the size of the file, followed by the variant parameters. Returns None if the file doesn't exist.
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the file
+    *variant
+        Additional values that identify a variant of the file (for instance the size of a thumbnail)
+    """
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (os.path.abspath(filepath), st.st_mtime_ns, st.st_size) + variant
+
+
+# Returns a value from the cache, or None
+def get(key):
+    with _lock:
+        value = _cache.get(key, None)
+        if not value is None:
+            _cache.move_to_end(key)
+        return value
+
+
+# Store a value in the cache, discarding the least recently used values if the cache exceeds max_memory
+def put(key, value):
+    global _size
+    with _lock:
+        if key in _cache:
+            _size -= len(_cache.pop(key))
+        _cache[key] = value
+        _size += len(value)
+        while _size > max_memory and len(_cache) > 1:
+            k, v = _cache.popitem(last=False)
+            _size -= len(v)
+    return value
+
+
+# Remove all the values from the in-memory cache
+def clear():
+    """
+    Remove all the data URLs from the in-memory cache (the thumbnails persisted in the cache_folder are not deleted).
+    """
+    global _size
+    with _lock:
+        _cache.clear()
+        _size = 0
+
+
+# Returns the data URL of a bytes object
+def dataURL(data, mimetype):
+    return 'data:%s;base64,' % mimetype + base64.b64encode(data).decode('ascii')
+
+
+# Returns the MIME type of an image file from its extension
+def imageMimeType(filepath, imagetype=None):
+    if imagetype is None:
+        imagetype = os.path.splitext(filepath)[1][1:].lower()
+    return 'image/' + MIME_TYPES.get(imagetype.lower(), imagetype.lower())
+
+
+# Returns the bytes of a thumbnail of an image file and its format
+def makeThumbnail(filepath, width, height):
+    from PIL import Image
+
+    with Image.open(filepath) as img:
+        img.thumbnail((width, height))
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            format = 'png'
+            params = { 'optimize': True }
+        else:
+            format = 'jpeg'
+            params = { 'quality': thumbnail_quality, 'optimize': True }
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+        buffered = BytesIO()
+        img.save(buffered, format=format.upper(), **params)
+    return buffered.getvalue(), format
+
+
+# Returns the data URL of an image file, optionally downscaled
+def imageURL(filepath, imagetype=None, width=None, height=None):
+    """
+    Returns the data URL of a local image file, to be used as the src of a v.Img ipyvuetify widget or of an <img> tag. The data URLs are cached by path, modification time and size of the file, so the file is read and encoded only once.
+    If width or height is given, a downscaled thumbnail is generated using PIL (only once, and persisted in the cache_folder if it is not None): the image is resized preserving its aspect ratio to fit inside width x height pixels.
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the image file
+    imagetype : str, optional
+        Type of the image used in the data URL when no thumbnail is generated (default is None, which means that the type is deduced from the extension of the file)
+    width : int, optional
+        Maximum width in pixels of the thumbnail (default is None)
+    height : int, optional
+        Maximum height in pixels of the thumbnail (default is None)
+
+    Returns
+    -------
+    a string containing the data URL
+
+    Example
+    -------
+    Display the thumbnail of a large image::
+
+        from vois import assetCache
+        import ipyvuetify as v
+
+        v.Img(src=assetCache.imageURL('graphics/background.jpg', width=200, height=150), max_width=200)
+
+    """
+    if width is None and height is None:
+        key = fileKey(filepath, imagetype)
+        value = None if key is None else get(key)
+        if value is None:
+            with open(filepath, 'rb') as f:
+                value = dataURL(f.read(), imageMimeType(filepath, imagetype))
+            if not key is None:
+                put(key, value)
+        return value
+
+    if width  is None: width  = height
+    if height is None: height = width
+    key = fileKey(filepath, int(width), int(height))
+    value = None if key is None else get(key)
+    if not value is None:
+        return value
+
+    # Thumbnail persisted on disk
+    diskpath = None
+    if not cache_folder is None and not key is None:
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        for format in ['jpeg', 'png']:
+            path = os.path.join(cache_folder, '%s.%s' % (name, format))
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    return put(key, dataURL(f.read(), 'image/' + format))
+        diskpath = os.path.join(cache_folder, name)
+
+    data, format = makeThumbnail(filepath, int(width), int(height))
+    if not diskpath is None:
+        try:
+            os.makedirs(cache_folder, exist_ok=True)
+            with open('%s.%s' % (diskpath, format), 'wb') as f:
+                f.write(data)
+        except OSError:
+            pass
+
+    value = dataURL(data, 'image/' + format)
+    if not key is None:
+        put(key, value)
+    return value
+
+
+# Set an attribute on the root <svg> tag of an SVG text, replacing its value if the attribute is already present
+def setRootAttribute(svgtext, name, value):
+    tag = re.search(r'<svg\b[^>]*>', svgtext)
+    if tag is None:
+        return svgtext
+    attribute = '%s="%s"' % (name, value)
+    text, count = re.subn(r'(?<=\s)%s\s*=\s*("[^"]*"|\'[^\']*\')' % re.escape(name), lambda m: attribute, tag.group(0), count=1)
+    if count == 0:
+        text = '<svg ' + attribute + tag.group(0)[4:]
+    return svgtext[:tag.start()] + text + svgtext[tag.end():]
+
+
+# Returns the data URL of an SVG file
+def svgURL(filepath, fill=None, stroke=None):
+    """
+    Returns the data URL of a local SVG file, optionally setting the fill and stroke attributes of its root <svg> tag (the values already present are replaced). The data URLs are cached by path, modification time and size of the file and by the fill and stroke values.
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the SVG file
+    fill : str, optional
+        Value of the fill attribute to set on the <svg> tag (default is None)
+    stroke : str, optional
+        Value of the stroke attribute to set on the <svg> tag (default is None)
+
+    Returns
+    -------
+    a string containing the data URL
+    """
+    key = fileKey(filepath, 'svg', fill, stroke)
+    value = None if key is None else get(key)
+    if value is None:
+        with open(filepath, 'r') as f:
+            svgtext = f.read()
+
+        if not fill   is None: svgtext = setRootAttribute(svgtext, 'fill',   fill)
+        if not stroke is None: svgtext = setRootAttribute(svgtext, 'stroke', stroke)
+
+        value = "data:image/svg+xml;base64, %s" % base64.b64encode(bytes(svgtext,'utf-8')).decode('ascii')
+        if not key is None:
+            put(key, value)
+    return value
+
+
+# Returns the data URL of a local image file, or the URL itself if it is not the path of a local file
+def localURL(url, width=None, height=None):
+    """
+    Returns the cached data URL (or thumbnail, if width or height is given) of an image, if url is the path of a local file, otherwise returns url unchanged. This lets the widgets accept both URLs and paths of local files (see :func:`imageURL`).
+
+    Parameters
+    ----------
+    url : str
+        URL of an image or path of a local image file
+    width : int, optional
+        Maximum width in pixels of the thumbnail (default is None)
+    height : int, optional
+        Maximum height in pixels of the thumbnail (default is None)
+
+    Returns
+    -------
+    a string
+    """
+    if not isinstance(url, str) or len(url) == 0 or url.startswith('data:') or not os.path.isfile(url):
+        return url
+    if url.lower().endswith('.svg'):
+        return svgURL(url)
+    return imageURL(url, width=width, height=height)
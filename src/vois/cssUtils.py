@@ -23,6 +23,15 @@ from IPython.display import HTML as ipyHTML
 import ipyvuetify as v
 
 from vois.vuetify import settings, iconButton
+from vois import jsBridge
+
+
+# Inject a <style> command: inside the output widget through its jsBridge (each style is injected only once, identified by a key) or directly in the notebook
+def injectStyle(command, key, output=None):
+    if output is None:
+        display(HTML(command))
+    else:
+        jsBridge.getBridge(output).injectCSS(command, key=key)
 
 
 ###########################################################################################################################################################################
@@ -38,11 +47,7 @@ def dialogBoxesLeftMargin(output=None):
 }
 </style>'''
     
-    if output is None:
-        display(HTML(command))
-    else:
-        with output:
-            display(HTML(command))
+    injectStyle(command, 'dialogBoxesLeftMargin', output)
 
             
 
@@ -77,11 +82,7 @@ def popupDisplay(output=None):
 }
 </style>'''
 
-    if output is None:
-        display(HTML(command))
-    else:
-        with output:
-            display(HTML(command))
+    injectStyle(command, 'popupDisplay', output)
 
             
             
@@ -96,11 +97,7 @@ def switchFontSize(output=None, size=14):
 }
 </style>'''%int(size)
     
-    if output is None:
-        display(HTML(command))
-    else:
-        with output:
-            display(HTML(command))
+    injectStyle(command, 'switchFontSize', output)
 
     
 ###########################################################################################################################################################################
@@ -116,11 +113,7 @@ def CardOpacityOnFocus(output=None, opacity=0.1):
 }
 </style>'''%(float(opacity))
     
-    if output is None:
-        display(HTML(command))
-    else:
-        with output:
-            display(HTML(command))
+    injectStyle(command, 'CardOpacityOnFocus', output)
 
             
 ###########################################################################################################################################################################
@@ -148,5 +141,4 @@ def copyToClipboard(txt, output=None):
     if output is None:
         display(ipyHTML(command))
     else:
-        with output:
-            display(ipyHTML(command))
+        jsBridge.getBridge(output).copyToClipboard(txt)
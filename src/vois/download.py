@@ -19,14 +19,291 @@
 # limitations under the Licence.
 
 from ipywidgets import widgets, Layout
-from IPython.display import display, HTML
+import ipyvuetify as v
+import traitlets
+import itertools
 import base64
+import zipfile
+import zlib
+import json
+import os
+
+
+# Default size in bytes of the chunks sent to the browser
+CHUNK_SIZE = 1024*1024
+
+# Default number of rows serialized at a time by the export functions
+CHUNK_ROWS = 50000
+
+# Formats and compressions managed by the export functions
+EXPORT_FORMATS      = ['csv', 'parquet', 'geojson']
+EXPORT_COMPRESSIONS = [None, 'gzip', 'zip']
 
 
 # Output widget that needs to be visualized inside the notebook in order for the download to work!!!
 output = widgets.Output(layout=Layout(width='0px', min_width='0px', height='0px', min_height='0px'))
 
 
+# Returns an iterator on the chunks of bytes of a source (bytes-like object, path of a file, binary file object or iterable of bytes/str)
+def iterChunks(source, chunksize=CHUNK_SIZE):
+    """
+    Returns an iterator that yields the content of a source as chunks of bytes having at most chunksize bytes. Only one chunk at a time is kept in memory when the source is a file or a generator.
+
+    Parameters
+    ----------
+        source : bytes-like object, str, file object or iterable
+            Content to split in chunks: a bytes, bytearray or memoryview object, the path of a file, a file object opened in binary mode or an iterable (for instance a generator) yielding bytes or str (str are encoded in utf-8)
+        chunksize : int, optional
+            Maximum size in bytes of the chunks (default is download.CHUNK_SIZE)
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source).cast('B')
+        for start in range(0, len(view), chunksize):
+            yield bytes(view[start:start+chunksize])
+    elif isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from iterChunks(f, chunksize)
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunksize)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        buffer = bytearray()
+        for piece in source:
+            if isinstance(piece, str):
+                piece = piece.encode('utf-8')
+            buffer += piece
+            while len(buffer) >= chunksize:
+                yield bytes(buffer[:chunksize])
+                del buffer[:chunksize]
+        if len(buffer) > 0:
+            yield bytes(buffer)
+
+
+# Returns the size in bytes of a source, or None if it cannot be known in advance
+def sourceSize(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    return None
+
+
+
+#####################################################################################################################################################
+# Widget that sends files to the browser in chunks
+#####################################################################################################################################################
+class downloader(v.VuetifyTemplate):
+    """
+    Invisible widget that sends files to the browser in chunks: the browser requests the chunks one at a time through the widget comm and assembles them into a Blob that is downloaded when the last chunk has been received. Only one chunk at a time is read from the source and encoded, so that large files can be downloaded without loading them in memory.
+
+    The widget must be displayed in the page for the downloads to work. The :func:`downloadStream` function uses an instance of this class displayed inside the download.output widget, and the :class:`app.app` class creates its own instance.
+
+    Example
+    -------
+    Download of a large file::
+
+        from vois import download
+
+        d = download.downloader()
+        display(d)
+
+        d.start('/path/to/large.gpkg', 'data.gpkg', on_progress=lambda sent, total: print(sent, total))
+
+    """
+
+    pending = traitlets.List([]).tag(sync=True)    # List of the downloads to start in the browser (dicts with keys 'id' and 'name')
+
+    # JavaScript code that subclasses can add to the mounted function, to the watch section and to the methods section of the template
+    jsmounted = ''
+    jswatch   = ''
+    jsmethods = ''
+
+    @traitlets.default('template')
+    def _template(self):
+        return '''
+<template>
+    <div style="display: none;"></div>
+</template>
+
+<script>
+    modules.export = {
+        created() {
+            this.view  = Math.random().toString(36).slice(2);
+            this.parts = {};
+        },
+        mounted() {
+            this.checkPending();%s
+        },
+        watch: {
+            pending() {
+                this.checkPending();
+            },%s
+        },
+        methods: {
+            checkPending() {
+                for (const d of this.pending) {
+                    if (!(d.id in this.parts)) {
+                        this.parts[d.id] = [];
+                        this.pull({id: d.id, seq: 0, view: this.view});
+                    }
+                }
+            },
+            jupyter_chunk(id, seq, view, data, last, name) {
+                const parts = this.parts[id];
+                if (view !== this.view || !parts) return;
+                const bin = atob(data);
+                const arr = new Uint8Array(bin.length);
+                for (let i = 0; i < bin.length; i++) arr[i] = bin.charCodeAt(i);
+                parts.push(arr);
+                if (last) {
+                    const url  = URL.createObjectURL(new Blob(parts, {type: 'application/octet-stream'}));
+                    const link = document.createElement('a');
+                    link.download = name;
+                    link.href = url;
+                    document.body.appendChild(link);
+                    link.click();
+                    link.remove();
+                    delete this.parts[id];
+                    setTimeout(() => URL.revokeObjectURL(url), 30000);
+                } else {
+                    this.pull({id: id, seq: seq+1, view: this.view});
+                }
+            },
+            jupyter_abort(id) {
+                delete this.parts[id];
+            },%s
+        }
+    }
+</script>
+''' % (self.jsmounted, self.jswatch, self.jsmethods)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.streams = {}                # id --> dict with the state of the download
+        self.ids = itertools.count(1)    # Generator of the ids of the downloads
+
+
+    # Start the download of a source
+    def start(self, source, fileName='download.bin', chunksize=CHUNK_SIZE, on_progress=None):
+        """
+        Start the download of a source. The chunks are sent when the browser requests them, so the function returns immediately.
+
+        Parameters
+        ----------
+            source : bytes-like object, str, file object or iterable
+                Content of the file to download (see :func:`iterChunks`)
+            fileName : str, optional
+                Name of the file to download (default is "download.bin")
+            chunksize : int, optional
+                Maximum size in bytes of the chunks (default is download.CHUNK_SIZE)
+            on_progress : function, optional
+                Python function called after each chunk is sent, with two parameters: the number of bytes sent and the total number of bytes (None if the size of the source is not known in advance)
+
+        Returns
+        -------
+        the integer id of the download
+        """
+        id = next(self.ids)
+        self.streams[id] = { 'chunks': iterChunks(source, chunksize), 'seq': 0, 'view': None, 'name': fileName,
+                             'sent': 0, 'total': sourceSize(source), 'on_progress': on_progress, 'next': None }
+        self.pending = self.pending + [{ 'id': id, 'name': fileName }]
+        return id
+
+
+    # Cancel a download
+    def cancel(self, id):
+        """
+        Cancel a download started with the :func:`start` method.
+        """
+        stream = self.streams.pop(id, None)
+        if not stream is None:
+            self.pending = [d for d in self.pending if d['id'] != id]
+            self.send({'method': 'abort', 'args': [id]})
+
+
+    # Request of a chunk from the browser
+    def vue_pull(self, data):
+        stream = self.streams.get(data['id'])
+        if stream is None:
+            return
+
+        # Only the first view that requested the download receives the chunks
+        if stream['view'] is None:
+            stream['view'] = data['view']
+        if data['view'] != stream['view'] or data['seq'] != stream['seq']:
+            return
+
+        try:
+            if stream['seq'] == 0:
+                stream['next'] = next(stream['chunks'], None)
+            chunk = stream['next']
+            if chunk is None:
+                chunk = b''
+            stream['next'] = next(stream['chunks'], None)
+        except:
+            self.cancel(data['id'])
+            raise
+
+        last = stream['next'] is None
+        self.send({'method': 'chunk', 'args': [data['id'], stream['seq'], stream['view'], base64.b64encode(chunk).decode('ascii'), last, stream['name']]})
+        stream['seq']  += 1
+        stream['sent'] += len(chunk)
+
+        if last:
+            self.streams.pop(data['id'], None)
+            self.pending = [d for d in self.pending if d['id'] != data['id']]
+
+        if not stream['on_progress'] is None:
+            stream['on_progress'](stream['sent'], stream['total'])
+
+
+
+# Returns the downloader widget displayed inside the output widget (the jsBridge instance of the output widget)
+def getDownloader():
+    from vois import jsBridge
+    return jsBridge.getBridge(output)
+
+
+# Streaming download of a bytes-like object, a file or an iterable of bytes
+def downloadStream(source, fileName="download.bin", chunksize=CHUNK_SIZE, on_progress=None):
+    """
+    Streaming download of a file: the content is sent to the browser in chunks, so that large files can be downloaded without encoding their full content in memory.
+    
+    Parameters
+    ----------
+        source : bytes-like object, str, file object or iterable
+            Content of the file to download: a bytes, bytearray or memoryview object, the path of a file, a file object opened in binary mode or an iterable (for instance a generator) yielding bytes or str
+        fileName : str, optional
+            Name of the file to download (default is "download.bin")
+        chunksize : int, optional
+            Maximum size in bytes of the chunks (default is download.CHUNK_SIZE)
+        on_progress : function, optional
+            Python function called after each chunk is sent, with two parameters: the number of bytes sent and the total number of bytes (None if the size of the source is not known in advance)
+            
+    Example
+    -------
+    The Output widget download.output must be displayed inside the notebook. Then a large file can be downloaded, or the content generated by a Python generator::
+    
+        from vois import download
+        
+        display(download.output)
+        
+        download.downloadStream('/path/to/large.gpkg', 'data.gpkg')
+        
+        def rows():
+            yield 'id,value\\n'
+            for i in range(1000000):
+                yield '%d,%d\\n' % (i, i*i)
+                
+        download.downloadStream(rows(), 'data.csv', on_progress=lambda sent, total: print(sent))
+    
+    """
+    return getDownloader().start(source, fileName, chunksize=chunksize, on_progress=on_progress)
+
+
 # Direct download of a .txt file containing a string
 def downloadText(textobj, fileName="download.txt"):
     """
@@ -51,25 +328,7 @@ def downloadText(textobj, fileName="download.txt"):
             download.downloadText('aaa bbb ccc')
     
     """
-
-    string_bytes  = textobj.encode("utf-8","ignore")
-    base64_bytes  = base64.b64encode(string_bytes)
-    base64_string = base64_bytes.decode("ascii")
-
-    output.clear_output()
-    with output:
-        display(HTML('\
-<script>function downloadURI(uri, name) \
-{\
-    var link = document.createElement("a");\
-    link.download = name;\
-    link.href = uri;\
-    link.click();\
-}\
-downloadURI("data:application/octet-stream;charset=utf-8;base64,' + base64_string + '","' + fileName + '");\
-</script>'))
-
-    output.clear_output()
+    downloadStream(textobj.encode("utf-8","ignore"), fileName)
         
 
 # Direct download of an array of bytes
@@ -96,20 +355,221 @@ def downloadBytes(bytesobj, fileName="download.bin"):
             download.downloadBytes(bytearray(b'ajgh lkjhl '))
     
     """
+    downloadStream(bytesobj, fileName)
 
-    base64_bytes  = base64.b64encode(bytesobj)
-    base64_string = base64_bytes.decode("ascii")
-
-    output.clear_output()
-    with output:
-        display(HTML('''
-<script>function downloadURI(uri, name)
-{
-    var link = document.createElement("a");
-    link.download = name;
-    link.href = uri;
-    link.click();
-}
-downloadURI("data:application/octet-stream;charset=utf-8;base64,''' + base64_string + '","' + fileName + '");</script>'))
-        
-    output.clear_output()
+
+
+#####################################################################################################################################################
+# Export of DataFrames and GeoJSON datasets with on-the-fly compression
+#####################################################################################################################################################
+
+# Non-seekable file object that collects the bytes written and returns them on demand
+class _bufferSink():
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    # Returns the bytes written since the last call
+    def take(self):
+        data = bytes(self.buffer)
+        self.buffer = bytearray()
+        return data
+
+
+# Serialize a DataFrame as CSV in chunks of rows
+def _csvChunks(df, chunkrows, **kwargs):
+    kwargs.setdefault('index', False)
+    yield df.iloc[:0].to_csv(**kwargs)
+    for start in range(0, len(df), chunkrows):
+        yield df.iloc[start:start+chunkrows].to_csv(header=False, **kwargs)
+
+
+# Serialize a DataFrame as Parquet in row groups of chunkrows rows
+def _parquetChunks(df, chunkrows, **kwargs):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _bufferSink()
+    writer = pq.ParquetWriter(sink, schema, **kwargs)
+    try:
+        for start in range(0, len(df), chunkrows):
+            writer.write_table(pa.Table.from_pandas(df.iloc[start:start+chunkrows], schema=schema, preserve_index=False))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+# Serialize a GeoJSON FeatureCollection (or a geopandas GeoDataFrame) in chunks of features
+def _geojsonChunks(data, chunkrows, **kwargs):
+    if isinstance(data, dict):
+        features = iter(data.get('features', []))
+    elif hasattr(data, 'iterfeatures'):
+        features = data.iterfeatures()
+    else:
+        raise ValueError('GeoJSON export requires a FeatureCollection dict or a GeoDataFrame')
+
+    yield '{"type": "FeatureCollection", "features": ['
+    first = True
+    while True:
+        chunk = [json.dumps(f, **kwargs) for f in itertools.islice(features, chunkrows)]
+        if len(chunk) == 0:
+            break
+        yield ('' if first else ', ') + ', '.join(chunk)
+        first = False
+    yield ']}'
+
+
+# Compress a stream of chunks in gzip format
+def _gzipChunks(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# Compress a stream of chunks as a single member of a zip archive
+def _zipChunks(chunks, memberName):
+    sink = _bufferSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as zf:
+        with zf.open(memberName, mode='w', force_zip64=True) as member:
+            for chunk in chunks:
+                member.write(chunk)
+                data = sink.take()
+                if data:
+                    yield data
+    yield sink.take()
+
+
+# Returns the format and the compression of an export from the extensions of a file name
+def exportFormat(fileName):
+    """
+    Returns the format and the compression of an export deduced from the extensions of a file name (for instance 'data.csv.gz' returns ('csv', 'gzip') and 'data.geojson.zip' returns ('geojson', 'zip')).
+
+    Parameters
+    ----------
+        fileName : str
+            Name of the file
+
+    Returns
+    -------
+    a tuple of two elements: the format (one of download.EXPORT_FORMATS) and the compression (one of download.EXPORT_COMPRESSIONS)
+    """
+    name = fileName.lower()
+    compression = None
+    if   name.endswith('.gz'):  compression, name = 'gzip', name[:-3]
+    elif name.endswith('.zip'): compression, name = 'zip',  name[:-4]
+
+    if   name.endswith('.parquet'):                          format = 'parquet'
+    elif name.endswith('.geojson') or name.endswith('.json'): format = 'geojson'
+    else:                                                     format = 'csv'
+    return format, compression
+
+
+# Returns an iterator on the serialized and compressed chunks of a DataFrame or of a GeoJSON dataset
+def exportChunks(data, format='csv', compression=None, chunkrows=CHUNK_ROWS, memberName='data', **kwargs):
+    """
+    Returns an iterator that serializes a pandas DataFrame or a GeoJSON dataset in chunks of rows, optionally compressing them incrementally, so that the full serialized file is never kept in memory. The iterator can be passed to :func:`downloadStream` or to :func:`app.app.downloadStream`.
+
+    Parameters
+    ----------
+        data : pandas.DataFrame, dict or geopandas.GeoDataFrame
+            Data to export: a DataFrame for the 'csv' and 'parquet' formats, a GeoJSON FeatureCollection dict or a GeoDataFrame for the 'geojson' format
+        format : str, optional
+            Format of the export: 'csv', 'parquet' or 'geojson' (default is 'csv'). The 'parquet' format requires the pyarrow package
+        compression : str, optional
+            Compression applied to the serialized data: None, 'gzip' or 'zip' (default is None)
+        chunkrows : int, optional
+            Number of rows (or features) serialized at a time (default is download.CHUNK_ROWS)
+        memberName : str, optional
+            Name of the file inside the zip archive, when compression is 'zip' (default is 'data')
+        **kwargs
+            Additional parameters passed to DataFrame.to_csv, to pyarrow.parquet.ParquetWriter or to json.dumps, depending on the format
+
+    Returns
+    -------
+    an iterator yielding bytes
+    """
+    if not format in EXPORT_FORMATS:
+        raise ValueError('Unknown export format: %s' % str(format))
+    if not compression in EXPORT_COMPRESSIONS:
+        raise ValueError('Unknown export compression: %s' % str(compression))
+
+    if   format == 'csv':     chunks = _csvChunks(data, chunkrows, **kwargs)
+    elif format == 'parquet': chunks = _parquetChunks(data, chunkrows, **kwargs)
+    else:                     chunks = _geojsonChunks(data, chunkrows, **kwargs)
+
+    chunks = (chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in chunks)
+
+    if   compression == 'gzip': chunks = _gzipChunks(chunks)
+    elif compression == 'zip':  chunks = _zipChunks(chunks, memberName)
+    return chunks
+
+
+# Streaming download of a DataFrame or of a GeoJSON dataset
+def downloadDataFrame(data, fileName="data.csv", format=None, compression=None, chunkrows=CHUNK_ROWS, on_progress=None, **kwargs):
+    """
+    Streaming download of a pandas DataFrame (as CSV or Parquet) or of a GeoJSON dataset: the data is serialized in chunks of rows, compressed incrementally and sent to the browser in chunks, so that multi-million rows tables can be downloaded without keeping the full serialized file in memory.
+
+    Parameters
+    ----------
+        data : pandas.DataFrame, dict or geopandas.GeoDataFrame
+            Data to export (see :func:`exportChunks`)
+        fileName : str, optional
+            Name of the file to download (default is "data.csv")
+        format : str, optional
+            Format of the export: 'csv', 'parquet' or 'geojson' (default is None, which means that the format is deduced from the extension of fileName)
+        compression : str, optional
+            Compression: None, 'gzip' or 'zip' (default is None, which means that the compression is deduced from the extension of fileName, for instance 'data.csv.gz' or 'data.geojson.zip')
+        chunkrows : int, optional
+            Number of rows (or features) serialized at a time (default is download.CHUNK_ROWS)
+        on_progress : function, optional
+            Python function called after each chunk is sent, with two parameters: the number of bytes sent and None
+        **kwargs
+            Additional parameters passed to the serialization function (see :func:`exportChunks`)
+
+    Example
+    -------
+    The Output widget download.output must be displayed inside the notebook. Then the filtered rows of a DataFrame can be downloaded as a zipped CSV file::
+
+        from vois import download
+
+        display(download.output)
+
+        download.downloadDataFrame(df[df['country'] == 'IT'], 'italy.csv.zip')
+
+    """
+    f, c = exportFormat(fileName)
+    if format is None:      format = f
+    if compression is None: compression = c
+
+    memberName = os.path.basename(fileName)
+    if compression == 'zip' and memberName.lower().endswith('.zip'):
+        memberName = memberName[:-4]
+
+    chunks = exportChunks(data, format=format, compression=compression, chunkrows=chunkrows, memberName=memberName, **kwargs)
+    return downloadStream(chunks, fileName, on_progress=on_progress)
@@ -19,6 +19,16 @@
 # limitations under the Licence.
 from ipywidgets import CallbackDispatcher
 import ipyleaflet
+import json
+
+try:
+    from . import spatialIndex
+except:
+    import spatialIndex
+
+
+# Feature displayed in the selection layer when no feature is selected
+EMPTY_SELECTION = { "type": "Feature", "properties": { "name": "selected" }, "geometry": { "type": "Point", "coordinates": [ 99999, 99999 ] } }
 
 
 #####################################################################################################################################################
@@ -36,7 +46,13 @@ class geojsonLayer():
                  selection_style={},
                  selection_point_style={'radius': 10, 'color': "#ffff00", 'weight': 4.0, 'opacity': 1.0, 'fillOpacity': 0.0},
                  name='Layer',
-                 on_click=None):
+                 on_click=None,
+                 multiselection=False,
+                 on_selection=None,
+                 keyboard=False,
+                 spatial_index=False,
+                 on_hover=None,
+                 tolerance=5):
         
         # Feature collection to display
         self.featureCollection = featureCollection
@@ -49,9 +65,21 @@ class geojsonLayer():
         self.selection_style       = selection_style
         self.selection_point_style = selection_point_style
         
-        # Callback 
-        self.on_click = on_click
-       
+        # Callbacks
+        self.on_click     = on_click        # Called with the clicked feature (or None when the user clicks outside of the features)
+        self.on_selection = on_selection    # Called with the list of the selected features every time the selection changes
+        self.on_hover     = on_hover        # Called with the feature under the mouse (or None) every time it changes (requires spatial_index=True)
+        
+        # Selection management
+        self.multiselection = multiselection    # If True, a click on a feature adds/removes it to/from the selection
+        self.keyboard       = keyboard          # If True, the selection can be moved with the arrow keys when the map has the focus
+        self.selected       = []                # List of selected features
+        self.key2index      = None              # Dict from the key of a feature to its index in the featureCollection (created on demand)
+        
+        # Python-side spatial index to identify the features in the kernel (clicks, hover, box and lasso selections)
+        self.index     = spatialIndex.spatialIndex(self.featureCollection) if spatial_index else None
+        self.tolerance = tolerance      # Tolerance in pixels to identify points and lines
+        self.hovered   = None           # Index of the feature under the mouse
         
         # GeoJSON layer
         self.geojson = ipyleaflet.GeoJSON(data=self.featureCollection, point_style=self.point_style, style=self.style, hover_style=self.hover_style, name=name)
@@ -61,11 +89,8 @@ class geojsonLayer():
         self.geojson.on_click(self.__internal_on_click)
         
         
-        # Feature collection to manage the selection
-        self.selection = { "type": "FeatureCollection", "crs": { "type": "name", "properties": { "name": "urn:ogc:def:crs:OGC:1.3:CRS84" } },
-                           "features": [ { "type": "Feature", "properties": { "name": "selected" }, "geometry": { "type": "Point", "coordinates": [ 99999, 99999 ] } } ]
-                        }
-        
+        # Feature collection to manage the selection: the selection layer is created once and its data is updated in place
+        self.selection = self.selectionCollection([])
         self.selection_geojson = ipyleaflet.GeoJSON(data=self.selection, point_style=self.selection_point_style, style=self.selection_style, hover_style=self.hover_style)
 
         
@@ -75,6 +100,9 @@ class geojsonLayer():
         # True if a click on the map must be skipped
         self.skip_map_click = False        
         
+        # ipyevents.Event instance to manage the keyboard
+        self.keyevents = None
+        
         
     # Add the layer to an ipyleaflet Map and manage the click to unselect a geojson feature
     def addToMap(self, m):
@@ -86,35 +114,185 @@ class geojsonLayer():
         self.m._interaction_callbacks = CallbackDispatcher()
         self.m.on_interaction(self.handle_interaction_map)
         
+        if self.keyboard:
+            from ipyevents import Event
+            self.keyevents = Event(source=self.m, watched_events=['keydown'])
+            self.keyevents.on_dom_event(self.handle_keyboard)
+        
 
-    # Handle click on the map (to unselect)
+    # Handle click on the map (to unselect, or to select the features identified by the spatial index) and mouse movements (to call on_hover)
     def handle_interaction_map(self, **kwargs):
-        if kwargs.get('type') == 'click':
+        etype = kwargs.get('type')
+        if etype == 'click':
             if not self.skip_map_click:
-                self.selection['features'] = [ { "type": "Feature", "properties": { "name": "selected" }, "geometry": { "type": "Point", "coordinates": [ 99999, 99999 ] } }  ]
-                newsel = ipyleaflet.GeoJSON(data=self.selection, point_style=self.selection_point_style, style=self.selection_style, hover_style=self.hover_style)
-                self.m.substitute(self.selection_geojson,newsel)
-                self.selection_geojson = newsel
+                features = self.identify(*kwargs.get('coordinates')) if not self.index is None else []
+                if len(features) > 0:
+                    feature = features[-1]      # The last feature is the one drawn on top
+                    if self.multiselection: self.toggleFeature(feature)
+                    else:                   self.selectFeature(feature)
+                else:
+                    feature = None
+                    self.clearSelection()
                 if not self.on_click is None:
-                    self.on_click(None)
+                    self.on_click(feature)
             self.skip_map_click = False
+        elif etype == 'mousemove' and not self.on_hover is None and not self.index is None:
+            lat, lon = kwargs.get('coordinates')
+            ids = self.index.identify(lon, lat, self.degreeTolerance())
+            hovered = ids[-1] if len(ids) > 0 else None
+            if hovered != self.hovered:
+                self.hovered = hovered
+                self.on_hover(None if hovered is None else self.featureCollection['features'][hovered])
+            
+            
+    # Returns the tolerance in degrees corresponding to self.tolerance pixels at the current zoom of the map
+    def degreeTolerance(self):
+        zoom = self.m.zoom if not self.m is None else 0
+        return self.tolerance * 360.0 / (256.0 * 2**zoom)
+    
+    
+    # Returns the list of features at a position (requires spatial_index=True)
+    def identify(self, lat, lon):
+        if self.index is None:
+            return []
+        features = self.featureCollection['features']
+        return [features[i] for i in self.index.identify(lon, lat, self.degreeTolerance())]
+    
+    
+    # Select the features intersecting a box (requires spatial_index=True). If add is True, the features are added to the current selection
+    def selectBox(self, south, west, north, east, add=False):
+        if self.index is None:
+            return []
+        features = self.featureCollection['features']
+        found = [features[i] for i in self.index.queryBox(west, south, east, north)]
+        self.selectFeatures(found, add)
+        return found
+    
+    
+    # Select the features whose representative point is inside a lasso polygon given as a list of (lat,lon) (requires spatial_index=True). If add is True, the features are added to the current selection
+    def selectLasso(self, latlngs, add=False):
+        if self.index is None:
+            return []
+        features = self.featureCollection['features']
+        found = [features[i] for i in self.index.queryPolygon([(lon, lat) for lat, lon in latlngs])]
+        self.selectFeatures(found, add)
+        return found
+    
+    
+    # Handle the keyboard: arrows move the selection to the next/previous feature, Escape clears the selection
+    def handle_keyboard(self, event):
+        key = event.get('key', '')
+        if   key in ['ArrowRight', 'ArrowDown']: self.selectNext()
+        elif key in ['ArrowLeft',  'ArrowUp']:   self.selectPrevious()
+        elif key == 'Escape':                    self.clearSelection()
+    
+    
+    # Returns the feature collection to display in the selection layer
+    def selectionCollection(self, features):
+        if len(features) == 0:
+            features = [EMPTY_SELECTION]
+        else:
+            features = [ { "type": "Feature", "properties": { "name": "selected" }, "geometry": f['geometry'] } for f in features ]
+        return { "type": "FeatureCollection", "crs": { "type": "name", "properties": { "name": "urn:ogc:def:crs:OGC:1.3:CRS84" } }, "features": features }
+    
+    
+    # Update the data of the selection layer (the layer is not substituted, so Leaflet only redraws its content)
+    def updateSelection(self):
+        self.selection = self.selectionCollection(self.selected)
+        self.selection_geojson.data = self.selection
+        if not self.on_selection is None:
+            self.on_selection(self.selected)
+            
     
+    # Returns a key that identifies a feature (features received from the browser are copies of the original ones)
+    def featureKey(self, feature):
+        if 'id' in feature:
+            return 'id:%s' % str(feature['id'])
+        return json.dumps(feature['geometry'], sort_keys=True)
     
-    # Select one of the features
-    def selectFeature(self, feature):
-        self.selection['features'] = [ { "type": "Feature", "properties": { "name": "selected" }, "geometry": feature['geometry'] }  ]
-        newsel = ipyleaflet.GeoJSON(data=self.selection, point_style=self.selection_point_style, style=self.selection_style)
-        self.m.substitute(self.selection_geojson,newsel)
-        self.selection_geojson = newsel
+    
+    # Returns the index of a feature in the featureCollection, or -1
+    def featureIndex(self, feature):
+        if self.key2index is None:
+            self.key2index = {}
+            for index, f in enumerate(self.featureCollection['features']):
+                self.key2index.setdefault(self.featureKey(f), index)
+        return self.key2index.get(self.featureKey(feature), -1)
+    
+    
+    # Select one of the features (if add is True, the feature is added to the current selection)
+    def selectFeature(self, feature, add=False):
+        if add:
+            key = self.featureKey(feature)
+            if not any(self.featureKey(f) == key for f in self.selected):
+                self.selected = self.selected + [feature]
+        else:
+            self.selected = [feature]
+        self.updateSelection()
+        
+        
+    # Remove a feature from the selection
+    def unselectFeature(self, feature):
+        key = self.featureKey(feature)
+        self.selected = [f for f in self.selected if self.featureKey(f) != key]
+        self.updateSelection()
+        
+        
+    # Add the feature to the selection or remove it if already selected
+    def toggleFeature(self, feature):
+        key = self.featureKey(feature)
+        if any(self.featureKey(f) == key for f in self.selected): self.unselectFeature(feature)
+        else:                                                       self.selectFeature(feature, add=True)
+    
+    
+    # Select a list of features (if add is True, the features are added to the current selection)
+    def selectFeatures(self, features, add=False):
+        if add:
+            keys = set(self.featureKey(f) for f in self.selected)
+            self.selected = self.selected + [f for f in features if not self.featureKey(f) in keys]
+        else:
+            self.selected = list(features)
+        self.updateSelection()
+        
+        
+    # Set the list of the selected features
+    def setSelection(self, features):
+        self.selected = list(features)
+        self.updateSelection()
+        
+        
+    # Clear the selection
+    def clearSelection(self):
+        if len(self.selected) > 0:
+            self.selected = []
+            self.updateSelection()
+        
+        
+    # Move the selection to the feature following (step=1) or preceding (step=-1) the last selected feature in the featureCollection
+    def selectNext(self, step=1):
+        features = self.featureCollection['features']
+        if len(features) == 0:
+            return
+        if len(self.selected) == 0:
+            index = 0 if step > 0 else len(features) - 1
+        else:
+            index = (self.featureIndex(self.selected[-1]) + step) % len(features)
+        feature = features[index]
+        self.selectFeature(feature)
+        if not self.on_click is None:
+            self.on_click(feature)
+        
+        
+    # Move the selection to the previous feature
+    def selectPrevious(self):
+        self.selectNext(step=-1)
         
         
     # Handle click on a geojson feature to select
     def __internal_on_click(self, event, feature, properties, id):
         if event == 'click':
             self.skip_map_click = True
-            self.selectFeature(feature)
+            if self.multiselection: self.toggleFeature(feature)
+            else:                   self.selectFeature(feature)
             if not self.on_click is None:
                 self.on_click(feature)
-
-        
-    
\ No newline at end of file
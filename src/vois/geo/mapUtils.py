@@ -27,6 +27,8 @@ import ipyvuetify as v
 import requests
 import math
 
+from vois import scheduler
+
 
 MAPCARD_COORDINATES = 'Coordinates'
 MAPCARD_OVERVIEW    = 'Overview'
@@ -368,14 +370,14 @@ def addOverview(m, color='red', position='bottomright', overviewLayer=None):
     rect = Rectangle(color=color, fill=False, bounds=m.bounds)
     moverview.add(rect)
 
-    # Update the rectangle at each zoom/pan on the main map
+    # Update the rectangle in place at each zoom/pan on the main map (throttled, since Leaflet sends many bounds changes during a pan)
+    # N.B.: the browser view of the Rectangle reads its bounds only at creation, then it listens to the changes of the locations trait
     def onMapBoundsChanged(*args):
-        nonlocal rect
-        newrect = Rectangle(color=color, fill=False, bounds=m.bounds)
-        moverview.substitute_layer(rect, newrect)
-        rect = newrect
+        if len(m.bounds) == 2:
+            (latmin, lonmin), (latmax, lonmax) = m.bounds
+            rect.locations = [[latmin, lonmin], [latmin, lonmax], [latmax, lonmax], [latmax, lonmin]]
 
-    m.observe(onMapBoundsChanged, 'bounds')
+    m.observe(scheduler.throttle(onMapBoundsChanged), 'bounds')
     
 
 # Remove the overview card from the map
@@ -0,0 +1,379 @@
+"""Python-side spatial index to identify the features of a GeoJSON FeatureCollection"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2025
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+import numpy as np
+
+
+# Maximum number of grid cells a feature can be inserted into: features having a larger bounding box are always considered as candidates
+MAX_CELLS_PER_FEATURE = 64
+
+
+# Extract from a geometry the list of polygon rings, the list of polylines and the list of points
+def _geometryParts(geometry, rings, lines, points):
+    if geometry is None:
+        return
+    gtype  = geometry.get('type', '')
+    coords = geometry.get('coordinates', [])
+    if   gtype == 'Point':              points.append(coords)
+    elif gtype == 'MultiPoint':         points.extend(coords)
+    elif gtype == 'LineString':         lines.append(coords)
+    elif gtype == 'MultiLineString':    lines.extend(coords)
+    elif gtype == 'Polygon':            rings.extend(coords)
+    elif gtype == 'MultiPolygon':
+        for polygon in coords:
+            rings.extend(polygon)
+    elif gtype == 'GeometryCollection':
+        for g in geometry.get('geometries', []):
+            _geometryParts(g, rings, lines, points)
+
+
+# Collector of the vertices of many polylines (or points) belonging to the features
+class _vertices():
+    def __init__(self):
+        self.coords   = []      # Flat list of x,y coordinates
+        self.lengths  = []      # Number of vertices of each polyline
+        self.features = []      # Index of the feature of each polyline
+
+    def add(self, feature, polylines):
+        for line in polylines:
+            for c in line:
+                self.coords.append(c[0])
+                self.coords.append(c[1])
+            self.lengths.append(len(line))
+            self.features.append(feature)
+
+    # Returns the array of the vertices and the index of the feature of each vertex
+    def vertices(self):
+        xy = np.array(self.coords, dtype=np.float64).reshape(-1, 2)
+        return xy, np.repeat(np.array(self.features, dtype=np.int64), self.lengths)
+
+    # Returns the array of segments (x0,y0,x1,y1) sorted by feature and the CSR offsets of the segments of each feature
+    def segments(self, count):
+        xy, owner = self.vertices()
+        valid = np.ones(len(xy), dtype=bool)
+        valid[np.cumsum(self.lengths, dtype=np.int64) - 1] = False
+        start = np.flatnonzero(valid[:-1]) if len(xy) > 0 else np.zeros(0, dtype=np.int64)
+        segs = np.hstack([xy[start], xy[start+1]])
+        return segs, _offsets(owner[start], count)
+
+
+# Returns the CSR offsets of sorted owner indices
+def _offsets(owner, count):
+    offsets = np.zeros(count+1, dtype=np.int64)
+    np.cumsum(np.bincount(owner, minlength=count), out=offsets[1:])
+    return offsets
+
+
+# Returns the concatenation of the ranges [starts[i], ends[i]) and the index i of each element
+def _ranges(starts, ends):
+    counts = ends - starts
+    total = counts.sum()
+    owner = np.repeat(np.arange(len(starts)), counts)
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), owner
+    first = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+    return first + np.arange(total), owner
+
+
+# Even-odd point in polygon test of points (px,py) against segments (each point is tested only against the segments having the same owner)
+def _crossings(px, py, segs):
+    x0, y0, x1, y1 = segs[:,0], segs[:,1], segs[:,2], segs[:,3]
+    cond = (y0 > py) != (y1 > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xint = (x1 - x0) * (py - y0) / (y1 - y0) + x0
+    return cond & (px < xint)
+
+
+# Squared distance of points (px,py) from segments
+def _segmentDistance2(px, py, segs):
+    x0, y0, x1, y1 = segs[:,0], segs[:,1], segs[:,2], segs[:,3]
+    dx = x1 - x0
+    dy = y1 - y0
+    len2 = dx*dx + dy*dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(len2 > 0, ((px - x0)*dx + (py - y0)*dy) / len2, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    ex = x0 + t*dx - px
+    ey = y0 + t*dy - py
+    return ex*ex + ey*ey
+
+
+# Returns True for the segments that intersect the segment (ax,ay)-(bx,by)
+def _segmentsIntersect(segs, ax, ay, bx, by):
+    x0, y0, x1, y1 = segs[:,0], segs[:,1], segs[:,2], segs[:,3]
+    def orient(px, py, qx, qy, rx, ry):
+        return np.sign((qx - px)*(ry - py) - (qy - py)*(rx - px))
+    o1 = orient(x0, y0, x1, y1, ax, ay)
+    o2 = orient(x0, y0, x1, y1, bx, by)
+    o3 = orient(ax, ay, bx, by, x0, y0)
+    o4 = orient(ax, ay, bx, by, x1, y1)
+    return (o1 != o2) & (o3 != o4)
+
+
+
+#####################################################################################################################################################
+# Spatial index of a FeatureCollection
+#####################################################################################################################################################
+class spatialIndex():
+    """
+    Python-side spatial index of the features of a GeoJSON FeatureCollection, to identify the features at a position or inside a box or a lasso polygon without any interaction with the browser.
+    The bounding boxes of the features are inserted into a regular grid; the candidate features found in the grid are then tested exactly with vectorized NumPy operations (even-odd point in polygon test for polygons, distance from segments for lines and distance from points for points).
+    The coordinates are expected in the same reference system of the FeatureCollection (usually longitude and latitude in degrees).
+
+    Parameters
+    ----------
+    featureCollection : dict
+        GeoJSON FeatureCollection to index
+    cellsize : float, optional
+        Size of the cells of the grid (default is None, which means that the size is calculated to have on average about one feature per cell)
+
+    Example
+    -------
+    Identification of the features at a position::
+
+        from vois.geo import spatialIndex
+
+        index = spatialIndex.spatialIndex(featureCollection)
+        ids = index.identify(12.5, 43.6, tolerance=0.001)
+        features = [featureCollection['features'][i] for i in ids]
+
+    """
+
+    def __init__(self, featureCollection, cellsize=None):
+        self.featureCollection = featureCollection
+        features = featureCollection.get('features', [])
+        self.count = len(features)
+
+        rings  = _vertices()
+        lines  = _vertices()
+        points = _vertices()
+        for i, feature in enumerate(features):
+            r, l, p = [], [], []
+            _geometryParts(feature.get('geometry', None), r, l, p)
+            if len(r) > 0: rings.add(i, r)
+            if len(l) > 0: lines.add(i, l)
+            if len(p) > 0: points.add(i, [p])
+
+        # Per-feature geometries stored as concatenated arrays with CSR offsets
+        self.rings,  self.ringoffsets = rings.segments(self.count)
+        self.lines,  self.lineoffsets = lines.segments(self.count)
+        self.points, owner = points.vertices()
+        self.pointoffsets = _offsets(owner, self.count)
+
+        # Bounding boxes of the features
+        bbox = np.full((self.count,4), np.nan)
+        for collector in [rings, lines, points]:
+            xy, owner = collector.vertices()
+            if len(xy) > 0:
+                ids = np.unique(owner)
+                starts = np.searchsorted(owner, ids)
+                mins = np.minimum.reduceat(xy, starts, axis=0)
+                maxs = np.maximum.reduceat(xy, starts, axis=0)
+                bbox[ids,:2] = np.fmin(bbox[ids,:2], mins)
+                bbox[ids,2:] = np.fmax(bbox[ids,2:], maxs)
+        self.bbox = bbox
+
+        # Grid
+        valid = ~np.isnan(bbox[:,0])
+        if valid.any():
+            self.x0 = bbox[valid,0].min()
+            self.y0 = bbox[valid,1].min()
+            w = bbox[valid,2].max() - self.x0
+            h = bbox[valid,3].max() - self.y0
+            if cellsize is None:
+                cellsize = max(w, h) / max(1.0, np.sqrt(valid.sum()))
+            self.cellsize = cellsize if cellsize > 0 else 1.0
+            self.nx = int(w / self.cellsize) + 1
+            self.ny = int(h / self.cellsize) + 1
+        else:
+            self.x0, self.y0, self.cellsize, self.nx, self.ny = 0.0, 0.0, 1.0, 1, 1
+
+        ids = np.flatnonzero(valid)
+        ix0, iy0 = self.cell(bbox[ids,0], bbox[ids,1])
+        ix1, iy1 = self.cell(bbox[ids,2], bbox[ids,3])
+        wx = ix1 - ix0 + 1
+        wy = iy1 - iy0 + 1
+        ncells = wx * wy
+        large = ncells > MAX_CELLS_PER_FEATURE
+        self.large = ids[large]      # Features always considered as candidates
+
+        ids, ix0, iy0, wx, ncells = ids[~large], ix0[~large], iy0[~large], wx[~large], ncells[~large]
+        k, owner = _ranges(np.zeros(len(ids), dtype=np.int64), ncells)
+        keys = (ix0[owner] + k % wx[owner]) * self.ny + (iy0[owner] + k // wx[owner])
+        order = np.argsort(keys, kind='stable')
+        self.cellfeatures = ids[owner][order]
+        self.cellkeys, self.cellstarts = np.unique(keys[order], return_index=True)
+        self.cellends = np.append(self.cellstarts[1:], len(self.cellfeatures))
+
+
+    # Returns the cell indices of coordinates
+    def cell(self, x, y):
+        ix = np.clip(((np.asarray(x) - self.x0) / self.cellsize).astype(np.int64), 0, self.nx - 1)
+        iy = np.clip(((np.asarray(y) - self.y0) / self.cellsize).astype(np.int64), 0, self.ny - 1)
+        return ix, iy
+
+
+    # Returns the candidate features whose bounding box intersects a box
+    def candidates(self, xmin, ymin, xmax, ymax):
+        """
+        Returns the array of indices of the features whose bounding box intersects a box.
+        """
+        ix0, iy0 = self.cell(xmin, ymin)
+        ix1, iy1 = self.cell(xmax, ymax)
+        keys = (np.arange(ix0, ix1+1)[:,None] * self.ny + np.arange(iy0, iy1+1)[None,:]).ravel()
+        pos = np.searchsorted(self.cellkeys, keys)
+        pos = pos[pos < len(self.cellkeys)]
+        pos = pos[np.isin(self.cellkeys[pos], keys)]
+        idx, owner = _ranges(self.cellstarts[pos], self.cellends[pos])
+        ids = np.unique(np.concatenate([self.cellfeatures[idx], self.large]))
+        b = self.bbox[ids]
+        return ids[(b[:,0] <= xmax) & (b[:,2] >= xmin) & (b[:,1] <= ymax) & (b[:,3] >= ymin)]
+
+
+    # Gather the geometries of some features
+    def _gather(self, ids, data, offsets):
+        idx, owner = _ranges(offsets[ids], offsets[ids+1])
+        return data[idx], owner
+
+
+    # Identify the features at a position
+    def identify(self, x, y, tolerance=0.0):
+        """
+        Returns the sorted list of indices of the features at a position: polygons containing the position, lines and points whose distance from the position is not greater than the tolerance.
+
+        Parameters
+        ----------
+        x : float
+            X coordinate (longitude) of the position
+        y : float
+            Y coordinate (latitude) of the position
+        tolerance : float, optional
+            Maximum distance for lines and points, in the units of the coordinates (default is 0.0)
+
+        Returns
+        -------
+        a list of int
+        """
+        ids = self.candidates(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+        if len(ids) == 0:
+            return []
+        found = np.zeros(len(ids), dtype=bool)
+
+        segs, owner = self._gather(ids, self.rings, self.ringoffsets)
+        if len(segs) > 0:
+            crossings = np.bincount(owner, weights=_crossings(x, y, segs), minlength=len(ids))
+            found |= (crossings % 2) == 1
+            if tolerance > 0:
+                found[owner[_segmentDistance2(x, y, segs) <= tolerance*tolerance]] = True
+
+        segs, owner = self._gather(ids, self.lines, self.lineoffsets)
+        if len(segs) > 0:
+            found[owner[_segmentDistance2(x, y, segs) <= tolerance*tolerance]] = True
+
+        pts, owner = self._gather(ids, self.points, self.pointoffsets)
+        if len(pts) > 0:
+            d2 = (pts[:,0] - x)**2 + (pts[:,1] - y)**2
+            found[owner[d2 <= tolerance*tolerance]] = True
+
+        return ids[found].tolist()
+
+
+    # Features intersecting a box
+    def queryBox(self, xmin, ymin, xmax, ymax):
+        """
+        Returns the sorted list of indices of the features that intersect a box.
+
+        Parameters
+        ----------
+        xmin, ymin, xmax, ymax : float
+            Coordinates of the box
+
+        Returns
+        -------
+        a list of int
+        """
+        ids = self.candidates(xmin, ymin, xmax, ymax)
+        if len(ids) == 0:
+            return []
+        found = np.zeros(len(ids), dtype=bool)
+
+        # Features having a bounding box fully inside the box
+        b = self.bbox[ids]
+        found |= (b[:,0] >= xmin) & (b[:,2] <= xmax) & (b[:,1] >= ymin) & (b[:,3] <= ymax)
+
+        # Points inside the box
+        pts, owner = self._gather(ids, self.points, self.pointoffsets)
+        if len(pts) > 0:
+            inside = (pts[:,0] >= xmin) & (pts[:,0] <= xmax) & (pts[:,1] >= ymin) & (pts[:,1] <= ymax)
+            found[owner[inside]] = True
+
+        # Segments having a vertex inside the box or crossing one of the sides of the box
+        corners = [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)]
+        for data, offsets in [(self.rings, self.ringoffsets), (self.lines, self.lineoffsets)]:
+            segs, owner = self._gather(ids, data, offsets)
+            if len(segs) == 0:
+                continue
+            hit = (segs[:,0] >= xmin) & (segs[:,0] <= xmax) & (segs[:,1] >= ymin) & (segs[:,1] <= ymax)
+            for i in range(4):
+                (ax, ay), (bx, by) = corners[i], corners[(i+1) % 4]
+                hit |= _segmentsIntersect(segs, ax, ay, bx, by)
+            found[owner[hit]] = True
+
+        # Polygons containing the box
+        segs, owner = self._gather(ids, self.rings, self.ringoffsets)
+        if len(segs) > 0:
+            crossings = np.bincount(owner, weights=_crossings(xmin, ymin, segs), minlength=len(ids))
+            found |= (crossings % 2) == 1
+
+        return ids[found].tolist()
+
+
+    # Features whose representative point is inside a polygon
+    def queryPolygon(self, coordinates):
+        """
+        Returns the sorted list of indices of the features whose representative point is inside a polygon (lasso selection). The representative point is the point itself for point features and the center of the bounding box for the other features.
+
+        Parameters
+        ----------
+        coordinates : list of (x,y) tuples
+            Vertices of the polygon
+
+        Returns
+        -------
+        a list of int
+        """
+        poly = np.asarray(coordinates, dtype=np.float64)[:,:2]
+        if len(poly) < 3:
+            return []
+        ids = self.candidates(poly[:,0].min(), poly[:,1].min(), poly[:,0].max(), poly[:,1].max())
+        if len(ids) == 0:
+            return []
+
+        b = self.bbox[ids]
+        px = (b[:,0] + b[:,2]) / 2.0
+        py = (b[:,1] + b[:,3]) / 2.0
+        hasPoints = (self.pointoffsets[ids+1] - self.pointoffsets[ids]) > 0
+        px[hasPoints] = self.points[self.pointoffsets[ids[hasPoints]],0]
+        py[hasPoints] = self.points[self.pointoffsets[ids[hasPoints]],1]
+
+        segs = np.hstack([poly, np.roll(poly, -1, axis=0)])
+        inside = np.zeros(len(ids), dtype=bool)
+        for s in segs:
+            inside ^= _crossings(px, py, s[None,:])
+        return ids[inside].tolist()
@@ -23,6 +23,11 @@ from IPython.display import display
 import pandas as pd
 import numpy as np
 
+try:
+    from . import treemapPlotly
+except:
+    import treemapPlotly
+
 
 ##################################################################################################################################
 # Creation of ipytree
@@ -55,7 +60,7 @@ def basic_handle_click(event):
 # tree, nodes, parent_of = createIpytreeFromList(['A','A.1','A.2','A.1.1'], rootName='A', valuefor={'A.1.1': 10.0}, handle_click=pippo)
 # display(tree)
 ##################################################################################################################################
-def createIpytreeFromList(nameslist=[], rootName='', separator='.', valuefor={}, handle_click=basic_handle_click, select_root=False):
+def createIpytreeFromList(nameslist=[], rootName='', separator='.', valuefor={}, handle_click=basic_handle_click, select_root=False, lazy=False):
     """
     Create a ipytree from a list of names with an implicit tree structure, example: ['JRC', 'JRC.D', 'JRC.D.3', ...]
     
@@ -73,6 +78,8 @@ def createIpytreeFromList(nameslist=[], rootName='', separator='.', valuefor={},
             Python function to call when the selected nodes change caused by user clicking (default is ipytree.basic_handle_click)
         select_root : bool, optional
             If True the root node is selected at start (default is False)
+        lazy : bool, optional
+            If True, the nodes of the tree are created only when their parent node is opened for the first time (default is False). The two dicts returned are filled as the nodes are created
         
     Returns
     -------
@@ -107,46 +114,54 @@ def createIpytreeFromList(nameslist=[], rootName='', separator='.', valuefor={},
        
     """
     
-    # Add a node to a tree-node
-    def addNode(name, value, parent):
-        nonlocal nodes, parent_of
-        if not name in nodes:
-            elem = DataNode(name, value=value)
-            elem.open_icon_style  = 'info'
-            elem.close_icon_style = 'info'
-            elem.show_icon = False
-            elem.opened = False
-            elem.observe(handle_click, 'selected')
-            parent.add_node(elem)
-            nodes[name] = elem
-            parent_of[name] = parent
-            while parent != tree:
-                parent.value += value
-                parent = parent_of[parent.name]
-            return elem
+    # The hierarchy (with the values summed to the parents) is calculated in a vectorized way
+    hierarchy = treemapPlotly.createHierarchy(nameslist, rootName=rootName, separator=separator, valuefor=valuefor)
+    children = {}     # key: fullname of a node   value: list of (fullname, value) of its children
+    for name, parentname, value in zip(hierarchy['label'].tolist()[1:], hierarchy['parent'].tolist()[1:], hierarchy['value'].tolist()[1:]):
+        children.setdefault(parentname, []).append((name, value))
+    
+    # Create a node
+    def createNode(name, value, parent):
+        elem = DataNode(name, value=value)
+        elem.open_icon_style  = 'info'
+        elem.close_icon_style = 'info'
+        elem.show_icon = False
+        elem.opened = False
+        elem.observe(handle_click, 'selected')
+        nodes[name] = elem
+        parent_of[name] = parent
+        return elem
+    
+    # Create the children of a node (all the descendants if not lazy)
+    def addChildren(elem, name):
+        created = []
+        for childname, value in children.get(name, []):
+            child = createNode(childname, value, elem)
+            if childname in children:
+                if lazy:
+                    child.nodes = [Node('...', show_icon=False)]    # Placeholder to display the node as closed
+                    child.observe(onOpened, 'opened')
+                else:
+                    addChildren(child, childname)
+            created.append(child)
+        elem.nodes = created      # Single assignment instead of one add_node call for each child
+    
+    # Lazy mode: create the children of a node when it is opened for the first time
+    def onOpened(change):
+        if change['new']:
+            elem = change['owner']
+            elem.unobserve(onOpened, 'opened')
+            addChildren(elem, elem.name)
     
     nodes     = {}
     parent_of = {}
     tree = Tree(stripes=False)
-    root = tree
     if len(rootName) > 0:
-        root = addNode(rootName,0.0,tree)
-
-    # Manage an implicit tree with separator!
-    for name in nameslist:
-        parts = name.split(separator)
-        fullname = ''
-        for part in parts:
-            parentname = fullname
-            if len(fullname) == 0: fullname += part
-            else:                  fullname += '.' + part
-
-            parent = root
-            if parentname in nodes: parent = nodes[parentname]
-
-            value = 0.0
-            if fullname in valuefor: value = valuefor[fullname]
-            addNode(fullname,value,parent)
+        root = createNode(rootName, hierarchy['value'].iloc[0], tree)
+        tree.nodes = [root]
+        addChildren(root, rootName)
+    else:
+        addChildren(tree, rootName)
 
     if rootName in nodes:            
         root = nodes[rootName]
@@ -0,0 +1,293 @@
+"""Persistent widget that executes commands in the browser (URL update, open of pages, CSS injection, clipboard and downloads)"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2025
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+from IPython.display import display
+import traitlets
+import itertools
+import weakref
+import time
+import uuid
+
+from vois import download
+
+
+# Bridges created by getBridge: Output widget --> jsBridge instance displayed inside it
+_bridges = weakref.WeakKeyDictionary()
+
+# Maximum number of commands waiting to be executed by the browser (the oldest ones are discarded)
+MAX_COMMANDS = 100
+
+# Maximum time in seconds a command waits to be executed by the browser (for instance if the bridge is never rendered)
+COMMAND_TIMEOUT = 60.0
+
+
+#####################################################################################################################################################
+# Persistent bridge to execute commands in the browser
+#####################################################################################################################################################
+class jsBridge(download.downloader):
+    """
+    Persistent and invisible widget that executes commands in the browser: update of the URL, open of a page, injection of CSS styles, copy of a text to the clipboard and streaming download of files (see :class:`download.downloader`).
+    The commands are sent as compact messages over the widget comm, instead of displaying a new <script> inside an Output widget at each call, so that the content of the Output widgets doesn't grow during long-lived sessions.
+
+    The URL and the CSS styles are stored in synchronized traits: they are applied again every time the widget is rendered and each CSS style is injected in the page only once, identified by a key.
+    The commands to open a page and to copy to the clipboard are executed by only one view of the widget, even if the widget is displayed more than once. If they are not executed within jsBridge.COMMAND_TIMEOUT seconds (for instance because the widget is not displayed), they are discarded.
+    The widget must be displayed in the page for the commands to work. The :class:`app.app` class creates its own instance, and the :func:`getBridge` function returns the instance displayed inside an Output widget.
+
+    Example
+    -------
+    Update of the URL and injection of a CSS style::
+
+        from vois import jsBridge
+
+        bridge = jsBridge.jsBridge()
+        display(bridge)
+
+        bridge.updateUrl('?country=IT')
+        bridge.injectCSS('.v-label { font-size: 14px; }', key='labels')
+
+    """
+
+    bridgeid = traitlets.Unicode('').tag(sync=True)    # Unique id of the bridge used to identify the <style> elements it creates
+    url      = traitlets.Unicode('').tag(sync=True)    # URL to display in the top bar of the browser ('' means that the URL is not modified)
+    styles   = traitlets.Dict({}).tag(sync=True)       # Dict having as key the key of a CSS style and as value the CSS code
+    commands = traitlets.List([]).tag(sync=True)       # Commands waiting to be executed by the browser (dicts with keys 'id', 'method' and 'args')
+
+    jsmounted = '''
+            this.applyUrl();
+            this.applyStyles();
+            this.executeCommands();'''
+
+    jswatch = '''
+            url() {
+                this.applyUrl();
+            },
+            styles() {
+                this.applyStyles();
+            },
+            commands() {
+                this.executeCommands();
+            }'''
+
+    jsmethods = '''
+            applyUrl() {
+                if (this.url) window.history.replaceState({ additionalInformation: 'Updated the URL with JS' }, '', this.url);
+            },
+            applyStyles() {
+                const prefix = 'vois-css-' + this.bridgeid + '-';
+                document.querySelectorAll('style[id^="' + prefix + '"]').forEach(e => {
+                    if (!(e.id.slice(prefix.length) in this.styles)) e.remove();
+                });
+                for (const [key, css] of Object.entries(this.styles)) {
+                    let e = document.getElementById(prefix + key);
+                    if (!e) {
+                        e = document.createElement('style');
+                        e.id = prefix + key;
+                        document.head.appendChild(e);
+                    }
+                    if (e.textContent !== css) e.textContent = css;
+                }
+            },
+            executeCommands() {
+                if (!this.claimed) this.claimed = new Set();
+                for (const c of this.commands) {
+                    if (!this.claimed.has(c.id)) {
+                        this.claimed.add(c.id);
+                        this.claim({id: c.id, view: this.view});
+                    }
+                }
+            },
+            jupyter_execute(id, view, method, args) {
+                if (view !== this.view) return;
+                this['command_' + method](...args);
+                this.done({id: id});
+            },
+            command_open(url, target) {
+                window.open(url, target);
+            },
+            command_clipboard(text) {
+                navigator.clipboard.writeText(text).then(function() {
+                    console.log('Copying to clipboard was successful!');
+                }, function(err) {
+                    console.error('Could not copy text: ', err);
+                });
+            }'''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bridgeid = uuid.uuid4().hex[:12]
+        self.commandids   = itertools.count(1)    # Generator of the ids of the commands
+        self.commandtimes = {}                    # id --> time when the command was queued
+        self.claims       = {}                    # id --> view that executes the command
+
+
+    # Add a command to the queue of the commands to be executed by the browser (the commands are kept until a view executes them, so they are not lost if the widget is not yet rendered)
+    def command(self, method, *args):
+        id = next(self.commandids)
+        now = time.time()
+        self.commandtimes[id] = now
+        commands = [c for c in self.commands if now - self.commandtimes.get(c['id'], now) <= COMMAND_TIMEOUT]
+        commands = (commands + [{'id': id, 'method': method, 'args': list(args)}])[-MAX_COMMANDS:]
+        self.forget(set(self.commandtimes) - set(c['id'] for c in commands))
+        self.commands = commands
+
+
+    # Remove the state of the commands no longer in the queue
+    def forget(self, ids):
+        for id in ids:
+            self.commandtimes.pop(id, None)
+            self.claims.pop(id, None)
+
+
+    # Request of a command from a view: only the first view that claims a command executes it
+    def vue_claim(self, data):
+        id = data['id']
+        if id in self.claims:
+            return
+        for c in self.commands:
+            if c['id'] == id:
+                self.claims[id] = data['view']
+                self.send({'method': 'execute', 'args': [id, data['view'], c['method'], c['args']]})
+                return
+
+
+    # Command executed by the browser
+    def vue_done(self, data):
+        self.forget([data['id']])
+        self.commands = [c for c in self.commands if c['id'] != data['id']]
+
+
+    # Update the URL displayed in the top bar of the browser
+    def updateUrl(self, url):
+        """
+        Update the URL visualized in the top bar of the browser. Consecutive updates are cheap: only the new value of the url trait is sent to the browser.
+
+        Parameters
+        ----------
+        url : str
+            Partial url to add to the current browser's page key/values (for instance '?test=3')
+        """
+        self.url = url
+
+
+    # Open a web page
+    def openUrl(self, url, target='_blank'):
+        """
+        Open a web page.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page to open
+        target : str, optional
+            Target of the open operation (default is '_blank' which means that the page will be opened in a new browser's tab)
+        """
+        self.command('open', url, target)
+
+
+    # Inject a CSS style in the page
+    def injectCSS(self, css, key=None):
+        """
+        Inject a CSS style in the page. The style is injected only once for each key: injecting again a style with the same key replaces it.
+
+        Parameters
+        ----------
+        css : str
+            CSS code to inject (the <style> and </style> tags, if present, are removed)
+        key : str, optional
+            Key that identifies the style (default is None, which means that a key is derived from the CSS code)
+        """
+        css = css.strip()
+        if css.startswith('<style'):
+            css = css[css.find('>')+1:]
+        if css.endswith('</style>'):
+            css = css[:-len('</style>')]
+        if key is None:
+            key = uuid.uuid5(uuid.NAMESPACE_OID, css).hex[:12]
+        if self.styles.get(key, None) != css:
+            styles = dict(self.styles)
+            styles[key] = css
+            self.styles = styles
+
+
+    # Remove a CSS style from the page
+    def removeCSS(self, key):
+        """
+        Remove from the page a CSS style injected with the :func:`injectCSS` method.
+
+        Parameters
+        ----------
+        key : str
+            Key of the style to remove
+        """
+        if key in self.styles:
+            styles = dict(self.styles)
+            del styles[key]
+            self.styles = styles
+
+
+    # Copy a text to the clipboard
+    def copyToClipboard(self, text):
+        """
+        Copy a text to the clipboard of the browser.
+
+        Parameters
+        ----------
+        text : str
+            Text to copy
+        """
+        self.command('clipboard', text)
+
+
+
+# Returns the bridge displayed inside an Output widget
+def getBridge(output):
+    """
+    Returns the :class:`jsBridge` instance displayed inside an Output widget. The bridge is created and displayed on the first call, then it is reused by all the subsequent calls with the same Output widget.
+
+    Parameters
+    ----------
+    output : instance of ipywidgets.Output() class
+        Output widget where the bridge is displayed
+
+    Returns
+    -------
+    an instance of the :class:`jsBridge` class
+    """
+    bridge = _bridges.get(output, None)
+    if bridge is None:
+        bridge = jsBridge()
+        _bridges[output] = bridge
+        with output:
+            display(bridge)
+
+        # When the content of the Output widget is cleared, the bridge is discarded and a new one will be displayed by the next call
+        seen = False
+        def onOutputsChange(change):
+            nonlocal seen
+            present = any(o.get('data', {}).get('application/vnd.jupyter.widget-view+json', {}).get('model_id', None) == bridge.model_id for o in change['new'])
+            if present:
+                seen = True
+            elif seen:
+                output.unobserve(onOutputsChange, 'outputs')
+                if _bridges.get(output, None) is bridge:
+                    del _bridges[output]
+
+        if hasattr(output, 'observe'):
+            output.observe(onOutputsChange, 'outputs')
+    return bridge
@@ -0,0 +1,459 @@
+"""Instrumentation utilities to measure the startup costs of vois dashboards"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2022-2023
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+import sys
+import time
+import functools
+import importlib
+import json
+import importlib.abc
+from contextlib import contextmanager
+
+
+# Categories of the collected measures
+IMPORT       = 'import'
+CONSTRUCTION = 'construction'
+PAYLOAD      = 'payload'
+
+# Collected measures: dict of category --> dict of name --> list of values (seconds for times, bytes for payloads)
+records = {IMPORT: {}, CONSTRUCTION: {}, PAYLOAD: {}}
+
+
+# Widgets and chart builders whose execution time is measured by instrument() (module name, attribute name)
+TIMED_OBJECTS = [('vois.vuetify.app',            'app'),
+                 ('vois.vuetify.page',           'page'),
+                 ('vois.templates.Content',      'Content'),
+                 ('vois.svgBarChart',            'svgBarChart'),
+                 ('vois.svgRankChart',           'svgRankChart'),
+                 ('vois.svgHeatmap',             'heatmapChart'),
+                 ('vois.svgBubblesChart',        'svgBubblesChart'),
+                 ('vois.svgPackedCirclesChart',  'svgPackedCirclesChart'),
+                 ('vois.svgGraph',               'svgGraph'),
+                 ('vois.svgMap',                 'svgMapEurope'),
+                 ('vois.svgUtils',               'graduatedLegend'),
+                 ('vois.svgUtils',               'categoriesLegend'),
+                 ('vois.svgUtils',               'AnimatedPieChart')]
+
+# Modules whose HTML strings displayed in Output widgets are measured by instrument()
+PAYLOAD_MODULES = ['vois.svgBarChart',
+                   'vois.svgRankChart',
+                   'vois.svgHeatmap',
+                   'vois.svgBubblesChart',
+                   'vois.svgPackedCirclesChart',
+                   'vois.svgGraph',
+                   'vois.svgMap',
+                   'vois.svgUtils',
+                   'vois.vuetify.app']
+
+# Widgets whose synchronized traits are measured by instrument() (module name, class name, list of trait names)
+PAYLOAD_WIDGETS = [('vois.vuetify.svgWidget', 'svgWidget', ['svg', 'patches'])]
+
+# Original objects replaced by instrument(), to be restored by uninstrument()
+_patched = []
+
+
+#####################################################################################################################################################
+# Recording of measures
+#####################################################################################################################################################
+
+# Add a measure to the records
+def record(category, name, value):
+    """
+    Add a measure to the collected records.
+
+    Parameters
+    ----------
+    category : str
+        Category of the measure (profiling.IMPORT, profiling.CONSTRUCTION, profiling.PAYLOAD or any other string)
+    name : str
+        Name of the measured object (for instance the name of a module or of a class)
+    value : float or int
+        Value of the measure (seconds for times, bytes for payloads)
+    """
+    records.setdefault(category, {}).setdefault(name, []).append(value)
+
+
+# Reset all the collected measures
+def reset():
+    """
+    Remove all the collected measures.
+    """
+    for category in records:
+        records[category] = {}
+
+
+# Context manager to measure the execution time of a block of code
+@contextmanager
+def timer(name, category=CONSTRUCTION):
+    """
+    Context manager that measures the execution time of a block of code.
+
+    Parameters
+    ----------
+    name : str
+        Name to assign to the measure
+    category : str, optional
+        Category of the measure (default is profiling.CONSTRUCTION)
+
+    Example
+    -------
+    Measure the time spent in creating the main content of a dashboard::
+
+        from vois import profiling
+
+        with profiling.timer('main content'):
+            createMainContent()
+
+        print(profiling.report())
+
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(category, name, time.perf_counter() - start)
+
+
+# Decorator to measure the execution time of a function
+def timed(name=None, category=CONSTRUCTION):
+    """
+    Decorator that measures the execution time of each call of a function.
+
+    Parameters
+    ----------
+    name : str, optional
+        Name to assign to the measure (default is None, which means the qualified name of the decorated function)
+    category : str, optional
+        Category of the measure (default is profiling.CONSTRUCTION)
+    """
+    def decorator(func):
+        label = name if name is not None else '%s.%s' % (func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(label, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+
+#####################################################################################################################################################
+# Import times
+#####################################################################################################################################################
+
+# Loader wrapper that measures the time spent in executing a module
+class _TimedLoader(importlib.abc.Loader):
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            record(IMPORT, module.__name__, time.perf_counter() - start)
+
+    def __getattr__(self, attr):
+        return getattr(self.loader, attr)
+
+
+# Meta path finder that wraps the loader of the modules to measure
+class _ImportTimer(importlib.abc.MetaPathFinder):
+
+    def __init__(self, prefixes):
+        self.prefixes = tuple(prefixes)
+
+    def find_spec(self, fullname, path, target=None):
+        if not fullname.startswith(self.prefixes):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader)
+                return spec
+        return None
+
+
+# Instance of the import timer, if active
+_importtimer = None
+
+
+# Start measuring the import time of modules
+def startImportTiming(prefixes=['vois']):
+    """
+    Start measuring the import time of the modules whose name starts with one of the given prefixes. Modules already imported are not measured, so this function should be called before importing vois modules. The measured times are cumulative (they include the time spent importing the dependencies of each module).
+
+    Parameters
+    ----------
+    prefixes : list of str, optional
+        Prefixes of the names of the modules to measure (default is ['vois'])
+
+    Example
+    -------
+    Measure the import time of the vois modules used in a dashboard::
+
+        from vois import profiling
+        profiling.startImportTiming(['vois', 'ipyvuetify', 'plotly'])
+
+        from vois.vuetify import app
+        from vois import svgMap
+
+        profiling.stopImportTiming()
+        print(profiling.report(profiling.IMPORT))
+
+    """
+    global _importtimer
+    stopImportTiming()
+    _importtimer = _ImportTimer(prefixes)
+    sys.meta_path.insert(0, _importtimer)
+
+
+# Stop measuring the import time of modules
+def stopImportTiming():
+    """
+    Stop measuring the import time of modules.
+    """
+    global _importtimer
+    if _importtimer is not None and _importtimer in sys.meta_path:
+        sys.meta_path.remove(_importtimer)
+    _importtimer = None
+
+
+
+#####################################################################################################################################################
+# Instrumentation of vois widgets and chart builders
+#####################################################################################################################################################
+
+# Wrap a class so that the execution time of its __init__ is measured
+def _instrumentClass(cls, label):
+    original = cls.__dict__.get('__init__', None)
+    init = cls.__init__
+
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        with timer(label):
+            init(self, *args, **kwargs)
+
+    cls.__init__ = __init__
+    _patched.append((cls, '__init__', original))
+
+
+# Wrap the HTML class imported inside a module so that the size of the displayed strings is measured
+def _instrumentHTML(module):
+    original = getattr(module, 'HTML', None)
+    if original is None:
+        return
+
+    def HTML(data=None, *args, **kwargs):
+        if isinstance(data, str):
+            record(PAYLOAD, module.__name__, len(data.encode('utf-8')))
+        return original(data, *args, **kwargs)
+
+    setattr(module, 'HTML', HTML)
+    _patched.append((module, 'HTML', original))
+
+
+# Returns the size in bytes of the value of a trait sent to the browser
+def _payloadSize(value):
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    return len(json.dumps(value, default=str).encode('utf-8'))
+
+
+# Wrap a widget class so that the size of the values of some of its traits is measured at creation and at each change
+def _instrumentWidget(cls, label, traits):
+    original = cls.__dict__.get('__init__', None)
+    init = cls.__init__
+
+    def onChange(change):
+        if len(_patched) > 0:
+            record(PAYLOAD, '%s.%s' % (label, change['name']), _payloadSize(change['new']))
+
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        for name in traits:
+            value = getattr(self, name)
+            if len(value) > 0:
+                record(PAYLOAD, '%s.%s' % (label, name), _payloadSize(value))
+        self.observe(onChange, names=traits)
+
+    cls.__init__ = __init__
+    _patched.append((cls, '__init__', original))
+
+
+# Instrument vois widgets and chart builders
+def instrument():
+    """
+    Instrument the main vois widgets and chart builders (see profiling.TIMED_OBJECTS) to measure their construction time, the SVG chart modules (see profiling.PAYLOAD_MODULES) to measure the size of the HTML/SVG strings they display in Output widgets, and the persistent SVG widgets (see profiling.PAYLOAD_WIDGETS) to measure the size of the drawings and of the patches they send to the browser. Calling the function more than once has no effect.
+
+    Note
+    ----
+    Only the objects accessed through their module are measured: names already imported in the user code with "from module import name" keep referring to the original objects.
+
+    Example
+    -------
+    Measure a full dashboard startup::
+
+        from vois import profiling
+        profiling.instrument()
+
+        from vois.vuetify import app
+        g_app = app.app()
+        g_app.show()
+
+        profiling.uninstrument()
+        display(profiling.panel())
+
+    """
+    if len(_patched) > 0:
+        return
+
+    for modulename, attr in TIMED_OBJECTS:
+        try:
+            module = importlib.import_module(modulename)
+        except ImportError:
+            continue
+        obj = getattr(module, attr, None)
+        if obj is None:
+            continue
+        label = '%s.%s' % (modulename, attr)
+        if isinstance(obj, type):
+            _instrumentClass(obj, label)
+        else:
+            setattr(module, attr, timed(label)(obj))
+            _patched.append((module, attr, obj))
+
+    for modulename in PAYLOAD_MODULES:
+        try:
+            module = importlib.import_module(modulename)
+        except ImportError:
+            continue
+        _instrumentHTML(module)
+
+    for modulename, attr, traits in PAYLOAD_WIDGETS:
+        try:
+            module = importlib.import_module(modulename)
+        except ImportError:
+            continue
+        cls = getattr(module, attr, None)
+        if isinstance(cls, type):
+            _instrumentWidget(cls, '%s.%s' % (modulename, attr), traits)
+
+
+# Remove the instrumentation
+def uninstrument():
+    """
+    Remove the instrumentation installed by :func:`instrument`.
+    """
+    while len(_patched) > 0:
+        owner, attr, original = _patched.pop()
+        if original is None:
+            delattr(owner, attr)
+        else:
+            setattr(owner, attr, original)
+
+
+
+#####################################################################################################################################################
+# Reporting
+#####################################################################################################################################################
+
+# Returns the statistics of the collected measures as a list of tuples
+def summary(category):
+    """
+    Returns the statistics of the measures of a category, sorted in descending order of total value.
+
+    Parameters
+    ----------
+    category : str
+        Category of the measures (profiling.IMPORT, profiling.CONSTRUCTION or profiling.PAYLOAD)
+
+    Returns
+    -------
+    list of tuples (name, count, total, max)
+    """
+    rows = [(name, len(values), sum(values), max(values)) for name, values in records.get(category, {}).items() if len(values) > 0]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+# Format a value for the report
+def _formatValue(category, value):
+    if category == PAYLOAD:
+        if value >= 1024*1024: return '%.2f MB' % (value / (1024.0*1024.0))
+        if value >= 1024:      return '%.1f KB' % (value / 1024.0)
+        return '%d B' % value
+    return '%.1f ms' % (value * 1000.0)
+
+
+# Returns a text report of the collected measures
+def report(categories=None, top=20):
+    """
+    Returns a text report of the collected measures.
+
+    Parameters
+    ----------
+    categories : str or list of str, optional
+        Category or list of categories to include in the report (default is None, which means all the categories)
+    top : int, optional
+        Maximum number of rows to print for each category (default is 20)
+
+    Returns
+    -------
+    a string containing the report
+    """
+    if categories is None:
+        categories = list(records.keys())
+    elif isinstance(categories, str):
+        categories = [categories]
+
+    lines = []
+    for category in categories:
+        rows = summary(category)
+        if len(rows) == 0:
+            continue
+        width = max(len(row[0]) for row in rows[:top])
+        lines.append('%s (total %s)' % (category.upper(), _formatValue(category, sum(row[2] for row in rows))))
+        for name, count, total, maxvalue in rows[:top]:
+            lines.append('    %-*s %6d x %12s  (max %s)' % (width, name, count, _formatValue(category, total), _formatValue(category, maxvalue)))
+        lines.append('')
+
+    return '\n'.join(lines)
+
+
+# Returns a small widget displaying the report
+def panel(categories=None, top=20):
+    """
+    Returns a widget displaying the report of the collected measures. See :func:`report` for the list of parameters.
+
+    Returns
+    -------
+    an instance of ipywidgets.HTML
+    """
+    from ipywidgets import widgets
+    import html
+    return widgets.HTML('<pre style="font-size: 12px; line-height: 1.3;">%s</pre>' % html.escape(report(categories, top)))
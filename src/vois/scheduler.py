@@ -0,0 +1,493 @@
+"""Utilities to schedule, debounce, coalesce and delay the execution of functions inside the kernel event loop"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2024
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+import asyncio
+import weakref
+import threading
+import itertools
+import heapq
+import logging
+import time
+
+
+# Logger of the errors raised by the scheduled calls
+log = logging.getLogger(__name__)
+
+# Default delay in seconds used by the Debouncer instances
+default_delay = 0.25
+
+# Default minimum interval in seconds between two executions used by the Throttler instances
+default_interval = 0.1
+
+# All the Debouncer and Throttler instances alive (used by flushAll)
+_debouncers = weakref.WeakSet()
+
+
+# Returns the running event loop or None if no loop is running (code executed outside of a kernel)
+def runningLoop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+#####################################################################################################################################################
+# Debouncing and coalescing of function calls
+#####################################################################################################################################################
+class Debouncer():
+    """
+    Debouncing and coalescing of function calls. Each call is scheduled with a key: if another call with the same key is scheduled before the previous one is executed, it replaces it. All the pending calls are executed together (in the order of their first scheduling) when no new call has been scheduled for delay seconds.
+
+    The calls are executed inside the asyncio event loop of the kernel. If no event loop is running or the delay is 0, the calls are executed immediately.
+
+    Parameters
+    ----------
+    delay : float, optional
+        Delay in seconds (default is None, which means scheduler.default_delay)
+
+    Example
+    -------
+    Coalesce the rapid changes of a slider into a single update of a chart::
+
+        from vois import scheduler
+
+        debouncer = scheduler.Debouncer(delay=0.3)
+
+        def onchange(value):
+            debouncer.schedule('chart', updateChart, value)
+
+    In tests, the pending calls can be executed synchronously::
+
+        debouncer.flush()        # or scheduler.flushAll()
+
+    """
+
+    def __init__(self, delay=None):
+        self.delay = delay
+        self.pending = {}       # key --> (func, args, kwargs)
+        self.handle = None      # asyncio.TimerHandle of the scheduled flush
+        _debouncers.add(self)
+
+
+    # Schedule a call identified by a key
+    def schedule(self, key, func, *args, **kwargs):
+        """
+        Schedule the call of func(\\*args, \\*\\*kwargs), replacing the pending call with the same key, if any.
+
+        Parameters
+        ----------
+        key : hashable
+            Key that identifies the call (calls with the same key are coalesced)
+        func : function
+            Python function to call
+        """
+        self.pending[key] = (func, args, kwargs)
+
+        delay = self.delay if self.delay is not None else default_delay
+        loop = runningLoop()
+        if loop is None or delay <= 0:
+            self.flush()
+        else:
+            if self.handle is not None:
+                self.handle.cancel()
+            self.handle = loop.call_later(delay, self.flush)
+
+
+    # Schedule a call using the function itself as key
+    def call(self, func, *args, **kwargs):
+        """
+        Schedule the call of func(\\*args, \\*\\*kwargs) using the function itself as the key.
+        """
+        self.schedule(func, func, *args, **kwargs)
+
+
+    # Execute all the pending calls
+    def flush(self):
+        """
+        Immediately execute all the pending calls.
+        """
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+        while len(self.pending) > 0:
+            key = next(iter(self.pending))
+            func, args, kwargs = self.pending.pop(key)
+            func(*args, **kwargs)
+
+
+    # Remove all the pending calls without executing them
+    def cancel(self):
+        """
+        Remove all the pending calls without executing them.
+        """
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        self.pending = {}
+
+
+    # Returns True if there are pending calls
+    @property
+    def ispending(self):
+        return len(self.pending) > 0
+
+
+
+#####################################################################################################################################################
+# Throttling of function calls
+#####################################################################################################################################################
+class Throttler():
+    """
+    Throttling and coalescing of function calls. Each call is scheduled with a key: the first call with a key is executed immediately, then the calls with the same key are executed at most once every interval seconds. The calls received during the interval are coalesced, and only the last one is executed at the end of the interval, so that the final state is always applied.
+
+    Differently from the :class:`Debouncer`, that waits for a pause in the calls, the Throttler keeps executing calls at a regular rate during a continuous stream of events (for instance the bounds changes of a map during a pan).
+    The calls are executed inside the asyncio event loop of the kernel. If no event loop is running or the interval is 0, the calls are executed immediately.
+
+    Parameters
+    ----------
+    interval : float, optional
+        Minimum interval in seconds between two executions of the calls with the same key (default is None, which means scheduler.default_interval)
+
+    Example
+    -------
+    Update a chart at most 5 times per second while a slider is moved::
+
+        from vois import scheduler
+
+        throttler = scheduler.Throttler(interval=0.2)
+
+        def onchange(value):
+            throttler.schedule('chart', updateChart, value)
+
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval
+        self.pending  = {}      # key --> (func, args, kwargs)
+        self.last     = {}      # key --> time of the last execution
+        self.handles  = {}      # key --> asyncio.TimerHandle of the scheduled execution
+        _debouncers.add(self)
+
+
+    # Schedule a call identified by a key
+    def schedule(self, key, func, *args, **kwargs):
+        """
+        Schedule the call of func(\\*args, \\*\\*kwargs), replacing the pending call with the same key, if any.
+
+        Parameters
+        ----------
+        key : hashable
+            Key that identifies the call (calls with the same key are coalesced)
+        func : function
+            Python function to call
+        """
+        self.pending[key] = (func, args, kwargs)
+        if key in self.handles:
+            return
+
+        interval = self.interval if self.interval is not None else default_interval
+        loop = runningLoop()
+        wait = self.last.get(key, -interval) + interval - time.monotonic()
+        if loop is None or interval <= 0 or wait <= 0:
+            self.execute(key)
+        else:
+            self.handles[key] = loop.call_later(wait, self.execute, key)
+
+
+    # Schedule a call using the function itself as key
+    def call(self, func, *args, **kwargs):
+        """
+        Schedule the call of func(\\*args, \\*\\*kwargs) using the function itself as the key.
+        """
+        self.schedule(func, func, *args, **kwargs)
+
+
+    # Execute the pending call with a key
+    def execute(self, key):
+        handle = self.handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        if key in self.pending:
+            func, args, kwargs = self.pending.pop(key)
+            self.last[key] = time.monotonic()
+            func(*args, **kwargs)
+
+
+    # Execute all the pending calls
+    def flush(self):
+        """
+        Immediately execute all the pending calls.
+        """
+        while len(self.pending) > 0:
+            self.execute(next(iter(self.pending)))
+
+
+    # Remove all the pending calls without executing them
+    def cancel(self):
+        """
+        Remove all the pending calls without executing them.
+        """
+        for handle in self.handles.values():
+            handle.cancel()
+        self.handles = {}
+        self.pending = {}
+
+
+    # Returns True if there are pending calls
+    @property
+    def ispending(self):
+        return len(self.pending) > 0
+
+
+
+# Returns a throttled version of a function, to be used as an observer of traitlets changes
+def throttle(func, interval=None):
+    """
+    Returns a function that calls func at most once every interval seconds, always executing the last call received (see :class:`Throttler`). The returned function can be passed to the observe method of a widget to throttle the processing of rapid changes of a trait. The Throttler instance is available as the throttler attribute of the returned function.
+
+    Parameters
+    ----------
+    func : function
+        Python function to throttle
+    interval : float, optional
+        Minimum interval in seconds between two calls (default is None, which means scheduler.default_interval)
+
+    Returns
+    -------
+    a function
+
+    Example
+    -------
+    Process the bounds changes of an ipyleaflet map at most 4 times per second::
+
+        from vois import scheduler
+
+        def onBoundsChanged(change):
+            print(change['new'])
+
+        m.observe(scheduler.throttle(onBoundsChanged, 0.25), 'bounds')
+
+    """
+    throttler = Throttler(interval)
+
+    def throttled(*args, **kwargs):
+        throttler.schedule(None, func, *args, **kwargs)
+
+    throttled.throttler = throttler
+    return throttled
+
+
+
+# Execute all the pending calls of all the Debouncer and Throttler instances
+def flushAll():
+    """
+    Immediately execute all the pending calls of all the :class:`Debouncer` and :class:`Throttler` instances.
+    """
+    for debouncer in list(_debouncers):
+        debouncer.flush()
+
+
+
+#####################################################################################################################################################
+# Single scheduler for delayed calls
+#####################################################################################################################################################
+class TimerScheduler():
+    """
+    Scheduler that executes delayed calls using a single timer, instead of starting a threading.Timer thread for each call. The pending calls are kept in a heap ordered by their deadline, and only the nearest deadline is waited for.
+
+    The calls are executed inside the asyncio event loop of the kernel, if it is running when the call is scheduled, otherwise by a single background thread that is started on the first call.
+    The module contains a shared instance (scheduler.timers) that should be used in most cases.
+
+    Example
+    -------
+    Remove a widget after 5 seconds, unless the removal is cancelled::
+
+        from vois import scheduler
+
+        key = scheduler.timers.callLater(5.0, removeWidget, w)
+        ...
+        scheduler.timers.cancel(key)
+
+    """
+
+    def __init__(self):
+        self.heap     = []                    # Heap of (deadline, key)
+        self.calls    = {}                    # key --> (deadline, func, args, kwargs)
+        self.keys     = itertools.count(1)    # Generator of the keys of the calls
+        self.lock     = threading.RLock()
+        self.loop     = None                  # asyncio event loop used to execute the calls
+        self.handle   = None                  # asyncio.TimerHandle of the nearest deadline
+        self.deadline = None                  # Deadline of the handle
+        self.thread   = None                  # Background thread used when no event loop is running
+        self.wakeup   = threading.Condition(self.lock)
+
+
+    # Schedule a call after a delay
+    def callLater(self, delay, func, *args, **kwargs):
+        """
+        Schedule the call of func(\\*args, \\*\\*kwargs) after delay seconds.
+
+        Parameters
+        ----------
+        delay : float
+            Delay in seconds
+        func : function
+            Python function to call
+
+        Returns
+        -------
+        an integer key that identifies the call, to be passed to the :func:`cancel` method
+        """
+        with self.lock:
+            key = next(self.keys)
+            deadline = time.monotonic() + max(0.0, delay)
+            self.calls[key] = (deadline, func, args, kwargs)
+            heapq.heappush(self.heap, (deadline, key))
+
+            loop = runningLoop()
+            if loop is not None:
+                self.loop = loop
+            if self.loop is not None and not self.loop.is_closed():
+                if loop is self.loop:
+                    self._arm()
+                else:
+                    # Called from another thread (i.e. a worker thread or the background thread): the loop handles must be set in the thread of the loop
+                    self.loop.call_soon_threadsafe(self._armThreadsafe)
+            else:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._runThread, name='vois-timers', daemon=True)
+                    self.thread.start()
+                self.wakeup.notify()
+        return key
+
+
+    # Cancel a scheduled call
+    def cancel(self, key):
+        """
+        Cancel a call scheduled by the :func:`callLater` method. Cancelling a call already executed has no effect.
+
+        Parameters
+        ----------
+        key : int
+            Key returned by the :func:`callLater` method
+        """
+        with self.lock:
+            self.calls.pop(key, None)
+
+
+    # Immediately execute all the pending calls
+    def flush(self):
+        """
+        Immediately execute all the pending calls, in the order of their deadlines.
+        """
+        self._process(float('inf'))
+
+
+    # Returns the number of pending calls
+    @property
+    def pending(self):
+        return len(self.calls)
+
+
+    # Remove from the heap the calls that were cancelled and returns the nearest deadline
+    def _nearest(self):
+        while len(self.heap) > 0 and not self.heap[0][1] in self.calls:
+            heapq.heappop(self.heap)
+        if len(self.heap) > 0:
+            return self.heap[0][0]
+        return None
+
+
+    # Execute the calls whose deadline is expired
+    def _process(self, now=None):
+        while True:
+            with self.lock:
+                if now is None: limit = time.monotonic()
+                else:           limit = now
+                deadline = self._nearest()
+                if deadline is None or deadline > limit:
+                    break
+                deadline, key = heapq.heappop(self.heap)
+                deadline, func, args, kwargs = self.calls.pop(key)
+
+            # An error in a call must not prevent the execution of the other calls
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                log.exception('Error in the call of %r scheduled by the TimerScheduler', func)
+
+
+    # Event loop: set the timer handle to the nearest deadline
+    def _arm(self):
+        deadline = self._nearest()
+        if deadline == self.deadline:
+            return
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        self.deadline = deadline
+        if deadline is not None:
+            self.handle = self.loop.call_later(max(0.0, deadline - time.monotonic()), self._onTimer)
+
+
+    # Event loop: set the timer handle, when requested from another thread
+    def _armThreadsafe(self):
+        with self.lock:
+            self._arm()
+
+
+    # Event loop: called at the nearest deadline
+    def _onTimer(self):
+        with self.lock:
+            self.handle   = None
+            self.deadline = None
+        try:
+            self._process()
+        finally:
+            with self.lock:
+                self._arm()
+
+
+    # Background thread: wait for the nearest deadline and execute the expired calls
+    def _runThread(self):
+        try:
+            while True:
+                try:
+                    with self.lock:
+                        deadline = self._nearest()
+                        if deadline is None:
+                            self.wakeup.wait()
+                        else:
+                            delay = deadline - time.monotonic()
+                            if delay > 0:
+                                self.wakeup.wait(delay)
+                    self._process()
+                except Exception:
+                    log.exception('Error in the TimerScheduler thread')
+        finally:
+            # If the thread terminates anyway, the next call to callLater starts a new one
+            with self.lock:
+                if self.thread is threading.current_thread():
+                    self.thread = None
+
+
+
+# Shared instance of the TimerScheduler
+timers = TimerScheduler()
@@ -17,17 +17,21 @@
 # 
 # See the Licence for the specific language governing permissions and
 # limitations under the Licence.
-from ipywidgets import HTML, widgets, Layout
-from ipyevents import Event
+from ipywidgets import widgets, Layout
+from IPython.display import display
 
 import statistics
 
 try:
     from . import colors
+    from . import svgWriter
     from .vuetify import fontsettings
+    from .vuetify import svgWidget
 except:
     import colors
+    import svgWriter
     from vuetify import fontsettings
+    from vuetify import svgWidget
 
     
     
@@ -74,7 +78,8 @@ def svgBarChart(title='',
                 maxallowed_value=None,       # Maximum value allowed
                 yaxis_min=None,              # Set to force y axis interval
                 yaxis_max=None,
-                on_change=None):             # Function to call when the selected name is changed
+                on_change=None,              # Function to call when the selected name is changed
+                embedFont=None):             # If False, the SVG does not import the font stylesheet (None: only if not already loaded in the page)
     """
     Creation of a vertical bar chart given a list of labels and corresponding numerical values. Click on the rectangles is managed by calling a custom python function.
     
@@ -160,6 +165,8 @@ def svgBarChart(title='',
         Maximum value displayed on the y axis (default is None)
     on_change: function, optional
         Python function to call when the selection of the rectangle items changes (default is None). The function is called with a tuple as unique argument. The tuple will contain (name, value, originalposition) of the selected rectangle
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
             
     Returns
     -------
@@ -315,44 +322,45 @@ def svgBarChart(title='',
     # Create the SVG drawing and returns a string
     def createSVG():
         preserve = 'xMidYMid meet'
-        svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">' % (svgwidth,svgheight, preserve, width,height)
+        svg = svgWriter.svgWriter()
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">', svgwidth,svgheight, preserve, width,height)
 
-        svg += '''
+        svg.write('''
     <style type="text/css">
-         @import url('%s');
+         %s
          .barhover:hover {cursor: pointer; stroke-width: %f; stroke: %s; }
     </style>     
-    ''' % (fontsettings.font_url, strokew_axis, hovercolor)
+    ''', fontsettings.fontImport(embedFont), strokew_axis, hovercolor)
     
         ###svg += '<rect x="0.0" y="0.0" width="%f" height="%f" fill="none" stroke-width="0.2" stroke="red"></rect>' % (svgwidth,svgheight)
         
         # Title
-        svg += '<text x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s</text>' % (svgwidth/2.0, 2.2*titlefontsize/3.0, fontsettings.font_name, titlefontsize, titlecolor, textweight+100, title)
+        svg.write('<text x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s</text>', svgwidth/2.0, 2.2*titlefontsize/3.0, fontsettings.font_name, titlefontsize, titlecolor, textweight+100, title)
 
         # X axis
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x0,y0, x1,y0, strokew_axis, strokecol_axis)
-        svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>' % (xtext, y0+fontsize*0.15, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(minvalue))
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x0,y0, x1,y0, strokew_axis, strokecol_axis)
+        svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>', xtext, y0+fontsize*0.15, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(minvalue))
         
         # Y axis
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x0,y0, x0, y1, strokew_axis, strokecol_axis)
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x0,y0, x0, y1, strokew_axis, strokecol_axis)
         
         # Horizontal lines
         ymax, helem = rect_ycoords(maxvalue)        
         dy = (y0 - ymax)/4.0
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x0,ymax, x1, ymax, strokew_horizontal_lines, strokecol_horizontal_lines)
-        svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>' % (xtext, ymax+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(maxvalue))
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x0,ymax, x1, ymax, strokew_horizontal_lines, strokecol_horizontal_lines)
+        svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>', xtext, ymax+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(maxvalue))
         
         y = ymax + dy
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x0,y, x1, y, strokew_horizontal_lines, strokecol_horizontal_lines)
-        svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>' % (xtext, y+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(0.75*(maxvalue-minvalue)))
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x0,y, x1, y, strokew_horizontal_lines, strokecol_horizontal_lines)
+        svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>', xtext, y+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(0.75*(maxvalue-minvalue)))
         
         y = 0.5*(ymax + y0)
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x0,y, x1, y, strokew_horizontal_lines, strokecol_horizontal_lines)
-        svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>' % (xtext, y+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(0.5*(maxvalue-minvalue)))
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x0,y, x1, y, strokew_horizontal_lines, strokecol_horizontal_lines)
+        svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>', xtext, y+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(0.5*(maxvalue-minvalue)))
         
         y = ymax + 3.0*dy
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x0,y, x1, y, strokew_horizontal_lines, strokecol_horizontal_lines)
-        svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>' % (xtext, y+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(0.25*(maxvalue-minvalue)))
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x0,y, x1, y, strokew_horizontal_lines, strokecol_horizontal_lines)
+        svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="end" font-family="%s" font-size="%f" fill="%s" font-weight="400">%s</text>', xtext, y+fontsize*0.25, fontsettings.font_name, fontsize*0.65, xaxistextcolor, f.format(0.25*(maxvalue-minvalue)))
        
     
         # Vertical bars
@@ -386,18 +394,18 @@ def svgBarChart(title='',
             if not dictnames is None and name in dictnames:
                 fullname = dictnames[name]
                 
-            svg += '<rect class="barhover" x="%f" y="%f" width="%f" height="%f" fill="%s" stroke-width="%f" stroke="%s"><title>%s: %s</title></rect>' % (x, y, welemnet, helem, col, strokew, stroke, fullname, tooltip)
+            svg.write('<rect class="barhover" data-index="%d" x="%f" y="%f" width="%f" height="%f" fill="%s" stroke-width="%f" stroke="%s"><title>%s: %s</title></rect>', pos, x, y, welemnet, helem, col, strokew, stroke, fullname, tooltip)
             
-            svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d" %s>%s</text>' % (xt, yt, fontsettings.font_name, fontsize*xaxistextsizemultiplier,
+            svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d" %s>%s</text>', xt, yt, fontsettings.font_name, fontsize*xaxistextsizemultiplier,
                                                                                                                                                                       xaxistextcolor, textweight, rotation, name)
             
             if not stddevs is None:
                 stddev = stddevs[pos]
                 
                 h = value_to_height(stddev)
-                svg += '<line style="pointer-events: none" x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x+0.5*welemnet,y-h, x+0.5*welemnet, y+h, strokew_axis, strokecol_axis)    
-                svg += '<line style="pointer-events: none" x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x+0.2*welemnet,y-h, x+0.8*welemnet, y-h, strokew_axis, strokecol_axis)    
-                svg += '<line style="pointer-events: none" x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>' % (x+0.2*welemnet,y+h, x+0.8*welemnet, y+h, strokew_axis, strokecol_axis)    
+                svg.write('<line style="pointer-events: none" x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x+0.5*welemnet,y-h, x+0.5*welemnet, y+h, strokew_axis, strokecol_axis)    
+                svg.write('<line style="pointer-events: none" x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x+0.2*welemnet,y-h, x+0.8*welemnet, y-h, strokew_axis, strokecol_axis)    
+                svg.write('<line style="pointer-events: none" x1="%f" y1="%f" x2="%f" y2="%f" stroke-width="%f" stroke="%s"/>', x+0.2*welemnet,y+h, x+0.8*welemnet, y+h, strokew_axis, strokecol_axis)    
             
             if showvalues:
                 xt = x+0.5*welemnet
@@ -405,12 +413,12 @@ def svgBarChart(title='',
                 rotation = ''
                 if valuestextangle != 0.0:
                     rotation = 'dominant-baseline="central" transform="rotate(%f, %f, %f)"'%(valuestextangle,xt,yt)
-                svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="500" %s>%s</text>' % (xt, yt, fontsettings.font_name, fontsize*valuestextsizemultiplier, xaxistextcolor, rotation, f.format(value))
+                svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="500" %s>%s</text>', xt, yt, fontsettings.font_name, fontsize*valuestextsizemultiplier, xaxistextcolor, rotation, f.format(value))
                 
             x += welem
 
         svg += '</svg>'
-        return svg
+        return svg.getvalue()
     
     # Pixels to add to the output Widget in order to not see the scrollbars
     added_pixels_width  = 30
@@ -419,86 +427,50 @@ def svgBarChart(title='',
     # Create an output widget and display SVG in it
     out = widgets.Output(layout=Layout(width='calc(%fvw + %dpx)'%(width,added_pixels_width), height='calc(%fvh + %dpx)'%(height,added_pixels_height), margin='0px 0px 0px 0px')) #, border='1px dashed green'))
 
-    svg = createSVG()
+    # Persistent widget: the clicks only patch the stroke of the bars involved in the selection change
+    svgw = svgWidget.svgWidget(svg=createSVG())
     with out:
-        display(HTML(svg))
-
-    # Add an event manager to the out Output widgets
-    d = Event(source=out, watched_events=['click'])
-
-    # Manage click event
-    def handle_event(event):
+        display(svgw)
+
+    # Set the stroke of a bar given its original position
+    def patchBar(pos, isselected):
+        if isselected:
+            svgw.patch('[data-index="%d"]' % pos, stroke_width=strokew_axis,     stroke=selectcolor)
+        else:
+            svgw.patch('[data-index="%d"]' % pos, stroke_width=strokew_axis*0.3, stroke=barstrokecolor)
+    
+    # Manage click event on a bar (pos is the original position of the bar)
+    def handle_event(pos):
         nonlocal selected
         
-        # Given an event returns the x,y coordinates in [0,svgwidth] for x and [0,svgheight] for y
-        def event_to_svg_coordinates(event):
-
-            # Distance from the drawing to the border of the output widget (given the 30 pixels added!!!)
-            dx_left   = 2.0
-            dx_right  = 28.0
-            dy_top    = 5.0
-            dy_bottom = 27.0
-
-            x = event['relativeX']
-            y = event['relativeY']
-            w = event['boundingRectWidth']
-            h = event['boundingRectHeight']
-
-            wnet = w - dx_left - dx_right
-            hnet = h - dy_top  - dy_bottom
-
-            # If the point is outside of the SVG rectangle
-            if x < dx_left or x > dx_left+wnet or y < dy_top  or y > dy_top+hnet:
-                return -1.0, -1.0
-
-            xcorr = x - dx_left
-            xp    = xcorr / wnet
-
-            ycorr = y - dy_top
-            yp    = ycorr / hnet
-
-            return xp*svgwidth, yp*svgheight
-
-            
-        xsvg,ysvg = event_to_svg_coordinates(event)
-       
-        # Test on X coordinate
-        if xsvg >= xstart and xsvg <= xend:
-            pos = int((xsvg-xstart)//welem)
-            
-            xmin = xstart + pos*welem
-            xmax = xmin + welemnet
+        if pos is None:
+            return
+        
+        elem = [x for x in ordered if x[2] == pos][0]
+        previous = selected
+        if enabledeselect:
+            if elem[2] == selected:
+                selected = -1
+            else:
+                selected = elem[2]
+        else:
+            selected = elem[2]
+
+        if showselection:
+            if previous >= 0 and previous != selected:
+                patchBar(previous, False)
+            if selected >= 0:
+                patchBar(selected, True)
+
+        if not on_change is None:
+            if selected < 0:
+                on_change(None)
+            else:
+                on_change(elem)   # Tuple containing (name, value, originalposition)
 
-            if xsvg >= xmin and xsvg <= xmax:    # Test on net width of the column
-                
-                value = values[pos]
-                ymin, helem = rect_ycoords(value)
-                ymax = ymin + helem
-                
-                if ysvg >= ymin and ysvg <= ymax:
-                    elem = ordered[pos]
-                    if enabledeselect:
-                        if elem[2] == selected:
-                            selected = -1
-                        else:
-                            selected = elem[2]
-                    else:
-                        selected = elem[2]
-                            
-                    out.clear_output(wait=True)
-                    with out:
-                        svg = createSVG()
-                        display(HTML(svg))
-
-                    if not on_change is None:
-                        if selected < 0:
-                            on_change(None)
-                        else:
-                            on_change(elem)   # Tuple containing (name, value, originalposition)
-
-                    if not showselection:
-                        selected = -1
+        if not showselection:
+            selected = -1
                             
-    d.on_dom_event(handle_event)
+    svgw.on_click = handle_event
 
     return out #, debug
\ No newline at end of file
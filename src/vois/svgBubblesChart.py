@@ -21,18 +21,21 @@ import pandas as pd
 from datetime import datetime
 from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY
 
-from ipywidgets import HTML, widgets, Layout
-from ipyevents import Event
+from ipywidgets import widgets, Layout
 from IPython.display import display
 
 import plotly.express as px
 
 try:
     from . import colors
+    from . import svgWriter
     from .vuetify import fontsettings
+    from .vuetify import svgWidget
 except:
     import colors
+    import svgWriter
     from vuetify import fontsettings
+    from vuetify import svgWidget
 
 
 # Returns a list of strings (splitted at ' ')
@@ -67,7 +70,7 @@ def verticalText(text, x, y, size, color, fontfamily, weight):
 ###########################################################################################################################################################################
 class svgBubblesChart:
     """
-    Creation of a bubbles chart given an input DataFrame. It is a convenient chart for representing a numerical value that depends on 3 discrete variables. It displays a bi-dimensional grid where the unique values of the x column are displayed on the X axis, while the unique values of the y column are displayed on the Y axis. Inside each cell of the grid, a group of bubbles is displayed, one for each distinct value of the color column, while the size of the circles is proportional to the numerical value read from the size column. See the below example on a mushrooms dataset (taken from https://www.kaggle.com/datasets/uciml/mushroom-classification). The SVG chart has the x coordinates expressed in vw coordinates and the y coordinates expressed in vh coordinates. Cliks on the legend is managed so that individual color categories can be excluded from the chart.
+    Creation of a bubbles chart given an input DataFrame. It is a convenient chart for representing a numerical value that depends on 3 discrete variables. It displays a bi-dimensional grid where the unique values of the x column are displayed on the X axis, while the unique values of the y column are displayed on the Y axis. Inside each cell of the grid, a group of bubbles is displayed, one for each distinct value of the color column, while the size of the circles is proportional to the numerical value read from the size column. See the below example on a mushrooms dataset (taken from https://www.kaggle.com/datasets/uciml/mushroom-classification). The SVG chart has the x coordinates expressed in vw coordinates and the y coordinates expressed in vh coordinates. Cliks on the legend is managed so that individual color categories can be excluded from the chart: the visibility of the bubbles of the category is changed in the browser, without regenerating the SVG.
     
     Parameters
     ----------
@@ -113,6 +116,8 @@ class svgBubblesChart:
          Number of rows to use for the legend (default is 2)
     legenditemwidth : int, optional
         Width in percent of the total width of each item of the legend (default is 10)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
             
     Returns
     -------
@@ -171,6 +176,7 @@ class svgBubblesChart:
                  mode='spread',            # 'spread' or 'concentric' or 'tangent'
                  legendrows=2,             # Number of rows to use for the legend
                  legenditemwidth=10,       # Width in percent of each item of the legend
+                 embedFont=None,           # If False, the SVG does not import the font stylesheet (None: only if not already loaded in the page)
                 ):
         
         self.df                = df
@@ -194,6 +200,7 @@ class svgBubblesChart:
         self.mode              = mode
         self.legendrows        = legendrows
         self.legenditemwidth   = legenditemwidth
+        self.embedFont         = embedFont
         
 
         self.nrows   = self.df.shape[0]
@@ -259,39 +266,34 @@ class svgBubblesChart:
         self.rmax = self.yspace/2.0 - 0.1
         self.rmin = self.rmax/20.0
         
-        # Create Output and Event
+        # Create Output and the persistent SVG widget displayed inside it
         self.out = widgets.Output(layout=Layout(width='calc(%fvw + 10px)'%self.width, height='calc(%fvh + 20px)'%self.height, margin='0px 0px 0px 0px'))  #, border='1px dashed green'))
-        self.event = Event(source=self.out, watched_events=['click']) #, 'dblclick'])
-        self.event.on_dom_event(self.handle_event)
+        self.svgw = svgWidget.svgWidget(on_click=self.handle_event)
+        with self.out:
+            display(self.svgw)
         
         self.debug = widgets.Output()
         
 
-    # Management of 'click' event on the SVG Output
-    def handle_event(self, event):
-        x = event['relativeX']
-        y = event['relativeY']
-        w = event['boundingRectWidth']
-        h = event['boundingRectHeight']
-        xp = self.width  * (x / w)
-        yp = self.height * (y / h)
+    # Management of 'click' event on a legend item (item is the index of the color series)
+    def handle_event(self, item):
+        if not item is None and item >= 0 and item < len(self.display):
+            self.display[item] = not self.display[item]
+            self.showSeries(item)
+
             
-        # Click on a legend item
-        if yp >= self.yend:
-
-            for i in range(len(self.legendpos)):
-                xitem = self.legendpos[i][0]
-                yitem = self.legendpos[i][1]-1.5
-
-                if yp >= yitem and yp <= yitem+self.legenditemheight and xp >= xitem and xp <= (xitem+1.5):
-                    item = i
-                    if item >= 0 and item < len(self.display):
-                        if event['type'] == 'click':
-                            self.display[item] = not self.display[item]
-                        self.draw()
-                    break
+    # Show or hide a color series without regenerating the SVG
+    def showSeries(self, item):
+        if self.display[item]:
+            visibility = 'visible'
+            opacity    = 1.0
+        else:
+            visibility = 'hidden'
+            opacity    = 0.3333
+        self.svgw.patch('.series%d' % item, visibility=visibility)
+        self.svgw.patch('.legend%d' % item, fill_opacity=opacity)
+        
         
-            
     # Return radius from a size value
     def getradius(self, size):
         if (self.maxvalue-self.minvalue) < 0.001: return self.rmax
@@ -317,116 +319,118 @@ class svgBubblesChart:
             w = self.yspace
             
         h = w * 2.2
-        svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0" y="0" width="%fvw" height="%fvh">' % (w,h)
+        svg = svgWriter.svgWriter()
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0" y="0" width="%fvw" height="%fvh">', w,h)
         
         x = w/2.0
-        svg += '<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">Size legend:</text>' % (x-0.01, titlefontsize+0.6, titlefontsize,
+        svg.write('<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">Size legend:</text>', x-0.01, titlefontsize+0.6, titlefontsize,
                                                                                                                                                            self.textcolor, fontsettings.font_name, self.textweight+100)
 
             
         if sidetext:
-            svg += '<text text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>' % (x+self.rmax-0.3, y+fontsize/2-0.2, fontsize,
+            svg.write('<text text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>', x+self.rmax-0.3, y+fontsize/2-0.2, fontsize,
                                                                                                                                                     self.textcolor, fontsettings.font_name, self.textweight, int(self.maxvalue))
         else:
-            svg += '<text text-anchor="middle" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>' % (x-0.01,y+fontsize/2-0.2, fontsize, self.textcolor, fontsettings.font_name, self.textweight, int(self.maxvalue))
-        svg += '<circle cx="%fvw" cy="%fvh" r="%fvh" style="fill:none; stroke:black; stroke-width:1.5; opacity:1.0;"></circle>' % (x,y, self.rmax)
+            svg.write('<text text-anchor="middle" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>', x-0.01,y+fontsize/2-0.2, fontsize, self.textcolor, fontsettings.font_name, self.textweight, int(self.maxvalue))
+        svg.write('<circle cx="%fvw" cy="%fvh" r="%fvh" style="fill:none; stroke:black; stroke-width:1.5; opacity:1.0;"></circle>', x,y, self.rmax)
         
         if sidetext:
             y += self.rmax * 1.8
-            svg += '<text text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>' % (x+self.rmax-0.3,y+fontsize/2-0.2, fontsize, 
+            svg.write('<text text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>', x+self.rmax-0.3,y+fontsize/2-0.2, fontsize, 
                                                                                                                                                    self.textcolor, fontsettings.font_name, self.textweight, int(self.maxvalue/2.0))
         else:
             y += self.rmax * 1.65
-            svg += '<text text-anchor="middle" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>' % (x-0.01,y+fontsize/2-0.2, fontsize,
+            svg.write('<text text-anchor="middle" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>', x-0.01,y+fontsize/2-0.2, fontsize,
                                                                                                                                                     self.textcolor, fontsettings.font_name, self.textweight, int(self.maxvalue/2.0))
-        svg += '<circle cx="%fvw" cy="%fvh" r="%fvh" style="fill:none; stroke:black; stroke-width:1.5; opacity:1.0;"></circle>' % (x,y, self.rmax/2.0)
+        svg.write('<circle cx="%fvw" cy="%fvh" r="%fvh" style="fill:none; stroke:black; stroke-width:1.5; opacity:1.0;"></circle>', x,y, self.rmax/2.0)
 
 
         if sidetext:
             y += self.rmax * 1.0
-            svg += '<text text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>' % (x+self.rmax-0.3, y+fontsize/2-0.2, fontsize, 
+            svg.write('<text text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>', x+self.rmax-0.3, y+fontsize/2-0.2, fontsize, 
                                                                                                                                                    self.textcolor, fontsettings.font_name, self.textweight, int(self.maxvalue/4.0))
         else:
             y += self.rmax * 0.85
-            svg += '<text text-anchor="middle" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>' % (x-0.01,y+fontsize/2-0.2, fontsize,
+            svg.write('<text text-anchor="middle" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%d</text>', x-0.01,y+fontsize/2-0.2, fontsize,
                                                                                                                                                     self.textcolor, fontsettings.font_name, self.textweight, int(self.maxvalue/4.0))
-        svg += '<circle cx="%fvw" cy="%fvh" r="%fvh" style="fill:none; stroke:black; stroke-width:1.5; opacity:1.0;"></circle>' % (x,y, self.rmax/4.0)
+        svg.write('<circle cx="%fvw" cy="%fvh" r="%fvh" style="fill:none; stroke:black; stroke-width:1.5; opacity:1.0;"></circle>', x,y, self.rmax/4.0)
         
         svg += '</svg>'
-        return svg
+        return svg.getvalue()
     
     
     # Return the SVG code
     def getsvg(self):
-        svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0vw" y="0vh" width="%fvw" height="%fvh">' % (self.width, self.height)
+        svg = svgWriter.svgWriter()
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0vw" y="0vh" width="%fvw" height="%fvh">', self.width, self.height)
         
-        svg += '''
+        svg.write('''
                 <style type="text/css">
-                   @import url('%s');
+                   %s
                    .fullrow:hover { stroke: #000044; stroke-dasharray: 3.5,3.5; cursor: pointer; !important; }
                 </style>
-               ''' % (fontsettings.font_url)
+               ''', fontsettings.fontImport(self.embedFont))
 
         
         # Title text
         if len(self.title) > 0:
-            svg += '<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % ((self.xstart+self.xend)/2.0, self.fontsize*1.75, self.titlefontsize, 
+            svg.write('<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', (self.xstart+self.xend)/2.0, self.fontsize*1.75, self.titlefontsize, 
                                                                                                                                                    self.textcolor, fontsettings.font_name, self.textweight+100, self.title)
         
         # Text for the axis
         svg += verticalText(self.ycolumn, 0.4, self.ystart, 1.75*self.fontsize, self.textcolor, fontsettings.font_name, self.textweight+100)
-        svg += '<text text-anchor="end" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (self.xstart, (self.fontsize + self.yend + 0.3), 1.75*self.fontsize, 
+        svg.write('<text text-anchor="end" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', self.xstart, (self.fontsize + self.yend + 0.3), 1.75*self.fontsize, 
                                                                                                                                                 self.textcolor, fontsettings.font_name, self.textweight+100, self.xcolumn)
 
         
         # Background
-        svg += '<rect x="%fvw" y="%fvh" width="%fvw" height="%fvh" fill="%s" fill-opacity="1.0"></rect>' % (self.xstart, self.ystart, self.xend-self.xstart, self.yend-self.ystart, self.backcolor)
+        svg.write('<rect x="%fvw" y="%fvh" width="%fvw" height="%fvh" fill="%s" fill-opacity="1.0"></rect>', self.xstart, self.ystart, self.xend-self.xstart, self.yend-self.ystart, self.backcolor)
         
                 
         # Vertical back lines and xaxis texts
         x = self.xstart
         for xvalue in self.xvalues:
-            svg += '<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>' % (self.backlinecolor, x, self.ystart, x, self.yend)
+            svg.write('<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>', self.backlinecolor, x, self.ystart, x, self.yend)
             if self.xtextangle == 0.0:
                 if len(xvalue) <= self.maxlenx:
-                    svg += '<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (x + 0.5*self.xspace, self.yend+self.fontsize+0.3, self.fontsize, 
+                    svg.write('<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', x + 0.5*self.xspace, self.yend+self.fontsize+0.3, self.fontsize, 
                                                                                                                                                          self.textcolor, fontsettings.font_name, self.textweight, xvalue)
                 else:
                     rows = splitstring(xvalue,self.maxlenx)
                     y = 0
                     for r in rows:
-                        svg += '<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (x + 0.5*self.xspace, self.yend+self.fontsize+3+y, self.fontsize, 
+                        svg.write('<text text-anchor="middle" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', x + 0.5*self.xspace, self.yend+self.fontsize+3+y, self.fontsize, 
                                                                                                                                                              self.textcolor, fontsettings.font_name, self.textweight, r)
                         y += self.fontsize
                     
             else:
-                svg += '''
+                svg.write('''
                         <svg x="%fvw" y="%fvh" overflow="visible">
                             <text style="pointer-events: none" text-anchor="end" x="0vw"  y="0vh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d" transform="rotate(%f)">%s</text>
                         </svg>
-                ''' % (x + 0.5*self.xspace, self.yend+self.fontsize+0.3, self.fontsize, self.textcolor, fontsettings.font_name, self.textweight, self.xtextangle, xvalue)
+                ''', x + 0.5*self.xspace, self.yend+self.fontsize+0.3, self.fontsize, self.textcolor, fontsettings.font_name, self.textweight, self.xtextangle, xvalue)
                 
             x += self.xspace
-        svg += '<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>' % (self.backlinecolor, x, self.ystart, x, self.yend)
+        svg.write('<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>', self.backlinecolor, x, self.ystart, x, self.yend)
             
             
         # Horizontal back lines and y axis texts
         y = self.ystart
         for yvalue in self.yvalues:
-            svg += '<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>' % (self.backlinecolor, self.xstart, y, self.xend, y)
+            svg.write('<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>', self.backlinecolor, self.xstart, y, self.xend, y)
             if len(yvalue) <= self.maxleny:
-                svg += '<text text-anchor="end" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (self.xstart*0.92, y + 0.5*self.yspace, self.fontsize, 
+                svg.write('<text text-anchor="end" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', self.xstart*0.92, y + 0.5*self.yspace, self.fontsize, 
                                                                                                                                                       self.textcolor, fontsettings.font_name, self.textweight, yvalue)
             else:
                 rows = splitstring(yvalue,self.maxleny)
                 dy = -self.fontsize*(len(rows)/2 - 1)
                 for r in rows:
-                    svg += '<text text-anchor="end" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (self.xstart*0.92, y + 0.5*self.yspace+dy, self.fontsize, 
+                    svg.write('<text text-anchor="end" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', self.xstart*0.92, y + 0.5*self.yspace+dy, self.fontsize, 
                                                                                                                                                          self.textcolor, fontsettings.font_name, self.textweight, r)
                     dy += self.fontsize
                         
             y += self.yspace
-        svg += '<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>' % (self.backlinecolor, self.xstart, y, self.xend, y)
+        svg.write('<line style="pointer-events:none; stroke:%s; stroke-width:0.2" x1="%fvw" y1="%fvh" x2="%fvw" y2="%fvh"></line>', self.backlinecolor, self.xstart, y, self.xend, y)
 
 
         # Cycle on all combinations of (x,y) values to display circles
@@ -456,22 +460,23 @@ class svgBubblesChart:
                         else:
                             opacity = 1.0
                         
-                        dodisplay = True
+                        # Circles of hidden series are written anyway: the legend toggles their visibility on the client
+                        series = ''
+                        visibility = ''
                         if self.ncolors > 0:
                             colorvalue = row[self.colorcolumn]
                             if colorvalue in self.colorvalues:
                                 icolor = self.colorvalues.index(colorvalue)
                                 color = self.colorlist[icolor % len(self.colorlist)]
-                                if self.display[icolor]:
-                                    tooltip = xvalue + '/' + yvalue + '/' + colorvalue + ': ' + str(int(size))
-                                else:
-                                    dodisplay = False
+                                tooltip = xvalue + '/' + yvalue + '/' + colorvalue + ': ' + str(int(size))
+                                series = ' series%d' % icolor
+                                if not self.display[icolor]:
+                                    visibility = ' visibility="hidden"'
 
-                        if dodisplay:
-                            r = self.getradius(size)
-                            yc = y
-                            if self.mode == 'tangent': yc = y+maxr-r
-                            svg += '<circle class="fullrow" cx="%fvw" cy="%fvh" r="%fvh" style="fill:%s; stroke:%s; stroke-width:%f; opacity:%f;"><title>%s</title></circle>' % (x+dx,yc, r, color, self.strokecolor,self.strokewidth, opacity, tooltip)
+                        r = self.getradius(size)
+                        yc = y
+                        if self.mode == 'tangent': yc = y+maxr-r
+                        svg.write('<circle class="fullrow%s"%s cx="%fvw" cy="%fvh" r="%fvh" style="fill:%s; stroke:%s; stroke-width:%f; opacity:%f;"><title>%s</title></circle>', series, visibility, x+dx,yc, r, color, self.strokecolor,self.strokewidth, opacity, tooltip)
 
                         if self.mode == 'spread':
                             if dx == 0:  dx -= dxnext
@@ -487,7 +492,7 @@ class svgBubblesChart:
         y = self.yend + self.legenditemheight*1.1
         x = self.xstart
        
-        svg += '<text text-anchor="start" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (x, y+self.fontsize*1.56, self.fontsize*1.75, 
+        svg.write('<text text-anchor="start" x="%fvw"  y="%fvh" font-size="%fvh" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', x, y+self.fontsize*1.56, self.fontsize*1.75, 
                                                                                                                                                 self.textcolor, fontsettings.font_name, self.textweight+100, self.colorcolumn)
         y = self.yend + 2*self.legenditemheight
         dx = self.legenditemwidth
@@ -502,8 +507,8 @@ class svgBubblesChart:
 
             if self.display[i]: opacity = 1.0
             else:               opacity = 0.3333
-            svg += '<rect class="fullrow" style="cursor: pointer;" width="1.35vw" height="%fvh" x="%fvw" y="%fvh" fill="%s" fill-opacity="%f"><title>%s</title></rect>' % (2.7*self.legenditemheight/5, x, y, color, opacity, name)
-            svg += '<text text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" fill-opacity="%f" style="font-family: %s;" font-weight="%d">%s</text>' % (x+1.6, y+self.fontsize*1.5, self.fontsize*1.5, 
+            svg.write('<rect class="fullrow legend%d" data-index="%d" style="cursor: pointer;" width="1.35vw" height="%fvh" x="%fvw" y="%fvh" fill="%s" fill-opacity="%f"><title>%s</title></rect>', i, i, 2.7*self.legenditemheight/5, x, y, color, opacity, name)
+            svg.write('<text class="legend%d" text-anchor="start" x="%fvw" y="%fvh" font-size="%fvh" fill="%s" fill-opacity="%f" style="font-family: %s;" font-weight="%d">%s</text>', i, x+1.6, y+self.fontsize*1.5, self.fontsize*1.5, 
                                                                                                                                                                   self.textcolor, opacity, fontsettings.font_name, self.textweight, name)
             
             self.legendpos.append([x,y])
@@ -515,17 +520,13 @@ class svgBubblesChart:
 
             
         svg += '</svg>'
-        return svg
+        return svg.getvalue()
 
     
     # Returns Output widget containing the line chart
     def draw(self):
-        self.out.clear_output(wait=True)
-        with self.out:
-            self.svg_picture = self.getsvg()
-            display(HTML(self.svg_picture))
-            #display(self.debug)
-
+        self.svg_picture = self.getsvg()
+        self.svgw.update(self.svg_picture)
         return self.out
     
     
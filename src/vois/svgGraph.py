@@ -25,10 +25,12 @@ from textwrap import wrap
 
 try:
     from . import colors
+    from . import svgWriter
     from .vuetify import fontsettings
     from .vuetify import settings
 except:
     import colors
+    import svgWriter
     from vuetify import fontsettings
     from vuetify import settings
 
@@ -54,7 +56,8 @@ def svgGraph(nodes_name,
              borderspercent=10.0,
              nodesradius=3.0,
              fontsize=3.0,
-             onclick=None):
+             onclick=None,
+             embedFont=None):
     """
     Display of a graph.
     
@@ -98,6 +101,8 @@ def svgGraph(nodes_name,
         Size of the font used for nodes' texts. The total graph drawing is created in SVG coordinates [0,100]. Default is 3.0.
     onclick : function, optional
         Python function to call when the user clicks on one of the nodes of the graph. The function will receive as parameter the nodeid of the clicked node, or -1 when the click is outside of all the nodes
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
         
     Returns
     -------
@@ -197,14 +202,15 @@ def svgGraph(nodes_name,
     selected_node = -1
     
     def createSVG():        
-        svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0px" y="0px" viewBox="0 0 100 %d" xml:space="preserve">' % int(height)
+        svg = svgWriter.svgWriter()
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0px" y="0px" viewBox="0 0 100 %d" xml:space="preserve">', int(height))
 
         # CSS styling
-        svg += '''
+        svg.write('''
             <style type="text/css">
-               @import url('%s');
+               %s
             </style>
-        ''' % (fontsettings.font_url)
+        ''', fontsettings.fontImport(embedFont))
 
         for edge, value in edges.items():
             n1 = edge[0]
@@ -215,7 +221,7 @@ def svgGraph(nodes_name,
                 x2 = x2svg(nodes_pos[n2][0])
                 y2 = y2svg(nodes_pos[n2][1])
                 tooltip = nodes_label[n1] + '\n' + nodes_label[n2] + '\n%s: %f' % (edge_label,value)
-                svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s;stroke-width:%f"><title>%s</title></line>' % (x1,y1, x2,y2, edgestrokecolor,edgestrokewidth, tooltip)
+                svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s;stroke-width:%f"><title>%s</title></line>', x1,y1, x2,y2, edgestrokecolor,edgestrokewidth, tooltip)
 
 
         for node, coords in nodes_pos.items():
@@ -231,12 +237,12 @@ def svgGraph(nodes_name,
                 sc = selectedcolor
                 sw = selectedstrokewidth
                 
-            svg += '<circle cx="%f" cy="%f" fill="%s" r="%f" style="stroke:%s;stroke-width:%f"><title>%s</title></circle>' % (x,y,color,radiussvg,sc,sw,label)
-            svg += '<text style="pointer-events: none" text-anchor="middle" x="%f" y="%f" font-size="%f" fill="%s" font-weight="500">%s</text>' % (x, y+fontsize/3, fontsize, textcolor, name)
+            svg.write('<circle cx="%f" cy="%f" fill="%s" r="%f" style="stroke:%s;stroke-width:%f"><title>%s</title></circle>', x,y,color,radiussvg,sc,sw,label)
+            svg.write('<text style="pointer-events: none" text-anchor="middle" x="%f" y="%f" font-size="%f" fill="%s" font-weight="500">%s</text>', x, y+fontsize/3, fontsize, textcolor, name)
 
 
         svg += '</svg>'
-        return svg
+        return svg.getvalue()
     
     # Create an output widget and display SVG in it
     if isinstance(width, int):
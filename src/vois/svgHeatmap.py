@@ -20,13 +20,16 @@
 import pandas as pd
 from textwrap import wrap
 from ipywidgets import HTML, widgets, Layout
+from IPython.display import display
 from ipyevents import Event
 
 try:
     from . import colors
+    from . import svgWriter
     from .vuetify import fontsettings
 except:
     import colors
+    import svgWriter
     from vuetify import fontsettings
 
     
@@ -66,7 +69,8 @@ def heatmapChart(df,
                  highliteback='#dddddd',
                  minvalue=0.0,
                  maxvalue=1.0,
-                 decimals=2):
+                 decimals=2,
+                 embedFont=None):
     """
     Creation of a heatmap chart given an input DataFrame containing only numbers. The index strings and column names are taken as names for rows and columns. The SVG chart has x coordinates expressed in vw coordinates and the y coordinates expressed invh coordinates. Rows and columns of the chart can be selected and the chart will be sorted on decreasing values (when a column is selected, the rows are sorted, and viceversa)
     
@@ -112,6 +116,8 @@ def heatmapChart(df,
         Minimum value of the DataFrame cells to be used for color assignment (default is 1.0)
     decimals : int, optional
         Number of decimals for the tooltip display of cell values (default is 2)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
             
     Returns
     -------
@@ -160,14 +166,15 @@ def heatmapChart(df,
     
     # Calculates the SVG string
     def getSVG():
-        svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">' % (svgwidth,svgheight, preserve, width,height)
+        svg = svgWriter.svgWriter()
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">', svgwidth,svgheight, preserve, width,height)
 
-        svg += '''
+        svg.write('''
         <style type="text/css">
-           @import url('%s');
+           %s
             .cell:hover { cursor: pointer; stroke: #000044; stroke-width:0.1; stroke-dasharray:0.15,0.15; !important; }
         </style>
-        ''' % (fontsettings.font_url)
+        ''', fontsettings.fontImport(embedFont))
 
         # Names of row titles in the first column
         rowTitles = list(df.index)
@@ -181,8 +188,8 @@ def heatmapChart(df,
                 tcolor  = highlitecolor
                 tweight = textweight + 100
                 bcolor = highliteback
-            svg += '<rect fill="%s" width="%f" height="%f" x="0.01" y="%f"></rect>' % (bcolor, wTitle*0.995, hrow*0.95, y+0.2)
-            svg += '<text style="pointer-events: none" text-anchor="end" x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (wTitle-0.1, y+hrow/2.0+0.5, fontsize, 
+            svg.write('<rect fill="%s" width="%f" height="%f" x="0.01" y="%f"></rect>', bcolor, wTitle*0.995, hrow*0.95, y+0.2)
+            svg.write('<text style="pointer-events: none" text-anchor="end" x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', wTitle-0.1, y+hrow/2.0+0.5, fontsize, 
                                                                                                                                                                         tcolor, fontsettings.font_name, tweight, r)
             y += hrow
             
@@ -198,7 +205,7 @@ def heatmapChart(df,
         wmod = w
         if wmod > 3.0: wmod = 3.0
 
-        svg += '<rect fill="%s" width="%f" height="%f" x="0.01" y="%f" ></rect>' % (backcolor, wTitle-0.02, hTitle-0.01, 0.01)
+        svg.write('<rect fill="%s" width="%f" height="%f" x="0.01" y="%f" ></rect>', backcolor, wTitle-0.02, hTitle-0.01, 0.01)
 
         # Column names
         textangle = -90.0   # -45.0
@@ -216,7 +223,7 @@ def heatmapChart(df,
                 tweight = textweight + 100
                 bcolor  = highliteback
 
-            svg += '<rect fill="%s" width="%f" height="%f" x="%f" y="%f" ><title>%s</title></rect>' % (bcolor,w*1.05, hTitle-2.4, x, 2.5, c)
+            svg.write('<rect fill="%s" width="%f" height="%f" x="%f" y="%f" ><title>%s</title></rect>', bcolor,w*1.05, hTitle-2.4, x, 2.5, c)
 
             if len(c) <= columnTitleMaxChar:
                 svg += verticalText(c, x+w/2+0.2, y, fontsize, tcolor, fontsettings.font_name, tweight)
@@ -247,7 +254,7 @@ def heatmapChart(df,
             for c in df.columns:
                 value = df.at[r, c]
                 color = ci.GetColor(value)
-                svg += '<rect stroke-width="0.0" style="fill:%s;"  x="%f" width="%f" height="%f" y="%f"></rect>' % (color, x, w*1.2, hrow*1.2, y+0.25)
+                svg.write('<rect stroke-width="0.0" style="fill:%s;"  x="%f" width="%f" height="%f" y="%f"></rect>', color, x, w*1.2, hrow*1.2, y+0.25)
 
                 x += wcolumn
 
@@ -266,8 +273,7 @@ def heatmapChart(df,
                 value = df.at[r, c]
                 color = ci.GetColor(value)
                 svalue = '{:.{prec}f}'.format(value, prec=decimals)
-                svg += '<rect class="cell" stroke-width="0.0" style="fill:#ffffff00;"  x="%f" width="%f" height="%f" y="%f"><title>%s: %s\n%s: %s\n%s = %s</title></rect>' \
-                       % (x, w*1.1, hrow, y+0.25, textRows, ptext, textColumns, sc, textValues, svalue)
+                svg.write('<rect class="cell" stroke-width="0.0" style="fill:#ffffff00;"  x="%f" width="%f" height="%f" y="%f"><title>%s: %s\n%s: %s\n%s = %s</title></rect>', x, w*1.1, hrow, y+0.25, textRows, ptext, textColumns, sc, textValues, svalue)
 
                 x += wcolumn
 
@@ -275,21 +281,21 @@ def heatmapChart(df,
 
             
         # Title texts
-        svg += '<text style="pointer-events: none" text-anchor="end"    x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (wTitle-0.2, hTitle-0.1, fontsize*1.75, textcolor,
+        svg.write('<text style="pointer-events: none" text-anchor="end"    x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', wTitle-0.2, hTitle-0.1, fontsize*1.75, textcolor,
                                                                                                                                                                        fontsettings.font_name, textweight+100, textRows)
-        svg += '<text style="pointer-events: none" text-anchor="end"    x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (wTitle-0.2, hTitle/2+fontsize, fontsize*1.75, textcolor,
+        svg.write('<text style="pointer-events: none" text-anchor="end"    x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', wTitle-0.2, hTitle/2+fontsize, fontsize*1.75, textcolor,
                                                                                                                                                                        fontsettings.font_name, textweight+100, textColumns)
-        svg += '<text dominant-baseline="middle"   text-anchor="middle" x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>' % (svgwidth/2.0, 1.2, fontsize*2.0, textcolor,
+        svg.write('<text dominant-baseline="middle"   text-anchor="middle" x="%f" y="%f" font-size="%f" fill="%s" style="font-family: %s;" font-weight="%d">%s</text>', svgwidth/2.0, 1.2, fontsize*2.0, textcolor,
                                                                                                                                                                        fontsettings.font_name, textweight+100, title)
 
 
         # Highlight of the big rect
-        svg += '<rect class="cell" fill="#ffffff00" width="%f" height="%f" x="0.01" y="%f" ><title>Click to deselect rows and columns</title></rect>' % (wTitle-0.02, hTitle-0.01, 0.01)
+        svg.write('<rect class="cell" fill="#ffffff00" width="%f" height="%f" x="0.01" y="%f" ><title>Click to deselect rows and columns</title></rect>', wTitle-0.02, hTitle-0.01, 0.01)
         
         # Highlights of row titles in the first column
         y = hTitle
         for r in rowTitles:
-            svg += '<rect class="cell" fill="#ffffff00" width="%f" height="%f" x="0.01" y="%f"><title>%s</title></rect>' % (wTitle*0.995, hrow*0.95, y+0.2, r)
+            svg.write('<rect class="cell" fill="#ffffff00" width="%f" height="%f" x="0.01" y="%f"><title>%s</title></rect>', wTitle*0.995, hrow*0.95, y+0.2, r)
             y += hrow
             
             
@@ -298,12 +304,12 @@ def heatmapChart(df,
         y = hTitle-0.01
         for c in df.columns:
             c = str(c)
-            svg += '<rect class="cell" fill="#ffffff00" width="%f" height="%f" x="%f" y="%f" ><title>%s</title></rect>' % (w*1.05, hTitle-2.4, x, 2.5, c)
+            svg.write('<rect class="cell" fill="#ffffff00" width="%f" height="%f" x="%f" y="%f" ><title>%s</title></rect>', w*1.05, hTitle-2.4, x, 2.5, c)
             x += wcolumn
             
         
         svg += '</svg>'
-        return svg
+        return svg.getvalue()
 
     
     
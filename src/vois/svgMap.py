@@ -128,7 +128,8 @@ def svgMapEurope(df,                          # Pandas dataframe indexed on iso2
                  legendunits='',              # Units of measure to add to the legend (bottom)
                  bordercolor='black',         # Color for lines and rects
                  textcolor='black',           # Color for texts
-                 dark=False):                 # Dark mode
+                 dark=False,                  # Dark mode
+                 embedFont=None):             # If False, the SVG does not import the font stylesheet (None: only if not already loaded in the page)
     """
     Static map of European countries with color legend obtained by joining with a Pandas DataFrame.
     
@@ -178,6 +179,8 @@ def svgMapEurope(df,                          # Pandas dataframe indexed on iso2
         Color for texts of the legend (default is 'black')
     dark : bool, optional
         If True, the bordercolor and textcolor are set to white (default is False)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
         
     Returns
     -------
@@ -265,7 +268,7 @@ def svgMapEurope(df,                          # Pandas dataframe indexed on iso2
    version="1.1">
 
   <style type="text/css">
-     @import url('%s');
+     %s
       
      svg .country:hover path   { fill: %s; }
 
@@ -275,7 +278,7 @@ def svgMapEurope(df,                          # Pandas dataframe indexed on iso2
      svg .bar   {display: none; stroke: %s; stroke-width: 20; }
      svg .barselected  {stroke: %s; stroke-width: 20; }
      svg .country:hover .bar   { display: block; }
-''' % (width, height, fontsettings.font_url, onhoverfill, fontsettings.font_name, textcolor, onhoverfill, stroke_selected)
+''' % (width, height, fontsettings.fontImport(embedFont), onhoverfill, fontsettings.font_name, textcolor, onhoverfill, stroke_selected)
 
    
     # Labels and colors indexed by iso2_code of countries
@@ -29,9 +29,11 @@ import plotly.express as px
 
 try:
     from . import colors
+    from . import svgWriter
     from .vuetify import settings, fontsettings
 except:
     import colors
+    import svgWriter
     from vuetify import settings, fontsettings
 
 
@@ -424,7 +426,7 @@ def circlify(
 def svgPackedCirclesChart(df, valuecolumn, labelcolumn, dimension=30.0,
                           colorlist=px.colors.sequential.Blues,
                           title='', titlecolor='black', titleweight=600, titlecentered=False, titlesize=1.6,
-                          labelcolor='black', fontsize=1.3, drawscale=True, scaledigits=2):
+                          labelcolor='black', fontsize=1.3, drawscale=True, scaledigits=2, embedFont=None):
 
     """ Creation of a packed circles chart given an input DataFrame. Labels are taken from the labelcolumn column of the DataFrame, and numerical values from the valuecolumn column. The chart displays the values with proportional size circles packed toward the centre of the chart.
     
@@ -458,6 +460,8 @@ def svgPackedCirclesChart(df, valuecolumn, labelcolumn, dimension=30.0,
         If Trues, the chart will display an horizontal scale below the circles (default is True)
     scaledigits : int, optional
         Number of decimal digits to display in the tooltip of the scalebar (default is 2)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
             
     Returns
     -------
@@ -515,7 +519,8 @@ def svgPackedCirclesChart(df, valuecolumn, labelcolumn, dimension=30.0,
         scaleheight = fontsize
         displace = 0.4
         
-    svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0vw" y="0vw" width="%fvw" height="%fvw" xml:space="preserve">' % (dimension,titleh+dimension+scaleheight+displace)
+    svg = svgWriter.svgWriter()
+    svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0vw" y="0vw" width="%fvw" height="%fvw" xml:space="preserve">', dimension,titleh+dimension+scaleheight+displace)
 
     values = list(df[valuecolumn])
     labels = list(df[labelcolumn])
@@ -526,12 +531,12 @@ def svgPackedCirclesChart(df, valuecolumn, labelcolumn, dimension=30.0,
 
     circles = circlify(values, show_enclosure=False)
     
-    svg += '''
+    svg.write('''
     <style type="text/css">
-       @import url('%s');
+       %s
        .fullrow:hover { stroke: #000044; stroke-width: 2.5px; stroke-dasharray: 2.5,2.5; cursor: pointer; !important; }
     </style>
-    ''' % (fontsettings.font_url)
+    ''', fontsettings.fontImport(embedFont))
 
     side = dimension*0.5
     pos = len(circles)-1
@@ -539,9 +544,9 @@ def svgPackedCirclesChart(df, valuecolumn, labelcolumn, dimension=30.0,
         tooltip = "%s: %s\n%s: %d" % (labelcolumn, labels[pos], valuecolumn, c.ex['datum'])
         if df.shape[0] == 1: color = colorlist[-1]
         else:                color = ci.GetColor(c.ex['datum'])
-        svg += '<circle class="fullrow" cx="%fvw" cy="%fvw" r="%fvw" fill="%s"><title>%s</title></circle>' % (side+c.x*side,titleh+side+c.y*side, c.r*side, color, tooltip)
+        svg.write('<circle class="fullrow" cx="%fvw" cy="%fvw" r="%fvw" fill="%s"><title>%s</title></circle>', side+c.x*side,titleh+side+c.y*side, c.r*side, color, tooltip)
         if c.r >= 0.1:
-            svg += '<text style="pointer-events: none" dominant-baseline="middle" text-anchor="middle" x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>' % (side+c.x*side, titleh+side+c.y*side, fontsize, labelcolor, fontsettings.font_name, labels[pos])
+            svg.write('<text style="pointer-events: none" dominant-baseline="middle" text-anchor="middle" x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>', side+c.x*side, titleh+side+c.y*side, fontsize, labelcolor, fontsettings.font_name, labels[pos])
         pos -= 1
 
     if drawscale:
@@ -551,18 +556,18 @@ def svgPackedCirclesChart(df, valuecolumn, labelcolumn, dimension=30.0,
             x = i*dimension/1024.0
             val = minvalue + i*(maxvalue-minvalue)/1024.0
             sval = f.format(val)
-            svg += '<line class="fullrow" x1="%fvw" y1="%fvw" x2="%fvw" y2="%fvw" stroke="%s" stroke-width="2px"><title>%s</title></line>' % (x,titleh+dimension,x,titleh+dimension+2*scaleheight,ci.GetColor(i),sval)
+            svg.write('<line class="fullrow" x1="%fvw" y1="%fvw" x2="%fvw" y2="%fvw" stroke="%s" stroke-width="2px"><title>%s</title></line>', x,titleh+dimension,x,titleh+dimension+2*scaleheight,ci.GetColor(i),sval)
             
-        svg += '<text style="pointer-events: none" dominant-baseline="middle" text-anchor="start" x="0.02vw"  y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>' % (titleh+dimension+scaleheight/2+0.3, fontsize, labelcolor, fontsettings.font_name, str(min(values)))
-        svg += '<text style="pointer-events: none" dominant-baseline="middle" text-anchor="end"   x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>' % (dimension-0.2, titleh+dimension+scaleheight/2+0.3, fontsize, labelcolor, fontsettings.font_name, str(max(values)))
+        svg.write('<text style="pointer-events: none" dominant-baseline="middle" text-anchor="start" x="0.02vw"  y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>', titleh+dimension+scaleheight/2+0.3, fontsize, labelcolor, fontsettings.font_name, str(min(values)))
+        svg.write('<text style="pointer-events: none" dominant-baseline="middle" text-anchor="end"   x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>', dimension-0.2, titleh+dimension+scaleheight/2+0.3, fontsize, labelcolor, fontsettings.font_name, str(max(values)))
 
     # Title
     if titlecentered:
-        svg += '<text style="pointer-events: none" dominant-baseline="middle" text-anchor="middle" x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>' % (dimension/2.0, titlesize/2.0+0.2, titlesize, 
+        svg.write('<text style="pointer-events: none" dominant-baseline="middle" text-anchor="middle" x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>', dimension/2.0, titlesize/2.0+0.2, titlesize, 
                                                                                                                                                                                                        titlecolor, fontsettings.font_name, title)
     else:
-        svg += '<text style="pointer-events: none" dominant-baseline="middle" text-anchor="start" x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>' % (0.1, titlesize/2.0+0.2, titlesize, 
+        svg.write('<text style="pointer-events: none" dominant-baseline="middle" text-anchor="start" x="%fvw" y="%fvw" font-size="%fvw" fill="%s" style="font-family:%s;" font-weight="600">%s</text>', 0.1, titlesize/2.0+0.2, titlesize, 
                                                                                                                                                                                                        titlecolor, fontsettings.font_name, title)
     
     svg += '</svg>'
-    return svg
+    return svg.getvalue()
@@ -17,22 +17,26 @@
 # 
 # See the Licence for the specific language governing permissions and
 # limitations under the Licence.
-from ipywidgets import HTML, widgets, Layout
-from ipyevents import Event
+from ipywidgets import widgets, Layout
+from IPython.display import display
 
 import statistics
 
 try:
     from . import colors
+    from . import svgWriter
     from .vuetify import fontsettings
+    from .vuetify import svgWidget
 except:
     import colors
+    import svgWriter
     from vuetify import fontsettings
+    from vuetify import svgWidget
 
     
     
 ###########################################################################################################################################################################
-# Display labels ranked by numerical value and manage selection by click using ipyevents
+# Display labels ranked by numerical value and manage selection by click using svgWidget
 # All horizontal measures are in vw units, all vertical measures are in vh units
 ###########################################################################################################################################################################
 def svgRankChart(title='Ranking of labels',
@@ -54,7 +58,8 @@ def svgRankChart(title='Ranking of labels',
                  stdevnumber=2.0,             # Number of stddev to calculate (minvalue,maxvalue) range
                  minallowed_value=None,       # Minimum value allowed
                  maxallowed_value=None,       # Maximum value allowed
-                 on_change=None):             # Function to call when the selected name is changed
+                 on_change=None,              # Function to call when the selected name is changed
+                 embedFont=None):             # If False, the SVG does not import the font stylesheet (None: only if not already loaded in the page)
     """
     Creation of a chart given a list of labels and corresponding numerical values. The labels are ordered according to the decreasing values and displayed as a vertical list of rectangles. Click on the rectangles is managed by calling a custom python function.
     
@@ -100,6 +105,8 @@ def svgRankChart(title='Ranking of labels',
         Maximum value allowed, to force the calculation of the [min,max] range to map the values to the colors
     on_change: function, optional
         Python function to call when the selection of the rectangle items changes (default is None). The function is called with a tuple as unique argument. The tuple will contain (name, value, originalposition) of the selected rectangle
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
             
     Returns
     -------
@@ -222,14 +229,15 @@ def svgRankChart(title='Ranking of labels',
     preserve = 'xMidYMid meet'
     
     def createSVG():
-        svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">' % (svgwidth,svgheight, preserve, width,height)
+        svg = svgWriter.svgWriter()
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">', svgwidth,svgheight, preserve, width,height)
 
-        svg += '''
+        svg.write('''
     <style type="text/css">
-         @import url('%s');
+         %s
          .prio:hover {cursor: pointer; stroke-width: 1.0; stroke: %s; }
     </style>     
-    ''' % (fontsettings.font_url,hovercolor)
+    ''', fontsettings.fontImport(embedFont),hovercolor)
     
         mean = statistics.mean(values)
         if len(names) <= 1:
@@ -254,7 +262,7 @@ def svgRankChart(title='Ranking of labels',
         if minvalue >= maxvalue: maxvalue = minvalue + 1
         ci = colors.colorInterpolator(colorlist,minvalue,maxvalue)
 
-        svg += '<text x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s</text>' % (svgwidth/2.0, 2.2*titlefontsize/3.0, fontsettings.font_name, titlefontsize, titlecolor, textweight+100, title)
+        svg.write('<text x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s</text>', svgwidth/2.0, 2.2*titlefontsize/3.0, fontsettings.font_name, titlefontsize, titlecolor, textweight+100, title)
         x = 0.1
         y = hTitle
 
@@ -279,18 +287,18 @@ def svgRankChart(title='Ranking of labels',
             spos = ''
             if addposition: spos = str(pos) + '. '
                 
-            svg += '<rect class="prio" x="%f" y="%f" width="%f" height="%f" fill="%s" stroke-width="%f" stroke="%s"><title>%s%s: %d%%</title></rect>' % (x, y, svgwidth-0.2, helem-0.5, col, strokew, stroke, spos, name, int(value*100.0+0.5))
+            svg.write('<rect class="prio" data-index="%d" x="%f" y="%f" width="%f" height="%f" fill="%s" stroke-width="%f" stroke="%s"><title>%s%s: %d%%</title></rect>', pos, x, y, svgwidth-0.2, helem-0.5, col, strokew, stroke, spos, name, int(value*100.0+0.5))
             if len(name) >= splitnamelenght:
                 s1,s2 = splitString(name)
-                svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s%s</text>' % (svgwidth/2, y+fontsize, fontsettings.font_name, fontsize, textcol, textweight, spos, s1)
-                svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s</text>' % (svgwidth/2, y+2*fontsize, fontsettings.font_name, fontsize, textcol, textweight, s2)
+                svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s%s</text>', svgwidth/2, y+fontsize, fontsettings.font_name, fontsize, textcol, textweight, spos, s1)
+                svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s</text>', svgwidth/2, y+2*fontsize, fontsettings.font_name, fontsize, textcol, textweight, s2)
             else:
-                svg += '<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s%s</text>' % (svgwidth/2, y+1.5*fontsize, fontsettings.font_name, fontsize, textcol, textweight, spos, name)
+                svg.write('<text style="pointer-events: none" x="%f" y="%f" text-anchor="middle" font-family="%s" font-size="%f" fill="%s" font-weight="%d">%s%s</text>', svgwidth/2, y+1.5*fontsize, fontsettings.font_name, fontsize, textcol, textweight, spos, name)
             y += helem
             i += 1
 
         svg += '</svg>'
-        return svg
+        return svg.getvalue()
     
     # Pixels to add to the output Widget in order to not see the scrollbars
     added_pixels_width  = 20
@@ -299,72 +307,47 @@ def svgRankChart(title='Ranking of labels',
     # Create an output widget and display SVG in it
     out = widgets.Output(layout=Layout(width='calc(%fvw + %dpx)'%(width,added_pixels_width), height='calc(%fvh + %dpx)'%(height,added_pixels_height), margin='0px 0px 0px 0px')) #border='1px dashed green'))
 
-    svg = createSVG()
+    # Persistent widget: the clicks only patch the stroke of the rectangles involved in the selection change
+    svgw = svgWidget.svgWidget(svg=createSVG())
     with out:
-        display(HTML(svg))
+        display(svgw)
 
-    # Add an event manager to the out Output widgets
-    d = Event(source=out, watched_events=['click'])
-
-    #debug = widgets.Output()
+    # Set the stroke of a rectangle given its original position
+    def patchRect(pos, isselected):
+        if isselected:
+            svgw.patch('[data-index="%d"]' % pos, stroke_width=1.0, stroke=selectcolor)
+        else:
+            svgw.patch('[data-index="%d"]' % pos, stroke_width=0.2, stroke='black')
 
-    # Manage click event
-    def handle_event(event):
+    # Manage click event on a rectangle (pos is the original position of the rectangle)
+    def handle_event(pos):
         nonlocal selected
-        x = event['relativeX']
-        y = event['relativeY']
-        w = event['boundingRectWidth']  - added_pixels_width
-        h = event['boundingRectHeight'] - added_pixels_height
-        ar = float(h) / float(w)
         
-        # Calculate dimension and bounding box of chart in pixels
-        if ar > aspectratio:
-            chartw = w
-            charth = w * aspectratio
-            xmin   = 0
-            xmax   = chartw
-            ymin   = (h - charth)/2
-            ymax   = ymin + charth
-        else:
-            charth = h
-            chartw = h / aspectratio
-            xmin   = (w - chartw)/2
-            xmax   = xmin + chartw
-            ymin   = 0
-            ymax   = charth
-
-        # Calculate position in percentage on the chart area in pixels
-        if y >= ymin and y <= ymax:
-            yp = 100.0 * (y-ymin) / float(charth) - 1.0
-            hTitlePercent = 100.0*hTitle/svgheight
-            hrect = (100.0 - hTitlePercent)/float(len(names))
-            #with debug:
-            #    print(yp,hTitlePercent,hrect)
-            
-            if yp >= hTitlePercent*0.9:
-                elem = ordered[int((yp-hTitlePercent)//hrect)]
-                #with debug:
-                #    print(yp, hTitlePercent, helem, elem)
+        if pos is None:
+            return
         
-                if enabledeselect:
-                    if elem[2] == selected:
-                        selected = -1
-                    else:
-                        selected = elem[2]
-                else:
-                    selected = elem[2]
-                out.clear_output(wait=True)
-                with out:
-                    svg = createSVG()
-                    display(HTML(svg))
-
-                if not on_change is None:
-                    if selected < 0:
-                        on_change(None)
-                    else:
-                        on_change(elem)   # Tuple containing (name, value, originalposition)
+        elem = [x for x in ordered if x[2] == pos][0]
+        previous = selected
+        if enabledeselect:
+            if elem[2] == selected:
+                selected = -1
+            else:
+                selected = elem[2]
+        else:
+            selected = elem[2]
+
+        if previous >= 0 and previous != selected:
+            patchRect(previous, False)
+        if selected >= 0:
+            patchRect(selected, True)
+
+        if not on_change is None:
+            if selected < 0:
+                on_change(None)
+            else:
+                on_change(elem)   # Tuple containing (name, value, originalposition)
     
-    d.on_dom_event(handle_event)
+    svgw.on_click = handle_event
 
     if selectfirstatstart and (not on_change is None):
         on_change(ordered[0])   # Tuple containing (name, value, originalposition)
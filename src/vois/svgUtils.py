@@ -18,7 +18,6 @@
 # See the Licence for the specific language governing permissions and
 # limitations under the Licence.
 from ipywidgets import HTML, widgets, Layout
-from ipyevents import Event
 from IPython.display import display
 import math
 from datetime import datetime
@@ -26,12 +25,16 @@ from textwrap import wrap
 
 try:
     from . import colors
+    from . import svgWriter
     from .vuetify import fontsettings
     from .vuetify import settings
+    from .vuetify import svgWidget
 except:
     import colors
+    import svgWriter
     from vuetify import fontsettings
     from vuetify import settings
+    from vuetify import svgWidget
 
 
 ###########################################################################################################################################################################
@@ -110,9 +113,10 @@ def categoriesLegend(title, descriptions, width=200, elemHeight=38, bordercolor=
     y = 12
     space = 4
     n = len(descriptions)
-    svg = '<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" version="1.1">\n' % (width, 28+n*(elemHeight+space))
+    svg = svgWriter.svgWriter()
+    svg.write('<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" version="1.1">\n', width, 28+n*(elemHeight+space))
     
-    svg += '<text text-anchor="start" x="%d" y="%d" font-size="15" fill="%s" font-weight="500">%s</text>' % (x, y+5, textcolor, title)
+    svg.write('<text text-anchor="start" x="%d" y="%d" font-size="15" fill="%s" font-weight="500">%s</text>', x, y+5, textcolor, title)
     y += elemHeight/2
     
     s = colors.colorInterpolator(colorlist, 1, max(2,n))
@@ -122,18 +126,18 @@ def categoriesLegend(title, descriptions, width=200, elemHeight=38, bordercolor=
         if '\t' in text:
             value = text.split('\t')[0]
             text  = text.split('\t')[1]
-            svg += '<rect style="fill:%s;" x="%d" y="%d" width="%d" height="%d" stroke="%s" stroke-width="%d"><title>%s</title></rect>\n' % (col, x+1, y, elemHeight-1, elemHeight-1, bordercolor, borderWidth, value)
-            svg += '<text text-anchor="start" x="%d" y="%d" font-size="15" fill="%s" font-weight="400">%s<title>%s</title></text>' % (x+elemHeight+space, y+elemHeight/2+4, textcolor, value, text)
+            svg.write('<rect style="fill:%s;" x="%d" y="%d" width="%d" height="%d" stroke="%s" stroke-width="%d"><title>%s</title></rect>\n', col, x+1, y, elemHeight-1, elemHeight-1, bordercolor, borderWidth, value)
+            svg.write('<text text-anchor="start" x="%d" y="%d" font-size="15" fill="%s" font-weight="400">%s<title>%s</title></text>', x+elemHeight+space, y+elemHeight/2+4, textcolor, value, text)
             if len(text) > 0: svg += multilineText(x+2*elemHeight,y-1,width-2*elemHeight-space,elemHeight+10, text)
         else:
             value = text
-            svg += '<rect style="fill:%s;" x="%d" y="%d" width="%d" height="%d" stroke="%s" stroke-width="%d"><title>%s</title></rect>\n' % (col, x+1, y, elemHeight-1, elemHeight-1, bordercolor, borderWidth, text)
-            svg += '<text text-anchor="start" x="%d" y="%d" font-size="15" fill="%s" font-weight="400">%s<title>%s</title></text>' % (x+elemHeight+space, y+elemHeight/2+4, textcolor, value, text)
+            svg.write('<rect style="fill:%s;" x="%d" y="%d" width="%d" height="%d" stroke="%s" stroke-width="%d"><title>%s</title></rect>\n', col, x+1, y, elemHeight-1, elemHeight-1, bordercolor, borderWidth, text)
+            svg.write('<text text-anchor="start" x="%d" y="%d" font-size="15" fill="%s" font-weight="400">%s<title>%s</title></text>', x+elemHeight+space, y+elemHeight/2+4, textcolor, value, text)
                 
         y += elemHeight + space
 
     svg += '</svg>'
-    return svg
+    return svg.getvalue()
 
 
 
@@ -164,7 +168,8 @@ def graduatedLegend(df,                          # Pandas dataframe indexed on c
                     height=600,
                     bordercolor='black',
                     textcolor='black',
-                    dark=False):
+                    dark=False,
+                    embedFont=None):
     """
     Creation of graduated legend in SVG format. Given a Pandas DataFrame in the same format of the one in input to :py:func:`interMap.geojsonMap` function, this functions generates an SVG drawing displaying a graduated colors legend. 
 
@@ -214,6 +219,8 @@ def graduatedLegend(df,                          # Pandas dataframe indexed on c
         Color for texts of the legend (default is 'black')
     dark : bool, optional
         If True, the bordercolor and textcolor are set to white (default is False)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
         
     Returns
     -------
@@ -308,14 +315,15 @@ def graduatedLegend(df,                          # Pandas dataframe indexed on c
     fontsize2 = fontsize - 2
     
     # Calculate the legend in SVG format
-    svg = '''
+    svg = svgWriter.svgWriter()
+    svg.write('''
 <svg xmlns:svg="http://www.w3.org/2000/svg" xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" version="1.1">
   <style type="text/css">
-     @import url('%s');
-''' % (width,height,fontsettings.font_url)
+     %s
+''', width,height,fontsettings.fontImport(embedFont))
 
     # Background
-    svg += '<rect x="0" y="0" width="%d" height="%d" style="fill: white; stroke-width:0;" />' % (width, height)
+    svg.write('<rect x="0" y="0" width="%d" height="%d" style="fill: white; stroke-width:0;" />', width, height)
     
     # Colors indexed by iso2_code of countries
     polycolors = {}    # Fill color of the polygon
@@ -366,7 +374,7 @@ def graduatedLegend(df,                          # Pandas dataframe indexed on c
         
     # Add color for every polygon
     for c in country_codes:
-        svg += 'svg #%s { fill: %s; }\n' % (c, polycolors[c])
+        svg.write('svg #%s { fill: %s; }\n', c, polycolors[c])
         
     svg += '</style>'
 
@@ -376,65 +384,65 @@ def graduatedLegend(df,                          # Pandas dataframe indexed on c
         vt = legendtitle.split('\n')
         yyy = y1 - len(vt)*fontsize
         for t in vt:
-            svg += '<text x="%d" y="%d" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>' % (x1+w/2.0, yyy, fontsize, fontsettings.font_name, textcolor, t)
+            svg.write('<text x="%d" y="%d" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>', x1+w/2.0, yyy, fontsize, fontsettings.font_name, textcolor, t)
             yyy += fontsize
         
     if len(legendunits) > 0:
         vt = legendunits.split('\n')
         yyy = y2+fontsize*1.5
         for t in vt:
-            svg += '<text x="%d" y="%d" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>' % (x1+w/2.0, yyy, fontsize2, fontsettings.font_name, textcolor, t)
+            svg.write('<text x="%d" y="%d" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>', x1+w/2.0, yyy, fontsize2, fontsettings.font_name, textcolor, t)
             yyy += fontsize
         
-    svg += '<rect x="%d" y="%d" width="%d" height="%d" style="fill:none; stroke-width:%f; stroke:%s;" />' % (x1, y1, w, h+1, barthickness*2, bordercolor)
+    svg.write('<rect x="%d" y="%d" width="%d" height="%d" style="fill:none; stroke-width:%f; stroke:%s;" />', x1, y1, w, h+1, barthickness*2, bordercolor)
     
     y = y2
     for i in range(h):
         value = maxvalue - (y - y1) * (maxvalue - minvalue) / (y2 - y1)
-        svg += '<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s;stroke-width:%f" />' % ( x1,y,x2,y, ci.GetColor(value), barthickness )
+        svg.write('<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s;stroke-width:%f" />',  x1,y,x2,y, ci.GetColor(value), barthickness )
         y -= 1
         
-    svg += '<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s; stroke-width:%f" />' % ( x2,y2+3,x2+wlineette,y2+3, bordercolor, barthickness/2.0 )
-    svg += '<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s; stroke-width:%f" />' % ( x2,y1-2,x2+wlineette,y1-2, bordercolor, barthickness/2.0 )
+    svg.write('<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s; stroke-width:%f" />',  x2,y2+3,x2+wlineette,y2+3, bordercolor, barthickness/2.0 )
+    svg.write('<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s; stroke-width:%f" />',  x2,y1-2,x2+wlineette,y1-2, bordercolor, barthickness/2.0 )
     
     valmin = '{:.{prec}f}'.format(minvalue, prec=decimals)
-    svg += '<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>' % (x2+wlineette+5, y2+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, valmin)
+    svg.write('<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>', x2+wlineette+5, y2+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, valmin)
     
     valmax = '{:.{prec}f}'.format(maxvalue, prec=decimals)
-    svg += '<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>' % (x2+wlineette+5, int(y1+fontsize2*0.4), fontsize1, fontsettings.font_name, textcolor, valmax)
+    svg.write('<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>', x2+wlineette+5, int(y1+fontsize2*0.4), fontsize1, fontsettings.font_name, textcolor, valmax)
     
     valmed = '{:.{prec}f}'.format((minvalue+maxvalue)/2.0, prec=decimals)
     if valmed != valmin and valmed != valmax:
         y = (y1+y2)/2.0
-        svg += '<line x1="%d" y1="%f" x2="%d" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
-        svg += '<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>' % (x2+wlineette+5, y+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, valmed)
+        svg.write('<line x1="%d" y1="%f" x2="%d" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
+        svg.write('<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>', x2+wlineette+5, y+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, valmed)
         
     val = '{:.{prec}f}'.format(minvalue + 3.0*(maxvalue-minvalue)/4.0, prec=decimals)
     if val != valmed and val != valmax:
         y = y1+(y2-y1)/4.0
-        svg += '<line x1="%d" y1="%f" x2="%d" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
-        svg += '<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>' % (x2+wlineette+5, y+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, val)
+        svg.write('<line x1="%d" y1="%f" x2="%d" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
+        svg.write('<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>', x2+wlineette+5, y+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, val)
         
     val = '{:.{prec}f}'.format(minvalue + (maxvalue-minvalue)/4.0, prec=decimals)
     if val != valmin and val != valmed:
         y = y1+3.0*(y2-y1)/4.0
-        svg += '<line x1="%d" y1="%f" x2="%d" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
-        svg += '<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>' % (x2+wlineette+5, y+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, val)
+        svg.write('<line x1="%d" y1="%f" x2="%d" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
+        svg.write('<text x="%d" y="%d" font-size="%f" font-family="%s" fill="%s">%s</text>', x2+wlineette+5, y+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, val)
     
     
     # Add horizontal lines in the legend for the selected countries
     for code in codes_selected:
         if code in country_codes:
             if polybary[code] >= y1 and polybary[code] <= y2:
-                svg += '<text x="%f" y="%f" text-anchor="end" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s<title>%s</title></text>' % (x1-wlineette/2, polybary[code]+fontsize2/3, fontsize2, fontsettings.font_name, textcolor, polyname[code], polyname[code])
+                svg.write('<text x="%f" y="%f" text-anchor="end" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s<title>%s</title></text>', x1-wlineette/2, polybary[code]+fontsize2/3, fontsize2, fontsettings.font_name, textcolor, polyname[code], polyname[code])
 
                 dash = ''
                 if polyover[code]:
                     dash = 'stroke-dasharray="%f,%f"' % (wlineette*1.1, wlineette*0.5)
-                svg += '<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s; stroke-width:%f" %s />' % (x1, polybary[code], x2, polybary[code], stroke_selected, barthickness, dash)
+                svg.write('<line x1="%d" y1="%d" x2="%d" y2="%d" style="stroke:%s; stroke-width:%f" %s />', x1, polybary[code], x2, polybary[code], stroke_selected, barthickness, dash)
     
     svg += '</svg>'
-    return svg
+    return svg.getvalue()
 
 
 
@@ -461,7 +469,8 @@ def graduatedLegendVWVH(df,                          # Pandas dataframe indexed
                     height=40.0,
                     bordercolor='black',
                     textcolor='black',
-                    dark=False):
+                    dark=False,
+                    embedFont=None):
     """
     Creation of graduated legend in SVG format. Given a Pandas DataFrame in the same format of the one in input to :py:func:`interMap.geojsonMap` function, this functions generates an SVG drawing displaying a graduated colors legend. 
 
@@ -509,6 +518,8 @@ def graduatedLegendVWVH(df,                          # Pandas dataframe indexed
         Color for texts of the legend (default is 'black')
     dark : bool, optional
         If True, the bordercolor and textcolor are set to white (default is False)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
         
     Returns
     -------
@@ -607,12 +618,13 @@ def graduatedLegendVWVH(df,                          # Pandas dataframe indexed
     
     # Calculate the legend in SVG format
     preserve = 'xMidYMid meet'
-    svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">' % (svgwidth,svgheight, preserve, width,height)
+    svg = svgWriter.svgWriter()
+    svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" xml:space="preserve" viewBox="0 0 %f %f" preserveAspectRatio="%s" width="%fvw" height="%fvh">', svgwidth,svgheight, preserve, width,height)
     
-    svg += '''
+    svg.write('''
   <style type="text/css">
-     @import url('%s');
-''' % fontsettings.font_url
+     %s
+''', fontsettings.fontImport(embedFont))
 
     # Colors indexed by iso2_code of countries
     polycolors = {}    # Fill color of the polygon
@@ -651,72 +663,72 @@ def graduatedLegendVWVH(df,                          # Pandas dataframe indexed
         
     # Add color for every polygon
     for c in country_codes:
-        svg += 'svg #%s { fill: %s; }\n' % (c, polycolors[c])
+        svg.write('svg #%s { fill: %s; }\n', c, polycolors[c])
         
     svg += '</style>'
 
     
     # Legend on the right
     if len(legendtitle) > 0:
-        svg += '<text x="%d" y="%d" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>' % (x1+w/2.0, y1-fontsize, fontsize, fontsettings.font_name, textcolor, legendtitle)
+        svg.write('<text x="%d" y="%d" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>', x1+w/2.0, y1-fontsize, fontsize, fontsettings.font_name, textcolor, legendtitle)
         
     if len(legendunits) > 0:
-        svg += '<text x="%f" y="%f" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>' % (x1+w/2.0, y2+fontsize*1.5, fontsize2, fontsettings.font_name, textcolor, legendunits)
+        svg.write('<text x="%f" y="%f" text-anchor="middle" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>', x1+w/2.0, y2+fontsize*1.5, fontsize2, fontsettings.font_name, textcolor, legendunits)
         
-    svg += '<rect x="%f" y="%f" width="%f" height="%f" style="fill:none; stroke-width:%f; stroke:%s;" />' % (x1, y1, w, h, barthickness*4.0, bordercolor)
+    svg.write('<rect x="%f" y="%f" width="%f" height="%f" style="fill:none; stroke-width:%f; stroke:%s;" />', x1, y1, w, h, barthickness*4.0, bordercolor)
     
     y = y1
     while y <= y2:
         value = maxvalue - (y - y1) * (maxvalue - minvalue) / (y2 - y1)
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s;stroke-width:%f" />' % ( x1,y,x2,y, ci.GetColor(value), barthickness )
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s;stroke-width:%f" />',  x1,y,x2,y, ci.GetColor(value), barthickness )
         y += 0.06666
         
-    svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y2,x2+wlineette,y2, bordercolor, barthickness/2.0 )
-    svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y1,x2+wlineette,y1, bordercolor, barthickness/2.0 )
+    svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y2,x2+wlineette,y2, bordercolor, barthickness/2.0 )
+    svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y1,x2+wlineette,y1, bordercolor, barthickness/2.0 )
 
     xtext = x2 + wlineette*1.25
     
     valmin = '{:.{prec}f}'.format(minvalue, prec=decimals)
-    svg += '<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>' % (xtext, y2+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, valmin)
+    svg.write('<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>', xtext, y2+fontsize2/3, fontsize1, fontsettings.font_name, textcolor, valmin)
     
     valmax = '{:.{prec}f}'.format(maxvalue, prec=decimals)
-    svg += '<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>' % (xtext, int(y1+fontsize2*0.4), fontsize1, fontsettings.font_name, textcolor, valmax)
+    svg.write('<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>', xtext, int(y1+fontsize2*0.4), fontsize1, fontsettings.font_name, textcolor, valmax)
     
     valmed = '{:.{prec}f}'.format((minvalue+maxvalue)/2.0, prec=decimals)
     if valmed != valmin and valmed != valmax:
         y = (y1+y2)/2.0
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
-        svg += '<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>' % (xtext, y+fontsize2/3.0, fontsize1, fontsettings.font_name, textcolor, valmed)
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
+        svg.write('<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>', xtext, y+fontsize2/3.0, fontsize1, fontsettings.font_name, textcolor, valmed)
         
     val = '{:.{prec}f}'.format(minvalue + 3.0*(maxvalue-minvalue)/4.0, prec=decimals)
     if val != valmed and val != valmax:
         y = y1+(y2-y1)/4.0
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
-        svg += '<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>' % (xtext, y+fontsize2/3.0, fontsize1, fontsettings.font_name, textcolor, val)
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
+        svg.write('<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>', xtext, y+fontsize2/3.0, fontsize1, fontsettings.font_name, textcolor, val)
         
     val = '{:.{prec}f}'.format(minvalue + (maxvalue-minvalue)/4.0, prec=decimals)
     if val != valmin and val != valmed:
         y = y1+3.0*(y2-y1)/4.0
-        svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />' % ( x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
-        svg += '<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>' % (xtext, y+fontsize2/3.0, fontsize1, fontsettings.font_name, textcolor, val)
+        svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />',  x2,y,x2+wlineette,y, bordercolor, barthickness/2.0 )
+        svg.write('<text x="%f" y="%f" font-size="%f" font-family="%s" fill="%s">%s</text>', xtext, y+fontsize2/3.0, fontsize1, fontsettings.font_name, textcolor, val)
     
     
     # Add horizontal lines in the legend for the selected countries
     for code in codes_selected:
         if code in country_codes:
             if polybary[code] >= y1 and polybary[code] <= y2:
-                svg += '<text x="%f" y="%f" text-anchor="end" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>' % (x1-wlineette/2, polybary[code]+fontsize2/3, fontsize2, fontsettings.font_name, textcolor, code)
-                svg += '<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />' % (x1, polybary[code], x2, polybary[code], stroke_selected, barthickness*3.0)
+                svg.write('<text x="%f" y="%f" text-anchor="end" font-size="%f" font-family="%s" font-weight="bold" fill="%s">%s</text>', x1-wlineette/2, polybary[code]+fontsize2/3, fontsize2, fontsettings.font_name, textcolor, code)
+                svg.write('<line x1="%f" y1="%f" x2="%f" y2="%f" style="stroke:%s; stroke-width:%f" />', x1, polybary[code], x2, polybary[code], stroke_selected, barthickness*3.0)
     
     svg += '</svg>'
-    return svg
+    return svg.getvalue()
 
 
 ###########################################################################################################################################################################
 # https://www.smashingmagazine.com/2019/01/html5-svg-fill-animation-css3-vanilla-javascript/
 # Small circle with animation: returns a widgets.Output object with the SVG displayed on it
 ###########################################################################################################################################################################
-def SmallCircle(text1, text2, percentage, forecolor="#308040", backcolor=None, textcolor='white', dimension=300.0, fontsize=16.0, textsize=0.0):
+def SmallCircle(text1, text2, percentage, forecolor="#308040", backcolor=None, textcolor='white', dimension=300.0, fontsize=16.0, textsize=0.0, embedFont=None):
     """
     Display of a circle graphics displaying a text and a percentage value. It shows an animation to reach the requested percentage of the full circle.
     
@@ -738,6 +750,8 @@ def SmallCircle(text1, text2, percentage, forecolor="#308040", backcolor=None, t
         Side of the drawing. If an integer or a float is passed, the size is intended in pixels units, otherwise a string containing the units must be passed (example: '4vh'). The default is 300.0 for 300 pixels
     textsize : float, optional
         Text dimension in pixels (default is 0.0 which means that it is automatically calculated from the dimension of the drawing)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
         
     Returns
     -------
@@ -796,24 +810,25 @@ def SmallCircle(text1, text2, percentage, forecolor="#308040", backcolor=None, t
     value = 0.01 * (100.0 - percentage)*circle
     seconds = 1.0 + (circle - value) / circle
     
-    svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0px" y="0px" viewBox="0 0 100 100" xml:space="preserve">'
+    svg = svgWriter.svgWriter()
+    svg += '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0px" y="0px" viewBox="0 0 100 100" xml:space="preserve">'
 
     # CSS styling
-    svg += '''
+    svg.write('''
         <style type="text/css">
-           @import url('%s');
+           %s
         </style>
-    ''' % (fontsettings.font_url)
+    ''', fontsettings.fontImport(embedFont))
 
         
-    svg += '<circle fill="%s" cx="50" cy="50" r="44"><title>%s</title></circle>' % (backcolor,tooltip)
-    svg += '<circle fill="none" stroke="#f1f1f1" stroke-width="10" stroke-mitterlimit="0" cx="50" cy="50" r="%d"><title>%s</title></circle>' % (r,tooltip)
-    svg += '''
+    svg.write('<circle fill="%s" cx="50" cy="50" r="44"><title>%s</title></circle>', backcolor,tooltip)
+    svg.write('<circle fill="none" stroke="#f1f1f1" stroke-width="10" stroke-mitterlimit="0" cx="50" cy="50" r="%d"><title>%s</title></circle>', r,tooltip)
+    svg.write('''
         <circle fill="none" stroke="%s" stroke-width="10.5" stroke-mitterlimit="0" cx="50" cy="50" r="%d" stroke-dasharray="%d" stroke-dashoffset="%d" stroke-linecap="butt" transform="rotate(-90 ) translate(-100 0)">
             <animate attributeName="stroke-dashoffset" values="%d;%d;%d" dur="%fs"></animate>
             <title>%s</title>
         </circle>
-    ''' % (forecolor, r, circle, value, circle, value, value, seconds, tooltip)
+    ''', forecolor, r, circle, value, circle, value, value, seconds, tooltip)
     
 
     vtext = text1.split('<br>')
@@ -830,10 +845,10 @@ def SmallCircle(text1, text2, percentage, forecolor="#308040", backcolor=None, t
     h = int(14 * size)
     y = 47 - (len(vtext)-1)*h
     for t in vtext:
-        svg += '<text font-size="%.2fem" text-anchor="middle" x="50" y="%d" fill="%s" font-weight="bold" style="font-family: %s;">%s<title>%s</title></text>' % (size,y, textcolor, fontsettings.font_name,t,tooltip)
+        svg.write('<text font-size="%.2fem" text-anchor="middle" x="50" y="%d" fill="%s" font-weight="bold" style="font-family: %s;">%s<title>%s</title></text>', size,y, textcolor, fontsettings.font_name,t,tooltip)
         y += h
         
-    svg += '<text font-size="1em" text-anchor="middle" x="50" y="62" fill="%s" font-weight="bold" style="font-family: %s;">%s<title>%s</title></text>' % (textcolor, fontsettings.font_name, text2, tooltip)
+    svg.write('<text font-size="1em" text-anchor="middle" x="50" y="62" fill="%s" font-weight="bold" style="font-family: %s;">%s<title>%s</title></text>', textcolor, fontsettings.font_name, text2, tooltip)
     
     svg += '</svg>'
     
@@ -847,7 +862,7 @@ def SmallCircle(text1, text2, percentage, forecolor="#308040", backcolor=None, t
     out = widgets.Output(layout=Layout(width=w, height='calc(%s + 14px)' % w))
 
     with out:
-        display(HTML(svg))
+        display(HTML(svg.getvalue()))
         
     return out
 
@@ -870,9 +885,9 @@ def AnimatedPieChart(values=[10.0, 25.0, 34.0, 24.0, 23.0], colors=['#2d82c2', '
                      fillpercentage=FillPercentage.fill60, backcolor="#f1f1f1", dimension=400,
                      textcolor=settings.select_textcolor, fontsize=15, textweight=400, decimals=1,
                      centertext='', centercolor=settings.select_textcolor, centerfontsize=18, centertextweight=500,
-                     onclick=None, additional_argument=None, is_selected=False, displayvalues=True):
+                     onclick=None, additional_argument=None, is_selected=False, displayvalues=True, embedFont=None):
     """
-    Creation of an animated pie chart in SVG format. Given an array of float values, and optional labels, the function draws a pie chart that fills its slices with a short animation. An ipywidgets.Output instance is returned, which has the SVG chart displayed in it. By passing a value to the onclick parameter, it is possible to manage the click event on the slices of the pie, providing interactivity to the drawing. The capture of the click event is done using the `ipyevents library <https://github.com/mwcraig/ipyevents>`_ .
+    Creation of an animated pie chart in SVG format. Given an array of float values, and optional labels, the function draws a pie chart that fills its slices with a short animation. An ipywidgets.Output instance is returned, which has the SVG chart displayed in it. By passing a value to the onclick parameter, it is possible to manage the click event on the slices of the pie, providing interactivity to the drawing. The SVG chart is displayed by a persistent :class:`vuetify.svgWidget.svgWidget`, which identifies the clicked slice by its data-index attribute.
     
     Parameters
     ----------
@@ -914,6 +929,8 @@ def AnimatedPieChart(values=[10.0, 25.0, 34.0, 24.0, 23.0], colors=['#2d82c2', '
         Flag to select the pie chart (default is False)
     displayvalues: bool, optional
         If True each slide of the pie will display, inside parenthesis, the corresponding value (default is True)
+    embedFont : bool or None, optional
+        If True, the font stylesheet is imported inside the <style> of the SVG; if False, it is not imported. If None, it is imported unless it has already been loaded in the page by :func:`vuetify.fontsettings.injectFont`, as done by :func:`vuetify.app.app.show` (default is None)
    
     
     Return
@@ -1103,12 +1120,13 @@ def AnimatedPieChart(values=[10.0, 25.0, 34.0, 24.0, 23.0], colors=['#2d82c2', '
         
     # Creation of the SVG
     def createSVG():
-        svg = '<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0px" y="0px" viewBox="0 0 %d %d" xml:space="preserve">' % (svgdimension,svgdimension)
+        svg = svgWriter.svgWriter()
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" x="0px" y="0px" viewBox="0 0 %d %d" xml:space="preserve">', svgdimension,svgdimension)
 
         # CSS styling
-        svg += '''
+        svg.write('''
             <style type="text/css">
-               @import url('%s');
+               %s
                .portion:hover , .portion:hover + .portion-text {
                     cursor: pointer;
                     stroke-width: %f;
@@ -1116,17 +1134,17 @@ def AnimatedPieChart(values=[10.0, 25.0, 34.0, 24.0, 23.0], colors=['#2d82c2', '
                     text-decoration: underline;
                     }
             </style>
-        ''' % (fontsettings.font_url, stroke*1.1, textweight+0)
+        ''', fontsettings.fontImport(embedFont), stroke*1.1, textweight+0)
 
 
         # Back circle
         strclass  = ''
         if is_selected:
             strclass = 'class="portion-out"'
-        svg += '<circle %s fill="%s" cx="200" cy="200" r="200" />' % ( strclass, backcolor )
+        svg.write('<circle %s fill="%s" cx="200" cy="200" r="200" />',  strclass, backcolor )
         
         if is_selected:
-            svg += '<circle %s fill="%s" cx="200" cy="200" r="85" />' % ( strclass, settings.color_first )
+            svg.write('<circle %s fill="%s" cx="200" cy="200" r="85" />',  strclass, settings.color_first )
 
 
         # Animated circles
@@ -1150,26 +1168,26 @@ def AnimatedPieChart(values=[10.0, 25.0, 34.0, 24.0, 23.0], colors=['#2d82c2', '
 
             # Circle sector
             if duration <= 0.0:
-                svg += '''
-                        <circle class="%s" cx="%d" cy="%d" r="%f" transform="rotate(%f, 200, 200)" stroke-dasharray="%d, 1000" fill="none" stroke-width="%f" stroke="%s" stroke-linecap="butt">%s</circle>
+                svg.write('''
+                        <circle class="%s" data-index="%d" cx="%d" cy="%d" r="%f" transform="rotate(%f, 200, 200)" stroke-dasharray="%d, 1000" fill="none" stroke-width="%f" stroke="%s" stroke-linecap="butt">%s</circle>
                             %s
-                ''' % (class_name, cx,cy, r, startangle, int(span), stroke, color, tooltip, svgtext)
+                ''', class_name, i, cx,cy, r, startangle, int(span), stroke, color, tooltip, svgtext)
             else:
-                svg += '''
-                        <circle class="%s" cx="%d" cy="%d" r="%f" transform="rotate(%f, 200, 200)" stroke-dasharray="0, 1000" fill="none" stroke-width="%f" stroke="%s" stroke-linecap="butt">
+                svg.write('''
+                        <circle class="%s" data-index="%d" cx="%d" cy="%d" r="%f" transform="rotate(%f, 200, 200)" stroke-dasharray="0, 1000" fill="none" stroke-width="%f" stroke="%s" stroke-linecap="butt">
                             <animate attributeName="stroke-dasharray" dur="%fs" to="%d,1000" fill="freeze" />%s</circle>
                             %s
-                ''' % (class_name, cx,cy, r, startangle, stroke, color, duration, int(span), tooltip, svgtext)
+                ''', class_name, i, cx,cy, r, startangle, stroke, color, duration, int(span), tooltip, svgtext)
 
         # Center text
-        svg += '<text style="pointer-events: none" font-size="%f" text-anchor="middle" x="200" y="%d" fill="%s" font-weight="%f" %s style="font-family: %s;">%s</text>' % (centerfontsize, 200+fontsize/4, centercolor, centertextweight, underline, fontsettings.font_name, centertext)
+        svg.write('<text style="pointer-events: none" font-size="%f" text-anchor="middle" x="200" y="%d" fill="%s" font-weight="%f" %s style="font-family: %s;">%s</text>', centerfontsize, 200+fontsize/4, centercolor, centertextweight, underline, fontsettings.font_name, centertext)
                 
 
         # Display text again so that it is always visible!!!
         svg += svgtextall
 
         svg += '</svg>'
-        return svg
+        return svg.getvalue()
     
     
     # Create an output widget and display SVG in it
@@ -1182,46 +1200,14 @@ def AnimatedPieChart(values=[10.0, 25.0, 34.0, 24.0, 23.0], colors=['#2d82c2', '
     out = widgets.Output(layout=Layout(width=w, height='calc(%s + 14px)' % w))
 
     
+    # Persistent widget: the clicks on the circle sectors are identified by their data-index attribute
     svg = createSVG()
+    svgw = svgWidget.svgWidget(svg=svg)
     with out:
-        display(HTML(svg))
-        
-    # Add an event manager to the out Output widgets
-    d = Event(source=out, watched_events=['click'])
-
-    cx = svgdimension/2.0
-    cy = svgdimension/2.0
-    radius = svgdimension/2.0
-    
-    if fillpercentage == FillPercentage.fill100:
-        rmin = 0.0
-    elif fillpercentage == FillPercentage.fill75:
-        rmin = radius * 0.25
-    elif fillpercentage == FillPercentage.fill60:
-        rmin = radius * 0.40
-    elif fillpercentage == FillPercentage.fill50:
-        rmin = radius * 0.50
-    else:
-        rmin = 1.0
+        display(svgw)
 
-    
-    # Convert clik angle to startangle values
-    def clickangle2startangle(a):
-        # Convert in [0,360)
-        if a < 0:
-            a += 360.0
-            
-        # Invert direction
-        sa = -a
-        
-        # Take inside interval [-90,270)
-        if sa < -90.0:
-            sa += 360.0
-            
-        return sa
-        
         
-    def handle_event(event):
+    def handle_event(index):
             
         if is_selected:
 
@@ -1232,49 +1218,18 @@ def AnimatedPieChart(values=[10.0, 25.0, 34.0, 24.0, 23.0], colors=['#2d82c2', '
                 else:
                     onclick(-1)
                 
-            out.clear_output(wait=True)
-            with out:
-                display(HTML(createSVG()))
+            svgw.restartAnimations()
 
-        else:
-            x = event['relativeX']
-            y = event['relativeY']
-            w = event['boundingRectWidth']
-            h = event['boundingRectHeight']
-            xp = (x / w) * svgdimension
-            yp = (y / h) * svgdimension
-            px = xp - cx
-            py = cy - yp
-            
-            #with out:
-            #    print(x,y, xp,yp )
-                
-            clickdist,clickangle = cart2polar(px,py)
-            if clickdist >= rmin and clickdist <= radius:
-                sa = clickangle2startangle(clickangle)
-                #with out:
-                #    print(clickangle, sa)
-                    
-                for i in range(len(perc)):
-                    angle      = coordinates[i]['angle']
-                    startangle = coordinates[i]['startangle']
-                
-                    if sa >= startangle and sa <= startangle+angle:
-
-                        # Call callback function
-                        if not onclick is None:
-                            if not additional_argument is None:
-                                onclick(i, additional_argument)
-                            else:
-                                onclick(i)
-                            
-                        #out.clear_output(wait=True)
-                        #with out:
-                        #    display(HTML(createSVG()))
-                            
-                        break
+        elif not index is None:
+
+            # Call callback function
+            if not onclick is None:
+                if not additional_argument is None:
+                    onclick(index, additional_argument)
+                else:
+                    onclick(index)
        
-    d.on_dom_event(handle_event)
+    svgw.on_click = handle_event
     return out, svg
 
 
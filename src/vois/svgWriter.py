@@ -0,0 +1,321 @@
+"""Compact writer of SVG strings used by the svg* chart builders"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2024
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+import re
+import zlib
+
+
+# Default number of decimal digits used to write the values formatted with %f
+precision = 3
+
+# If True, by default the whitespace between tags is removed from the output
+minify = False
+
+# Presentation attributes that are moved into CSS classes when repeated on many elements (the style attribute is moved only from elements that have no class)
+HOISTABLE_ATTRIBUTES = ('font-family', 'font-size', 'font-weight', 'text-anchor', 'style')
+
+# Minimum number of elements sharing the same attributes to create a CSS class
+HOIST_MINCOUNT = 2
+
+
+# Regular expressions used to process the output
+_reformat = re.compile(r'%(?:\([^)]*\))?[-#0 +]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[a-zA-Z%]')
+_retag    = re.compile(r'<([a-zA-Z][\w:.-]*)((?:\s+[\w:.-]+="[^"<>]*")*)\s*(/?)>')
+_reattr   = re.compile(r'([\w:.-]+)="([^"<>]*)"')
+_resvg    = re.compile(r'<svg\b[^<>]*>')
+_restyle  = re.compile(r'(<style[^<>]*>)(.*?)(</style>)', re.DOTALL)
+_renumber = re.compile(r'^-?(\d+\.?\d*|\.\d+)$')
+
+# Cache of the converted format strings: fmt --> (converted fmt, tuple of the positions of the %f arguments)
+_formats = {}
+
+
+# Returns the compact string representation of a number using a given number of decimal digits
+def num(value, digits=None):
+    """
+    Returns the compact string representation of a number: the value is rounded to the given number of decimal digits and the trailing zeros are removed.
+
+    Parameters
+    ----------
+    value : float
+        Number to convert
+    digits : int, optional
+        Number of decimal digits (default is None, which means svgWriter.precision)
+
+    Returns
+    -------
+    a string
+
+    Example
+    -------
+    Write numbers in compact form::
+
+        from vois import svgWriter
+
+        print(svgWriter.num(12.500000))       # 12.5
+        print(svgWriter.num(3.14159265, 2))   # 3.14
+        print(svgWriter.num(-0.0001))         # 0
+
+    """
+    if digits is None:
+        digits = precision
+    s = '%.*f' % (digits, value)
+    if '.' in s:
+        s = s.rstrip('0').rstrip('.')
+    if s == '-0':
+        s = '0'
+    return s
+
+
+# Convert a format string so that its %f placeholders can be written in compact form
+def _convertFormat(fmt):
+    converted = _formats.get(fmt, None)
+    if converted is None:
+        parts     = []
+        positions = []
+        last  = 0
+        index = 0
+        for m in _reformat.finditer(fmt):
+            spec = m.group(0)
+            if spec == '%%':
+                continue
+            parts.append(fmt[last:m.start()])
+            if spec == '%f':
+                parts.append('%s')
+                positions.append(index)
+            else:
+                parts.append(spec)
+            last = m.end()
+            index += 1
+        parts.append(fmt[last:])
+        converted = (''.join(parts), tuple(positions))
+        _formats[fmt] = converted
+    return converted
+
+
+# Returns the CSS value of a presentation attribute
+def _cssValue(name, value):
+    if name == 'style':
+        return value.strip().rstrip(';')
+    if name == 'font-size' and _renumber.match(value):
+        return value + 'px'
+    return value
+
+
+#####################################################################################################################################################
+# Class to write SVG strings
+#####################################################################################################################################################
+class svgWriter():
+    """
+    Writer of SVG strings. The chunks of the SVG are collected in a list (avoiding the quadratic cost of repeated string concatenations) and the full string is built by the :func:`getvalue` method. The values formatted with the %f placeholder are written with a limited number of decimal digits and without trailing zeros; the attributes repeated on many elements (font-family, font-size, font-weight, text-anchor and the style of the elements that have no class) are moved into CSS classes declared in a <style> tag placed at the beginning of the drawing; the whitespace between tags can be removed.
+
+    The names of the CSS classes are derived from their declarations, so that many SVG drawings written by different svgWriter instances can be displayed in the same page without conflicts.
+
+    Parameters
+    ----------
+    precision : int, optional
+        Number of decimal digits used to write the values formatted with %f (default is None, which means svgWriter.precision)
+    hoist : bool, optional
+        If True, the repeated presentation attributes are moved into CSS classes (default is True)
+    minify : bool, optional
+        If True, the whitespace between tags and inside <style> tags is removed (default is None, which means svgWriter.minify)
+
+    Example
+    -------
+    Creation of a simple SVG drawing::
+
+        from vois import svgWriter
+        from IPython.display import display, HTML
+
+        svg = svgWriter.svgWriter(precision=2)
+        svg.write('<svg version="1.1" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 %f %f">', 100.0, 50.0)
+        for i in range(10):
+            svg.write('<circle cx="%f" cy="25" r="%f" fill="%s"/>', 5.0 + i*10.0, 1.0 + i/3.0, 'red')
+            svg.write('<text x="%f" y="45" font-family="Roboto" font-size="3">%d</text>', 5.0 + i*10.0, i)
+        svg += '</svg>'
+
+        display(HTML(svg.getvalue()))
+
+    """
+
+    def __init__(self, precision=None, hoist=True, minify=None):
+        self.precision = precision
+        self.hoist     = hoist
+        self.minify    = minify
+        self.chunks    = []
+
+
+    # Append a string formatted with the % operator, writing the %f arguments in compact form
+    def write(self, fmt, *args):
+        """
+        Append a string to the SVG. The string is obtained applying the % operator to the format and the arguments; the arguments corresponding to %f placeholders are written with the precision of the writer.
+
+        Parameters
+        ----------
+        fmt : str
+            Format string
+        *args
+            Arguments of the format string
+        """
+        if len(args) == 0:
+            self.chunks.append(fmt)
+            return
+
+        newfmt, positions = _convertFormat(fmt)
+        if len(positions) > 0:
+            digits = self.precision if self.precision is not None else precision
+            args = list(args)
+            for i in positions:
+                args[i] = num(args[i], digits)
+            args = tuple(args)
+        self.chunks.append(newfmt % args)
+
+
+    # Append a string without any processing
+    def raw(self, text):
+        """
+        Append a string to the SVG without any processing.
+
+        Parameters
+        ----------
+        text : str
+            String to append
+        """
+        self.chunks.append(text)
+
+
+    # Support for svg += '...'
+    def __iadd__(self, text):
+        self.chunks.append(text)
+        return self
+
+
+    # Returns the total number of characters written
+    def __len__(self):
+        return sum(len(x) for x in self.chunks)
+
+
+    # Returns the string containing the SVG
+    def getvalue(self):
+        """
+        Returns the string containing the SVG, after the hoisting of the repeated attributes into CSS classes and the optional minification.
+
+        Returns
+        -------
+        a string
+        """
+        svg = ''.join(self.chunks)
+        if self.hoist:
+            svg = hoistAttributes(svg)
+        if self.minify if self.minify is not None else minify:
+            svg = minifySVG(svg)
+        return svg
+
+
+    def __str__(self):
+        return self.getvalue()
+
+
+
+# Move the presentation attributes repeated on many elements into CSS classes
+def hoistAttributes(svg, attributes=HOISTABLE_ATTRIBUTES, mincount=HOIST_MINCOUNT):
+    """
+    Move the presentation attributes repeated on many elements of an SVG drawing into CSS classes. The CSS classes are declared in a <style> tag placed just after the opening <svg> tag. If the string does not contain an <svg> tag, it is returned unchanged.
+
+    Parameters
+    ----------
+    svg : str
+        String containing the SVG drawing
+    attributes : tuple of str, optional
+        Names of the attributes that can be moved into CSS classes (default is svgWriter.HOISTABLE_ATTRIBUTES)
+    mincount : int, optional
+        Minimum number of elements sharing the same values of the attributes to create a CSS class (default is svgWriter.HOIST_MINCOUNT)
+
+    Returns
+    -------
+    a string
+    """
+    m = _resvg.search(svg)
+    if m is None:
+        return svg
+    start = m.end()
+
+    # Returns the tuple of (name,value) of the hoistable attributes of a tag
+    def hoistableKey(attrs):
+        pairs = _reattr.findall(attrs)
+        names = [name for name, value in pairs]
+        return tuple((name, value) for name, value in pairs if name in attributes and (name != 'style' or (not 'class' in names and names.count('style') == 1)))
+
+    counts = {}
+    for tag in _retag.finditer(svg, start):
+        key = hoistableKey(tag.group(2))
+        if len(key) > 0:
+            counts[key] = counts.get(key, 0) + 1
+
+    classes = {}
+    for key, count in counts.items():
+        if count >= mincount:
+            declarations = ';'.join(_cssValue(name, value) if name == 'style' else '%s:%s' % (name, _cssValue(name, value)) for name, value in key)
+            classes[key] = ('h%08x' % zlib.crc32(declarations.encode('utf-8')), declarations)
+
+    if len(classes) == 0:
+        return svg
+
+    # Rewrite a tag removing the hoisted attributes and adding the class
+    def rewrite(tag):
+        attrs = tag.group(2)
+        key = hoistableKey(attrs)
+        if not key in classes:
+            return tag.group(0)
+
+        classname = classes[key][0]
+        out = []
+        hasclass = False
+        for name, value in _reattr.findall(attrs):
+            if (name, value) in key:
+                continue
+            if name == 'class':
+                value = value + ' ' + classname
+                hasclass = True
+            out.append('%s="%s"' % (name, value))
+        if not hasclass:
+            out.append('class="%s"' % classname)
+        return '<%s %s%s>' % (tag.group(1), ' '.join(out), tag.group(3))
+
+    body  = _retag.sub(rewrite, svg[start:])
+    style = '<style type="text/css">%s</style>' % ''.join('.%s{%s}' % c for c in sorted(classes.values()))
+    return svg[:start] + style + body
+
+
+# Remove the whitespace between tags
+def minifySVG(svg):
+    """
+    Remove the whitespace between tags and collapse the whitespace inside <style> tags. Whitespace between two <tspan> elements is removed too, so the texts that rely on it should not be minified.
+
+    Parameters
+    ----------
+    svg : str
+        String containing the SVG drawing
+
+    Returns
+    -------
+    a string
+    """
+    svg = _restyle.sub(lambda m: m.group(1) + ' '.join(m.group(2).split()) + m.group(3), svg)
+    return re.sub(r'>\s+<', '><', svg).strip()
@@ -23,6 +23,7 @@ from ipywidgets import widgets, Layout
 import ipyvuetify as v
 
 # Vois imports
+from vois import scheduler
 from vois.vuetify import settings, Toggle, selectSingle, dialogWait, sliderFloat, switch
 from vois.geo import Map, mapUtils
 from vois.templates import PlotlyChart, SVGdrawing, Image, PageConfigurator
@@ -68,6 +69,12 @@ class Content(v.Card):
 
         self.debug = widgets.Output()
 
+        # Rapid changes of the sliders are coalesced into a single update
+        self.debouncer = scheduler.Debouncer()
+
+        # Bounds changes of a map are propagated to the linked maps at most once every scheduler.default_interval seconds
+        self.boundsThrottler = scheduler.Throttler()
+
         # Dimensioning
         self.labelwidth = 96
         self.togglewidth = 46
@@ -127,6 +134,10 @@ class Content(v.Card):
                            width=self._width, min_width=self._width, max_width=self._width,
                            height=self._height, min_height=self._height, max_height=self._height)
 
+        # Cards of the four areas and containers of the splitmodes, created once and reused by the update method
+        self.areacards = [v.Card(flag=True, tile=True) for i in range(4)]
+        self.containers = {}
+
         self.card1 = self.card2 = self.card3 = self.card4 = None
         self.card1children = self.card2children = self.card3children = self.card4children = None  # Widgets to display in the component cards
 
@@ -309,18 +320,22 @@ class Content(v.Card):
         if self.showWaitDialogOnUpdate and dialogWaitEnabled:
             dlg.close()
 
-    # Management of the linked state among the maps
+    # Management of the linked state among the maps (the propagation is throttled: during a pan the other maps are updated at regular intervals and the final bounds are always applied)
     def onMapBoundsChanged(self, change):
         if self.propagateBounds:
             if len(self.maps) > 1:
                 if self._linkedmaps:
-                    inputMap = change['owner']
-                    for m in self.maps:
-                        if not m is inputMap:
-                            self.propagateBounds = False
-                            m.center = inputMap.center
-                            m.zoom = inputMap.zoom
-                            self.propagateBounds = True
+                    self.boundsThrottler.schedule('bounds', self.propagateMapBounds, change['owner'])
+
+    # Set center and zoom of an input map on all the other maps
+    def propagateMapBounds(self, inputMap):
+        for m in self.maps:
+            if not m is inputMap:
+                self.propagateBounds = False
+                with m.hold_sync():
+                    m.center = inputMap.center
+                    m.zoom = inputMap.zoom
+                self.propagateBounds = True
 
     # Select* change
     def onselect1Change(self):
@@ -337,11 +352,11 @@ class Content(v.Card):
 
     # Change of left width
     def leftwidthChange(self, value):
-        self.leftwidthperc = int(value)
+        self.debouncer.schedule('leftwidthperc', setattr, self, 'leftwidthperc', int(value))
 
     # Change of the top height
     def topheightChange(self, value):
-        self.topheightperc = int(value)
+        self.debouncer.schedule('topheightperc', setattr, self, 'topheightperc', int(value))
 
     # Set the linked flag
     def linkedChange(self, flag):
@@ -377,7 +392,9 @@ class Content(v.Card):
         if self.card3children is not None: self.card3children.dark = self._dark
         if self.card4children is not None: self.card4children.dark = self._dark
 
-    # Update the content when splitmode is changed
+    # Update the content when splitmode is changed.
+    # The four area cards and the containers of each splitmode are created only once and then reused: only the traits that changed
+    # (dimensions and border style) are sent to the frontend, so that the contents (maps, charts) are not rebuilt at each update
     def update(self):
 
         wl = 'calc(%s * %f)' % (self._width, self._leftwidthperc / 100)
@@ -385,112 +402,44 @@ class Content(v.Card):
         ht = 'calc(%s * %f)' % (self._height, self._topheightperc / 100)
         hb = 'calc(%s * %f)' % (self._height, (100 - self._topheightperc) / 100)
 
-        # Single content
+        # Layout of the visible cards for each splitmode: list of (width, height, list of the sides having a border)
         if self._splitmode == 0:
-            self.card1 = v.Card(flag=True, tile=True, style_='overflow: hidden;',
-                                width=self._width, min_width=self._width, max_width=self._width,
-                                height=self._height, min_height=self._height, max_height=self._height)
-            self.card2 = None
-            self.card3 = None
-            self.card4 = None
-
-            self.card.children = [self.card1]
-            self.toggle_configure.value = 0
-            self.toggle_configure.buttons[1].disabled = True
-            self.toggle_configure.buttons[2].disabled = True
-            self.toggle_configure.buttons[3].disabled = True
-
-        # 2 horizontal contents
+            # Single content
+            areas = [(self._width, self._height, [])]
+            numenabled = 1
         elif self._splitmode == 1:
-            self.card1 = v.Card(flag=True, tile=True, outlined=True,
-                                style_='border: 0px solid red; border-right: %dpx solid %s; overflow: hidden;' % (
-                                self._borderwidth, self._color_first),
-                                width=wl, min_width=wl, max_width=wl,
-                                height=self._height, min_height=self._height, max_height=self._height)
-            self.card2 = v.Card(flag=True, tile=True,
-                                width=wr, min_width=wr, max_width=wr,
-                                height=self._height, min_height=self._height, max_height=self._height)
-
-            self.card3 = None
-            self.card4 = None
-
-            self.card.children = [widgets.HBox([self.card1, self.card2])]
-            if self.toggle_configure.value > 1: self.toggle_configure.value = 0
-            self.toggle_configure.buttons[1].disabled = False
-            self.toggle_configure.buttons[2].disabled = True
-            self.toggle_configure.buttons[3].disabled = True
-
-
-        # 2 vertical contents
+            # 2 horizontal contents
+            areas = [(wl, self._height, ['right']), (wr, self._height, [])]
+            numenabled = 2
         elif self._splitmode == 2:
-            self.card1 = v.Card(flag=True, tile=True, outlined=True,
-                                style_='border: 0px solid red; border-bottom: %dpx solid %s; overflow: hidden;' % (
-                                self._borderwidth, self._color_first),
-                                width=self._width, min_width=self._width, max_width=self._width,
-                                height=ht, min_height=ht, max_height=ht)
-            self.card2 = v.Card(flag=True, tile=True,
-                                width=self._width, min_width=self._width, max_width=self._width,
-                                height=hb, min_height=hb, max_height=hb)
-
-            self.card3 = None
-            self.card4 = None
-
-            self.card.children = [widgets.VBox([self.card1, self.card2])]
-            if self.toggle_configure.value > 1: self.toggle_configure.value = 0
-            self.toggle_configure.buttons[1].disabled = False
-            self.toggle_configure.buttons[2].disabled = True
-            self.toggle_configure.buttons[3].disabled = True
-
-        # 2 vertical contents + 1 on the right at full height
+            # 2 vertical contents
+            areas = [(self._width, ht, ['bottom']), (self._width, hb, [])]
+            numenabled = 2
         elif self._splitmode == 3:
-            self.card1 = v.Card(flag=True, tile=True, outlined=True,
-                                style_='border: 0px solid red; border-right: %dpx solid %s; border-bottom: %dpx solid %s; overflow: hidden;' % (
-                                self._borderwidth, self._color_first,
-                                self._borderwidth, self._color_first),
-                                width=wl, min_width=wl, max_width=wl,
-                                height=ht, min_height=ht, max_height=ht)
-            self.card2 = v.Card(flag=True, tile=True, outlined=True,
-                                style_='border: 0px solid red; border-right: %dpx solid %s; overflow: hidden;' % (
-                                self._borderwidth, self._color_first),
-                                width=wl, min_width=wl, max_width=wl,
-                                height=hb, min_height=hb, max_height=hb)
-            self.card3 = v.Card(flag=True, tile=True,
-                                width=wr, min_width=wr, max_width=wr,
-                                height=self._height, min_height=self._height, max_height=self._height)
-            self.card4 = None
-
-            self.card.children = [widgets.HBox([widgets.VBox([self.card1, self.card2]), self.card3])]
-            if self.toggle_configure.value > 2: self.toggle_configure.value = 0
-            self.toggle_configure.buttons[1].disabled = False
-            self.toggle_configure.buttons[2].disabled = False
-            self.toggle_configure.buttons[3].disabled = True
-
-        # 4 contents
+            # 2 vertical contents + 1 on the right at full height
+            areas = [(wl, ht, ['right', 'bottom']), (wl, hb, ['right']), (wr, self._height, [])]
+            numenabled = 3
         else:
-            self.card1 = v.Card(flag=True, tile=True, outlined=True,
-                                style_='border: 0px solid red; border-right: %dpx solid %s; border-bottom: %dpx solid %s; overflow: hidden;' % (
-                                self._borderwidth, self._color_first,
-                                self._borderwidth, self._color_first),
-                                width=wl, min_width=wl, max_width=wl,
-                                height=ht, min_height=ht, max_height=ht)
-            self.card2 = v.Card(flag=True, tile=True, outlined=True,
-                                style_='border: 0px solid red; border-right: %dpx solid %s; overflow: hidden;' % (
-                                self._borderwidth, self._color_first),
-                                width=wl, min_width=wl, max_width=wl,
-                                height=hb, min_height=hb, max_height=hb)
-            self.card3 = v.Card(flag=True, tile=True,
-                                style_='border: 0px solid red; border-bottom: %dpx solid %s; overflow: hidden;' % (
-                                self._borderwidth, self._color_first),
-                                width=wr, min_width=wr, max_width=wr,
-                                height=ht, min_height=ht, max_height=ht)
-            self.card4 = v.Card(flag=True, tile=True,
-                                width=wr, min_width=wr, max_width=wr,
-                                height=hb, min_height=hb, max_height=hb)
-            self.card.children = [
-                widgets.HBox([widgets.VBox([self.card1, self.card2]), widgets.VBox([self.card3, self.card4])])]
-            self.toggle_configure.buttons[1].disabled = False
-            self.toggle_configure.buttons[2].disabled = False
-            self.toggle_configure.buttons[3].disabled = False
+            # 4 contents
+            areas = [(wl, ht, ['right', 'bottom']), (wl, hb, ['right']), (wr, ht, ['bottom']), (wr, hb, [])]
+            numenabled = 4
+
+        for index, (width, height, sides) in enumerate(areas):
+            style = 'overflow: hidden;'
+            if len(sides) > 0:
+                style = 'border: 0px solid red; %s overflow: hidden;' % ' '.join(['border-%s: %dpx solid %s;' % (side, self._borderwidth, self._color_first) for side in sides])
+            self.patchWidget(self.areacards[index], outlined=len(sides) > 0, style_=style,
+                             width=width, min_width=width, max_width=width,
+                             height=height, min_height=height, max_height=height)
+
+        visible = self.areacards[:len(areas)] + [None] * (4 - len(areas))
+        self.card1, self.card2, self.card3, self.card4 = visible
+
+        self.card.children = [self.splitmodeContainer(self._splitmode)]
+
+        if self.toggle_configure.value >= numenabled: self.toggle_configure.value = 0
+        for index in range(1, 4):
+            self.toggle_configure.buttons[index].disabled = index >= numenabled
 
         self.updateColors()
 
@@ -499,6 +448,29 @@ class Content(v.Card):
         self.set3(self.card3children)
         self.set4(self.card4children)
 
+    # Returns the container widget that arranges the area cards for a splitmode (created only the first time)
+    def splitmodeContainer(self, splitmode):
+        if splitmode not in self.containers:
+            c1, c2, c3, c4 = self.areacards
+            if splitmode == 0:
+                self.containers[splitmode] = c1
+            elif splitmode == 1:
+                self.containers[splitmode] = widgets.HBox([c1, c2])
+            elif splitmode == 2:
+                self.containers[splitmode] = widgets.VBox([c1, c2])
+            elif splitmode == 3:
+                self.containers[splitmode] = widgets.HBox([widgets.VBox([c1, c2]), c3])
+            else:
+                self.containers[splitmode] = widgets.HBox([widgets.VBox([c1, c2]), widgets.VBox([c3, c4])])
+        return self.containers[splitmode]
+
+    # Set the traits of a widget, only for the values that are different from the current ones
+    @staticmethod
+    def patchWidget(widget, **traits):
+        for name, value in traits.items():
+            if getattr(widget, name) != value:
+                setattr(widget, name, value)
+
     # Set the content of cards 1,2,3,4 (can pass None or a widget that has width and height properties
     def set1(self, children=None):
         self.card1children = children
@@ -506,8 +478,10 @@ class Content(v.Card):
             if self.card1children is None:
                 self.card1.children = []
             else:
-                self.card1children.width = self.card1.width
-                self.card1children.height = self.card1.height
+                if self.card1children.width != self.card1.width:
+                    self.card1children.width = self.card1.width
+                if self.card1children.height != self.card1.height:
+                    self.card1children.height = self.card1.height
                 self.card1.children = [self.card1children.draw()]
                 self.updateColors()
 
@@ -517,8 +491,10 @@ class Content(v.Card):
             if self.card2children is None:
                 self.card2.children = []
             else:
-                self.card2children.width = self.card2.width
-                self.card2children.height = self.card2.height
+                if self.card2children.width != self.card2.width:
+                    self.card2children.width = self.card2.width
+                if self.card2children.height != self.card2.height:
+                    self.card2children.height = self.card2.height
                 self.card2.children = [self.card2children.draw()]
                 self.updateColors()
 
@@ -528,8 +504,10 @@ class Content(v.Card):
             if self.card3children is None:
                 self.card3.children = []
             else:
-                self.card3children.width = self.card3.width
-                self.card3children.height = self.card3.height
+                if self.card3children.width != self.card3.width:
+                    self.card3children.width = self.card3.width
+                if self.card3children.height != self.card3.height:
+                    self.card3children.height = self.card3.height
                 self.card3.children = [self.card3children.draw()]
                 self.updateColors()
 
@@ -539,8 +517,10 @@ class Content(v.Card):
             if self.card4children is None:
                 self.card4.children = []
             else:
-                self.card4children.width = self.card4.width
-                self.card4children.height = self.card4.height
+                if self.card4children.width != self.card4.width:
+                    self.card4children.width = self.card4.width
+                if self.card4children.height != self.card4.height:
+                    self.card4children.height = self.card4.height
                 self.card4.children = [self.card4children.draw()]
                 self.updateColors()
 
@@ -701,6 +681,7 @@ class Content(v.Card):
 
     @property
     def state(self):
+        self.debouncer.flush()
         s = {x: getattr(self, x) for x in ['width',
                                            'height',
                                            'splitmode',
@@ -730,6 +711,7 @@ class Content(v.Card):
                                         dark=statusdict['dark'])
 
         self.updateWidgetsOnLoadState = True
+        self.debouncer.cancel()
 
         self.card1children = self.card2children = self.card3children = self.card4children = None
 
@@ -25,6 +25,7 @@ import pandas as pd
 import random
 
 # Vois imports
+from vois import assetCache
 from vois.vuetify import settings, Button, UploadImage
 from vois.templates import PageConfigurator
 
@@ -67,7 +68,7 @@ class Image():
         self.card = v.Card(flat=True, tile=True, width=self._width, height=self._height,
                            style_='overflow: hidden;', class_='d-flex align-center justify-center')  # The content of the card is centered horizontally and vertically
         
-        self.img = v.Img(src=self._imageurl, contain=True, width=self._width, height=self._height, position='center center')
+        self.img = v.Img(src=assetCache.localURL(self._imageurl), contain=True, width=self._width, height=self._height, position='center center')
         
         self.tf = None
         self.b  = None
@@ -155,7 +156,7 @@ class Image():
     @imageurl.setter
     def imageurl(self, url):
         self._imageurl = url
-        self.img.src = self._imageurl
+        self.img.src = assetCache.localURL(self._imageurl)
         
         
     @property
@@ -22,14 +22,26 @@
 from ipywidgets import widgets, HTML, Layout
 import ipyvuetify as v
 import json
+import os
 
 # Vois imports
-from vois import download
+from vois import download, scheduler
 from vois.vuetify import settings, page, selectImage, Button, UploadImage, UploadJson, sliderFloat, ColorPicker, switch, selectSingle, tabs, sortableList, dialogGeneric, iconButton
 from vois.vuetify import mainPage
 from vois.templates import PageConfigurator
 
 
+# Folder containing the stock background images
+GRAPHICS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'graphics')
+
+# Returns the path of a stock background image, or its URL if the graphics folder is not available
+def stockImage(index):
+    filepath = os.path.join(GRAPHICS_FOLDER, '%d.jpg' % index)
+    if os.path.isfile(filepath):
+        return filepath
+    return 'https://www.daigio.it/JRC/WallpapersSmall/%d.jpg' % index
+
+
 # Panels dimensioning
 LEFT_WIDTH = '30vw'
 
@@ -56,6 +68,9 @@ class MainConfigurator(page.page):
         
         self.updatePageEnabled = True
         
+        # Rapid changes of the widgets (i.e. dragging a slider) are coalesced into a single update of the preview
+        self.debouncer = scheduler.Debouncer()
+        
         
     #################################################################################################################################################
     # Create the page and returns the card widget where the content of the page must be displayed
@@ -146,8 +161,8 @@ class MainConfigurator(page.page):
                                            tooltip='Click to select an image to use as application background', selected=True, rounded=settings.button_rounded)
         
         #images = [{ "name": '%d'%x, "image": 'https://jeodpp.jrc.ec.europa.eu/services/shared/wallpapers/%d.jpg'%x, "max_width": 150, "max_height": 100 } for x in range(60)]
-        #images = [{ "name": '%d'%x, "image": mainPage.getLocalImageURL('./graphics/%d.jpg'%x), "max_width": 150, "max_height": 100 } for x in range(60)]
-        images = [{ "name": '%d'%x, "image": 'https://www.daigio.it/JRC/WallpapersSmall/%d.jpg'%x, "max_width": 150, "max_height": 100 } for x in range(60)]
+        # The stock images in the graphics folder are displayed as thumbnails generated once and cached (see assetCache)
+        images = [{ "name": '%d'%x, "image": stockImage(x), "max_width": 150, "max_height": 100 } for x in range(60)]
         self.background_image = selectImage.selectImage(images=images, selection=55, onchange=self.background_image_selected, width='380px',
                                                         label='Please select a stock image from the list', max_height=100, dense=True, outlined=True, clearable=True, margins="ma-0 mt-2 mr-1")
 
@@ -347,7 +362,7 @@ class MainConfigurator(page.page):
     def createMain(self):
 
         self.main = mainPage.mainPage(background_image=55)
-        self.updatePreview()
+        self.updatePreviewNow()
         
         
     #################################################################################################################################################
@@ -630,8 +645,12 @@ m.open()'''%(scallbacks, jsonfile)
     # Management of events in widgets
     #################################################################################################################################################
         
-    # Update the preview
+    # Update the preview (debounced)
     def updatePreview(self):
+        self.debouncer.schedule('preview', self.updatePreviewNow)
+        
+    # Immediate update of the preview
+    def updatePreviewNow(self):
         self.cardMain.children = [self.main.preview()]
         
         
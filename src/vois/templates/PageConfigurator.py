@@ -24,7 +24,7 @@ import ipyvuetify as v
 import json
 
 # Vois imports
-from vois import colors, download
+from vois import colors, download, scheduler
 from vois.vuetify import settings, Toggle, ColorPicker, sliderFloat, UploadImage, UploadJson, Button, switch, tooltip, iconButton, dialogGeneric, selectSingle, tabs
 from vois.templates import template1panel, template2panels, template3panels
 from vois import cssUtils
@@ -56,6 +56,9 @@ class PageConfigurator(v.Html):
 
         self.debug = widgets.Output()
         
+        # Rapid changes of the sliders are coalesced into a single update of the page
+        self.debouncer = scheduler.Debouncer()
+        
         # Default state
         self.reset_state = {
             'appname':           'My app',
@@ -332,7 +335,8 @@ class PageConfigurator(v.Html):
         if filename[-5:] != '.json':
             filename += '.json'
         
-        # Read the state from the page
+        # Apply the pending changes of this configurator and read the state from the page
+        self.debouncer.flush()
         state = self.page.state
     
         # Add additional states from the PageConfigurator
@@ -803,12 +807,12 @@ p.open()'''%(self.titlecolor.color, self.footercolor.color, str(self.rounded.val
         
     # Change of the title bar height
     def titleheightChange(self, height):
-        self.page.titleheight = int(height)
+        self.debouncer.schedule('titleheight', setattr, self.page, 'titleheight', int(height))
     
     
     # Change of the footer bar height
     def footerheightChange(self, height):
-        self.page.footerheight = int(height)
+        self.debouncer.schedule('footerheight', setattr, self.page, 'footerheight', int(height))
         
         
     # Change application name
@@ -873,11 +877,11 @@ p.open()'''%(self.titlecolor.color, self.footercolor.color, str(self.rounded.val
         
     # Change logo width
     def logowidthChange(self, width):
-        self.page.logowidth = int(width)
+        self.debouncer.schedule('logowidth', setattr, self.page, 'logowidth', int(width))
     
     # Change credits width
     def creditswidthChange(self, width):
-        self.page.creditswidth = int(width)
+        self.debouncer.schedule('creditswidth', setattr, self.page, 'creditswidth', int(width))
         
 
     # Change copyright text
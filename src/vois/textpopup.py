@@ -19,11 +19,32 @@
 # limitations under the Licence.
 
 # Widgets import
-import ipyleaflet
-from ipyleaflet import AwesomeIcon, DivIcon, Marker
+from ipyleaflet import AwesomeIcon, DivIcon, Marker, LayerGroup
 
 # Python imports
-from threading import Timer
+import weakref
+
+# vois imports
+try:
+    from . import scheduler
+except:
+    import scheduler
+
+
+# Registry of the textpopup instances displayed on each map: dict having as key the map and as value a dict with keys 'group' (the LayerGroup containing
+# the markers of the popups) and 'popups' (dict of id(popup) --> popup). The popups keep only a weak reference to their map, so the map can be collected
+_popups = weakref.WeakKeyDictionary()
+
+
+# Returns the registry entry of a map, adding to the map the LayerGroup that contains the markers of the popups
+def _mapEntry(m):
+    entry = _popups.get(m, None)
+    if entry is None:
+        entry = { 'group': LayerGroup(name='textpopup'), 'popups': {} }
+        _popups[m] = entry
+    if not entry['group'] in m.layers:
+        m.add(entry['group'])
+    return entry
 
 
 #####################################################################################################################################################
@@ -134,7 +155,7 @@ class textpopup():
                  align='center',
                  margin=5
                 ):
-        self.m = m
+        self.mref = weakref.ref(m)
         self.autoremovedelay = autoremovedelay
     
         lineheight = "line-height: %dpx;"%(int(lineheightfactor*(max(titlefontsize,textfontsize)))) # To ensure vertical center alignment
@@ -171,29 +192,60 @@ class textpopup():
         icon2 = DivIcon(html=self.h, icon_anchor=[width/2, height+18], icon_size=[width, height])
         self.marker2 = Marker(name='textpopup', location=center, icon=icon2)
     
-        self.m.add_layer(self.marker1)
-        self.m.add_layer(self.marker2)
+        # The markers are added to the LayerGroup of the map, so the map layers are not modified
+        entry = _mapEntry(m)
+        entry['group'].layers = tuple(entry['group'].layers) + (self.marker1, self.marker2)
+        entry['popups'][id(self)] = self
         
-        # Auto-remove after some time
+        # Auto-remove after some time (all the popups share the same timer)
+        self.timerkey = None
         if self.autoremovedelay > 0:
-            self.timer = Timer(self.autoremovedelay, self.remove)
-            self.timer.start()
+            self.timerkey = scheduler.timers.callLater(self.autoremovedelay, self.remove)
     
     
+    # Map to which the popup was added (None if the map does not exist anymore)
+    @property
+    def m(self):
+        return self.mref()
+
+
     # Remove the textpopup from the map
     def remove(self):
-        if self.autoremovedelay > 0:
-            self.timer.cancel()
-            
-        if self.marker1 in self.m.layers:
-            self.m.remove_layer(self.marker1)
-        if self.marker2 in self.m.layers:
-            self.m.remove_layer(self.marker2)
+        m = self.m
+        if not m is None:
+            textpopup.removeList(m, [self])
+        elif not self.timerkey is None:
+            scheduler.timers.cancel(self.timerkey)
+            self.timerkey = None
         
     
     # Remove all textpopups from a map
     @staticmethod
     def removeAll(m):
-        for layer in reversed(m.layers):
-            if isinstance(layer, ipyleaflet.leaflet.Marker) and layer.name == 'textpopup':
-                m.remove_layer(layer)
+        entry = _popups.get(m, None)
+        if not entry is None:
+            textpopup.removeList(m, list(entry['popups'].values()))
+        
+        
+    # Remove a list of textpopups from a map with a single update of the LayerGroup containing the markers (the map layers are not modified)
+    @staticmethod
+    def removeList(m, popups):
+        entry = _popups.get(m, None)
+        for popup in popups:
+            if not popup.timerkey is None:
+                scheduler.timers.cancel(popup.timerkey)
+                popup.timerkey = None
+        if entry is None:
+            return
+
+        markers = set()
+        for popup in popups:
+            if entry['popups'].pop(id(popup), None) is not None:
+                markers.add(id(popup.marker1))
+                markers.add(id(popup.marker2))
+
+        if len(markers) > 0:
+            if len(entry['popups']) == 0:
+                entry['group'].layers = ()
+            else:
+                entry['group'].layers = tuple(layer for layer in entry['group'].layers if not id(layer) in markers)
@@ -17,6 +17,9 @@
 # 
 # See the Licence for the specific language governing permissions and
 # limitations under the Licence.
+import pandas as pd
+import numpy as np
+
 
 ##################################################################################################################################
 # Creation of a plotly treemap
@@ -115,52 +118,116 @@ def createTreemapFromList(nameslist=[], rootName='Root', separator='.', valuefor
        
     """
 
-    # Add a node to a tree-node
-    def addNode(name, value, parent):
-        nonlocal nodes, parent_of
-        if not name in nodes:
-            elem = TreemapNode(name, value=value)
-
-            nodes[name] = elem
-            parent_of[name] = parent
-            
-            while parent != None:
-                parent.value += value
-                parent = parent_of[parent.name]
-                
-            return elem
-    
-    nodes     = {}
-    parent_of = {}
-
-    root = addNode(rootName,0.0,None)
-
-    # Manage an implicit tree with separator!
-    for name in nameslist:
-        parts = name.split(separator)
-        fullname = ''
-        for part in parts:
-            parentname = fullname
-            if len(fullname) == 0: fullname += part
-            else:                  fullname += separator + part
-
-            parent = root
-            if parentname in nodes: parent = nodes[parentname]
-
-            value = 0.0
-            if fullname in valuefor: value = valuefor[fullname]
-            addNode(fullname,value,parent)
-
-    #return nodes, parent_of
-
-    labels  = []
-    parents = []
-    values  = []
-    for key, value in nodes.items():
-        labels.append(key)
-        pname = str(parent_of[key])
-        if pname == 'None':    parents.append(None)
-        else:                  parents.append(pname)
-        values.append(value.value)
-
-    return labels, parents, values
+    hierarchy = createHierarchy(nameslist, rootName=rootName, separator=separator, valuefor=valuefor)
+    return hierarchy['label'].tolist(), hierarchy['parent'].tolist(), hierarchy['value'].tolist()
+
+
+
+##################################################################################################################################
+# Vectorized creation of the hierarchy from a list of names with an implicit tree structure
+##################################################################################################################################
+def createHierarchy(nameslist=[], rootName='Root', separator='.', valuefor={}):
+    """
+    Vectorized creation of the hierarchy defined by a list of strings having a hierarchical structure (defined by a separator, e.g. '.'). The parents of all the unique names are extracted at once, each intermediate node is processed only once, and the values of the subtrees are summed with vectorized operations, one level at a time. The nodes are returned in the order of their first appearance in the list.
+    
+    Parameters
+    ----------
+    nameslist : list of strings, optional
+        List of strings to preprocess. The hierarchical structure is defined by the separator character. Default is []
+    rootName : str, optional
+        Name to assign to the root node of the hierarchical structure (default is 'Root')
+    separator : str, optional
+        Separator character that defines the hierarchical structure (default is '.')
+    valuefor : dict, optional
+        Dictionary to assign a numerical value to each node of the tree (default is {})
+        
+    Return
+    ------
+        a Pandas DataFrame having a row for each node of the tree (the first row is the root) and the columns:
+        'label' containing the fullname of the node,
+        'parent' containing the fullname of the parent of the node (None for the root),
+        'level' containing the depth of the node (-1 for the root, 0 for its children, etc.),
+        'value' containing the value of the node summed to the values of all its descendants
+    
+    Example
+    -------
+    Hierarchy of a list of names::
+    
+        from vois import treemapPlotly
+
+        df = treemapPlotly.createHierarchy(['A.1','A.2','B.1.1'], rootName='Root',
+                                           valuefor={'A.1': 3.0, 'A.2': 5.0, 'B.1.1': 2.0})
+        print(df)
+    
+    """
+    # Unique names with the position of their first appearance
+    names = pd.Series(list(nameslist), dtype=object).astype(str).drop_duplicates()
+    frames  = []
+    current = pd.DataFrame({'label': names.values, 'pos': names.index.values})
+    known   = set(current['label'])
+    
+    # Extraction of the parents of the nodes: each round only processes the parents not found in the previous rounds
+    while len(current) > 0:
+        split  = current['label'].str.rpartition(separator)
+        hassep = split[1].values == separator
+        current['parent'] = np.where(hassep, split[0].values, rootName)
+        frames.append(current)
+        
+        candidates = current[hassep].groupby('parent', sort=False)['pos'].min()
+        if rootName in candidates.index:          # The ancestors of the root name are nodes too, having the root as parent
+            rootpos = candidates[rootName]
+            candidates = candidates.drop(rootName)
+            if separator in rootName:
+                head = rootName.rpartition(separator)[0]
+                candidates[head] = min(rootpos, candidates.get(head, rootpos))
+        candidates = candidates[[not x in known for x in candidates.index]]
+        known.update(candidates.index)
+        current = pd.DataFrame({'label': candidates.index.values, 'pos': candidates.values})
+        
+    nodes = pd.concat(frames, ignore_index=True) if len(frames) > 0 else pd.DataFrame({'label': pd.Series([], dtype=object), 'pos': pd.Series([], dtype=np.int64), 'parent': pd.Series([], dtype=object)})
+    isroot = (nodes['label'] == rootName).values
+    rootpos = nodes['pos'].values[isroot].min() if isroot.any() else len(names)
+    nodes = nodes[~isroot]
+    
+    labels    = np.concatenate([[rootName], nodes['label'].values.astype(object)])
+    parents   = np.concatenate([[None],     nodes['parent'].values.astype(object)])
+    pos       = np.concatenate([[rootpos],  nodes['pos'].values.astype(np.int64)])
+    index     = pd.Index(labels)
+    parentpos = index.get_indexer(parents)
+    own       = pd.Series(labels).map(valuefor).fillna(0.0).values.astype(np.float64)
+    own[0]    = 0.0
+    
+    # The value and the position of first appearance of each node are propagated to all its ancestors, one level at a time
+    values = own.copy()
+    depth  = np.full(len(labels), -1, dtype=np.int64)
+    nodeid = np.arange(len(labels))
+    cur    = parentpos.copy()
+    while True:
+        valid = cur >= 0
+        if not valid.any():
+            break
+        depth[valid] += 1
+        values += np.bincount(cur[valid], weights=own[valid], minlength=len(labels))
+        np.minimum.at(pos, cur[valid], pos[nodeid[valid]])
+        cur[valid] = parentpos[cur[valid]]
+        
+    # The ancestors of the root name are nodes too (having the root as parent): they are created at the first appearance of the root name as a prefix
+    if separator in rootName:
+        prefix  = rootName + separator
+        rootpos = min([rootpos] + [pos[i] for i in np.flatnonzero(parentpos == 0) if labels[i].startswith(prefix)])
+        head = rootName
+        while separator in head:
+            head = head.rpartition(separator)[0]
+            i = index.get_indexer([head])[0]
+            if i >= 0: pos[i] = min(pos[i], rootpos)
+    
+    # Nodes in order of creation: each node is created at its first appearance, just before its descendants
+    pos[0] = -1
+    lengths = np.fromiter(map(len, labels), dtype=np.int64, count=len(labels))
+    order = np.lexsort((lengths, pos))
+    labels, parents, depth, values = labels[order], parents[order], depth[order], values[order]
+    
+    return pd.DataFrame({'label':  pd.Series(labels,  dtype=object),
+                         'parent': pd.Series(parents, dtype=object),
+                         'level':  depth,
+                         'value':  values})
@@ -17,7 +17,7 @@
 # 
 # See the Licence for the specific language governing permissions and
 # limitations under the Licence.
-from IPython.core.display import HTML as ipyhtml   # V. I. for urlOpen to work!!!
+from vois import jsBridge
 
 # Open a web page in another tab
 def urlOpen(url, output, target='_blank'):
@@ -29,7 +29,7 @@ def urlOpen(url, output, target='_blank'):
     url : str
         URL of the page to open
     output : instance of ipywidgets.Output() class
-        Output widget where the javascript code to open the new page is executed
+        Output widget where the :class:`jsBridge.jsBridge` that opens the page is displayed (the bridge is displayed only once and reused by the subsequent calls)
     target : str, optional
         Target of the open operation (default is '_blank' which means that the page will be opened in a new browser's tab)
         
@@ -53,11 +53,4 @@ def urlOpen(url, output, target='_blank'):
     
     """
     
-    js = '''
-<script type=\"text/javascript\">
-window.open("%s", "%s");
-</script>
-''' % (url, target)
-        
-    with output:
-        display(ipyhtml(js))
+    jsBridge.getBridge(output).openUrl(url, target)
@@ -17,7 +17,7 @@
 # 
 # See the Licence for the specific language governing permissions and
 # limitations under the Licence.
-from IPython.display import display, HTML
+from vois import jsBridge
             
 # Update the visualized URL in the browser
 def urlUpdate(url, output):
@@ -28,6 +28,8 @@ def urlUpdate(url, output):
     ----------
     url : str
         Partial url to add to the current browser's page key/values
+    output : instance of ipywidgets.Output() class
+        Output widget where the :class:`jsBridge.jsBridge` that updates the URL is displayed (the bridge is displayed only once and reused by the subsequent calls)
 
     Example
     -------
@@ -47,6 +49,4 @@ def urlUpdate(url, output):
         If the dashboard is created using the :class:`app.app` class, it is preferable to use the function :func:`app.app.urlUpdate` that doesn't need the output parameter and uses the Output widget created inside the app instance itself (and invisible to the users)
     
     """
-    js = "<script>window.history.replaceState({ additionalInformation: 'Updated the URL with JS' }, '', '%s');</script>" % url
-    with output:
-            display(HTML(js))
+    jsBridge.getBridge(output).updateUrl(url)
@@ -1,34 +1,82 @@
-from .Button import Button
-from .Slider import Slider
-from .ColorPicker import ColorPicker
-from .DatePicker import DatePicker
-from .Progress import Progress
-from .Radio import Radio
-from .IconClipboard import IconClipboard
-from .Switch import Switch
-from .SliderFloat import SliderFloat
-from .Label import Label
-from .DayCalendar import DayCalendar
-from .Toggle import Toggle
-from .MultiSwitch import MultiSwitch
-from .Tabs import Tabs
-from .TextList import TextList
-from .RangeSlider import RangeSlider
-# from .Menu import Menu
-
-from .deprecated import button
-from .deprecated import slider
-from .deprecated import colorPicker
-from .deprecated import datePicker
-from .deprecated import progress
-from .deprecated import radio
-from .deprecated import switch
-from .deprecated import sliderFloat
-from .deprecated import label
-from .deprecated import dayCalendar
-from .deprecated import toggle
-from .deprecated import multiSwitch
-from .deprecated import tabs
-from .deprecated import textlist
-from .deprecated import rangeSlider
-# from .deprecated import menu
\ No newline at end of file
+import importlib
+import types
+import sys
+
+# Public names of the package and the submodules that define them. The submodules are imported
+# only when one of their names is accessed for the first time (PEP 562)
+_lazy_classes = {
+    'Button':        '.Button',
+    'Slider':        '.Slider',
+    'ColorPicker':   '.ColorPicker',
+    'DatePicker':    '.DatePicker',
+    'Progress':      '.Progress',
+    'Radio':         '.Radio',
+    'IconClipboard': '.IconClipboard',
+    'Switch':        '.Switch',
+    'SliderFloat':   '.SliderFloat',
+    'Label':         '.Label',
+    'DayCalendar':   '.DayCalendar',
+    'Toggle':        '.Toggle',
+    'MultiSwitch':   '.MultiSwitch',
+    'Tabs':          '.Tabs',
+    'TextList':      '.TextList',
+    'RangeSlider':   '.RangeSlider',
+    # 'Menu':        '.Menu',
+}
+
+_lazy_modules = {
+    'button':        '.deprecated.button',
+    'slider':        '.deprecated.slider',
+    'colorPicker':   '.deprecated.colorPicker',
+    'datePicker':    '.deprecated.datePicker',
+    'progress':      '.deprecated.progress',
+    'radio':         '.deprecated.radio',
+    'switch':        '.deprecated.switch',
+    'sliderFloat':   '.deprecated.sliderFloat',
+    'label':         '.deprecated.label',
+    'dayCalendar':   '.deprecated.dayCalendar',
+    'toggle':        '.deprecated.toggle',
+    'multiSwitch':   '.deprecated.multiSwitch',
+    'tabs':          '.deprecated.tabs',
+    'textlist':      '.deprecated.textlist',
+    'rangeSlider':   '.deprecated.rangeSlider',
+    # 'menu':        '.deprecated.menu',
+}
+
+__all__ = list(_lazy_classes) + list(_lazy_modules)
+
+
+def __getattr__(name):
+    if name in _lazy_classes:
+        # Importing the submodule binds its name to the module object: rebind it to the class
+        value = getattr(importlib.import_module(_lazy_classes[name], __name__), name)
+    elif name in _lazy_modules:
+        value = importlib.import_module(_lazy_modules[name], __name__)
+    else:
+        # Any other submodule of the package (i.e. vois.vuetify.settings), as when all the submodules were imported eagerly
+        try:
+            value = importlib.import_module('.' + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != '%s.%s' % (__name__, name):
+                raise
+            raise AttributeError("module %r has no attribute %r" % (__name__, name)) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# Importing a submodule (i.e. "import vois.vuetify.Button") binds its name in the package to the module object, hiding the
+# class with the same name: the class is bound again the first time the name is accessed
+class _package(types.ModuleType):
+    def __getattribute__(self, name):
+        value = super().__getattribute__(name)
+        if name in _lazy_classes and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+            setattr(self, name, value)
+        return value
+
+
+sys.modules[__name__].__class__ = _package
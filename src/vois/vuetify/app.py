@@ -19,13 +19,9 @@
 # limitations under the Licence.
 from ipywidgets import widgets, Layout
 from IPython.display import display, HTML
-from IPython.core.display import HTML as ipyhtml   # V. I. for urlOpen to work!!!
-import base64
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 from random import randrange
 from datetime import datetime
+import sys
 import ipyvuetify as v
 
 try:
@@ -56,6 +52,7 @@ except:
     import queryStrings
 
 from vois.vuetify import Button
+from vois import download, jsBridge
     
 # Convert a measure in string (if int or float --> pixels units)
 def measure2str(value):
@@ -84,9 +81,11 @@ class app():
     :func:`~app.fab`
     :func:`~app.downloadText`
     :func:`~app.downloadBytes`
+    :func:`~app.downloadStream`
     :func:`~app.urlOpen`
     :func:`~app.urlParameter`
     :func:`~app.urlParameter`
+    :func:`~app.initPlotly`
 
     The main content of the dashboard should be displayed in the **app.outcontent** Output widget that completely fills the empty space of the dashboard between the title bar and the footer bar.
     
@@ -194,6 +193,8 @@ class app():
         Python function to call when the user clicks on one of the icons of the minipanel in the footer bar. The function will receive a parameter of type int containing the index of the icon
     fullscreen : bool, optional
         If True the app will be displayed in fullscreen mode (default is False). In fullscreen mode the app will occupy all the available space on the web page (the titlebar will be aligned on top, the footer bar will be aligned on the bottom of the page, and the outcontent will occupy all the intermediate space between the title bar and the footer bar, irrescpective of the value passed in the totalheight parameter), and the positioning of the elements will be fully responsive.
+    plotlyinit : bool, optional
+        If True the Plotly library is initialized when the app is created (default is False). If False, Plotly is initialized when the app is shown if the plotly module has already been imported by the dashboard, the first time a Plotly figure is displayed through the :func:`~app.display` method, or when the :func:`~app.initPlotly` method is explicitly called. Dashboards that import plotly only after the app is shown and display their figures directly in app.outcontent or in other Output widgets should pass plotlyinit=True or call :func:`~app.initPlotly`
         
         
     Attributes
@@ -339,7 +340,8 @@ class app():
                  onclicklogo=None,           # Function with 0 arguments
                  onclickfooter=None,         # Function with 1 string argument string containing the text of the button
                  onclickminipanel=None,      # Function with 1 string argument integer containing the index of the icon
-                 fullscreen=False):          # If True the App will fill all the page!
+                 fullscreen=False,           # If True the App will fill all the page!
+                 plotlyinit=False):          # If True Plotly is initialized at startup, otherwise on first Plotly display
         
         # Storing input parameters
         self.title = title
@@ -388,6 +390,8 @@ class app():
         
         self.fullscreen = fullscreen
         
+        self.plotlyinitialized = False
+        
         self.content_vbackground = None     # v.Html object to display an image in the background
         self.content_panels_dict = {}       # Dict to retrieve panels by name
         self.content_panels      = []       # List of panels to overlay to the background
@@ -406,9 +410,11 @@ class app():
         self.outservice   = widgets.Output(layout=Layout(width='0px', height='0px'))  # Available for the user
         self.outdialogs   = widgets.Output(layout=Layout(width='0px', height='0px'))  # Used for snackbars, fab and dialogs
         self.outdownload  = widgets.Output(layout=Layout(width='0px', height='0px'))  # Used for downloads
+        self.bridge       = jsBridge.getBridge(self.outdownload)                      # Executes the commands in the browser (downloads, URL update, open of pages and CSS styles)
+        self.downloader   = self.bridge
+        self.outurlopen   = self.outdownload                                          # Kept for compatibility: urlOpen.urlOpen(url, g_app.outurlopen) uses the bridge of the app
+        self.outurlupdate = self.outdownload                                          # Kept for compatibility: urlUpdate.urlUpdate(url, g_app.outurlupdate) uses the bridge of the app
         self.outfabs      = widgets.Output(layout=Layout(width='0px', height='0px'))  # Used for fabs
-        self.outurlopen   = widgets.Output(layout=Layout(width='0px', height='0px'))  # Used for urlOpen
-        self.outurlupdate = widgets.Output(layout=Layout(width='0px', height='0px'))  # Used for urlUpdate
         self.outplotly    = widgets.Output(layout=Layout(width='0px', height='0px'))  # Used for initializing plotly
         self.outpanel     = widgets.Output(layout=Layout(width='0px', height='0px'))  # Used for the side panel
         self.outpanels    = widgets.Output(layout=Layout(width='0px', height='0px'))  # used for the panels 
@@ -512,14 +518,26 @@ class app():
                                    marginy=2, height=self.footerheight, onclick=self.onclickfooter) #, output=self.outfooter)
 
 
-        # Initialize Plotly with a 0x0 chart!
+        if plotlyinit:
+            self.initPlotly()
+    
+    
+    # Initialize Plotly with a 0x0 chart (only the first time it is called)
+    def initPlotly(self):
+        """
+        Initializes the Plotly library by displaying a 0x0 chart in a hidden Output widget of the app. Only the first call has effect.
+        This method is automatically called when the app is created with plotlyinit=True, when the app is shown if the plotly module has already been imported, or when a Plotly figure is displayed through the :func:`~app.display` method
+        """
+        if self.plotlyinitialized:
+            return
+        
+        import plotly.graph_objects as go
+        
         with self.outplotly:
-            data = {'name': ['mike', 'mike', 'cindy', 'cindy'],
-                    'week': ['Week 1', 'Week 2', 'Week 1', 'Week 2'],
-                    'perc': [0.45, 0.15, 0.25, 0.28]}
-            df = pd.DataFrame(data)
-            fig = px.bar(df, x="name", y="perc", color="week", title="", barmode='stack')
+            fig = go.Figure(data=[go.Bar(x=['a','b'], y=[0.45, 0.25])])
             fig.show()
+            
+        self.plotlyinitialized = True
     
     
     # Set the background image for the outcontent
@@ -550,6 +568,7 @@ class app():
         self.content_panels_dict = {}
         self.content_panels      = []
         self.outpanels.clear_output()
+        self.bridge.styles = { key: css for key, css in self.bridge.styles.items() if not key.startswith('panel:') }
         if (not self.content_vbackground is None) :
             self.content_vbackground.children = []
 
@@ -606,8 +625,7 @@ class app():
         classname = "%s_panel_out_%d" % (name,num)
         out.add_class(classname)
         out.clear_output()
-        with self.outpanels:
-            display(HTML('<style> .%s { background-color: %s !important; }</style>' % (classname, backcolor) ))
+        self.bridge.injectCSS('.%s { background-color: %s !important; }' % (classname, backcolor), key='panel:' + classname)
         panel = v.Html(tag='div', children=[out], class_="pa-0 ma-0", style_='width: %s; height: %s; border: none; position: absolute; top: %s; left: %s;' % (width, height, top, left))
         self.content_panels.append(panel)
         if len(name) > 0:
@@ -700,8 +718,7 @@ class app():
                     titlecard.children = [title]
             
             classname = panel.children[0]._dom_classes[0]
-            with self.outpanels:
-                display(HTML('<style> .%s { background-color: %s !important; }</style>' % (classname, backcolor) ))
+            self.bridge.injectCSS('.%s { background-color: %s !important; }' % (classname, backcolor), key='panel:' + classname)
             panel.children[0].layout = Layout(width=width, height=height, border=border)
             panel.style_ = 'width: %s; height: %s; border: none; position: absolute; top: %s; left: %s;' % (width, height, top, left)
             panel.color = backcolor
@@ -723,9 +740,16 @@ class app():
         if (not self.content_vbackground is None) and (len(self.content_panels) > 0):
             self.content_vbackground.children = self.content_panels
             
+        # The dashboard uses Plotly (the module is already imported, so its initialization is cheap): the figures displayed in any Output widget need it
+        if 'plotly' in sys.modules:
+            self.initPlotly()
+            
         # Fix Firefox bug with white areas: with this fix all v.Img objects MUST declare the width and height to work correctly
         with self.outdialogs:
             display(HTML('<style>.v-responsive__sizer { padding-bottom: 0px !important; }</style>'))
+
+        # Load the font stylesheet once for the whole page: the SVG charts created from now on with embedFont=None (default) omit their own @import
+        fontsettings.injectFont(self.outdialogs)
             
         if self.fullscreen:
             outFullscreen = widgets.Output(layout=Layout(width='100vw', height='100vh'))
@@ -734,7 +758,7 @@ class app():
                 display(HTML('<style>.jp-OutputPrompt { min-width: 0px; border: 0px; }</style>'))
             with outFullscreen:
                 display(self.appbar)
-                display(widgets.HBox([self.outservice,self.outdialogs,self.outdownload,self.outfabs,self.outurlopen,self.outurlupdate,self.outplotly,self.outpanel,self.outpanels]))
+                display(widgets.HBox([self.outservice,self.outdialogs,self.outdownload,self.outfabs,self.outplotly,self.outpanel,self.outpanels]))
                 display(self.outcontent)
                 display(self.f.draw())
                 
@@ -753,7 +777,7 @@ class app():
             display(dialog)
         else:
             display(self.appbar)
-            display(widgets.HBox([self.outservice,self.outdialogs,self.outdownload,self.outfabs,self.outurlopen,self.outurlupdate,self.outplotly,self.outpanel]))
+            display(widgets.HBox([self.outservice,self.outdialogs,self.outdownload,self.outfabs,self.outplotly,self.outpanel]))
             display(self.outcontent)
             #display(self.outfooter)
             display(self.f.draw())
@@ -805,6 +829,8 @@ class app():
     # Display something in the service Output of this application
     def display(self, arg):
         """Display something in the service Output of this application"""
+        if type(arg).__module__.startswith('plotly'):
+            self.initPlotly()
         with self.outservice:
             display(arg)
 
@@ -877,14 +903,7 @@ class app():
             g_app.downloadText('aaa bbb ccc')
         """
 
-        string_bytes  = textobj.encode("ascii","ignore")
-        base64_bytes  = base64.b64encode(string_bytes)
-        base64_string = base64_bytes.decode("ascii")
-
-        self.outdownload.clear_output()
-        with self.outdownload:
-            display(HTML('<script>function downloadURI(uri, name) { var link = document.createElement("a"); link.download = name; link.href = uri; link.click();} downloadURI("data:application/octet-stream;charset=utf-8;base64,' + base64_string + '","' + fileName + '"); </script>'))
-        self.outdownload.clear_output()
+        self.downloader.start(textobj.encode("utf-8"), fileName)
 
 
     # Direct download of an array of bytes
@@ -904,13 +923,31 @@ class app():
 
             g_app.downloadBytes(b'ajgh lkjhl ')
         """
-        base64_bytes  = base64.b64encode(bytesobj)
-        base64_string = base64_bytes.decode("ascii")
+        self.downloader.start(bytesobj, fileName)
 
-        self.outdownload.clear_output()
-        with self.outdownload:
-            display(HTML('<script>function downloadURI(uri, name){ var link = document.createElement("a"); link.download = name; link.href = uri; link.click();} downloadURI("data:application/octet-stream;charset=utf-8;base64,''' + base64_string + '","' + fileName + '");</script>'))
-        self.outdownload.clear_output()
+
+    # Streaming download of a bytes-like object, a file or an iterable of bytes
+    def downloadStream(self, source, fileName="download.bin", chunksize=download.CHUNK_SIZE, on_progress=None):
+        """Streaming download of a file: the content is sent to the browser in chunks, so that large files can be downloaded without encoding their full content in memory.
+        
+        Parameters
+        ----------
+        source : bytes-like object, str, file object or iterable
+            Content of the file to download: a bytes, bytearray or memoryview object, the path of a file, a file object opened in binary mode or an iterable (for instance a generator) yielding bytes or str
+        fileName : str, optional
+            Name of the file that is to be downloaded (default is 'download.bin')
+        chunksize : int, optional
+            Maximum size in bytes of the chunks (default is download.CHUNK_SIZE)
+        on_progress : function, optional
+            Python function called after each chunk is sent, with two parameters: the number of bytes sent and the total number of bytes (None if the size of the source is not known in advance)
+
+        Example
+        -------
+        If g_app is an instance of the app class, this code will download a large file printing the progress::
+
+            g_app.downloadStream('/path/to/large.gpkg', 'data.gpkg', on_progress=lambda sent, total: print(sent, total))
+        """
+        return self.downloader.start(source, fileName, chunksize=chunksize, on_progress=on_progress)
             
             
     # Open a web page in another tab
@@ -930,9 +967,7 @@ class app():
 
             g_app.urlOpen('https://www.google.com')
         """
-        js = '<script type=\"text/javascript\">window.open("%s", "%s");</script>' % (url,target)
-        with self.outurlopen:
-            display(ipyhtml(js))
+        self.bridge.openUrl(url, target)
                 
                 
     # Read the parameters passed on the URL 
@@ -971,6 +1006,4 @@ class app():
             g_app.urlUpdate('?test=3')
         """
         
-        js = "<script>window.history.replaceState({ additionalInformation: 'Updated the URL with JS' }, '', '%s');</script>" % url
-        with self.outurlupdate:
-                display(HTML(js))
+        self.bridge.updateUrl(url)
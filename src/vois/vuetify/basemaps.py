@@ -28,9 +28,11 @@ except:
 try:
     from . import settings
     from . import treeview
+    from . import bdapCache
 except:
     import settings
     import treeview
+    import bdapCache
 
 
 # Empty basemap (gray background)
@@ -101,8 +103,7 @@ def buildBasemap(oldstyledictionary):
     
 # Given a name and an interapro collections path (example inter.collections.BaseData.Elevation.MERIT.Hillshade), returns a basemap
 def buildBdapLayer(name, collectionpath):
-    pBack = inter.Collection(collectionpath).process()
-    procid = pBack.toLayer()
+    procid = bdapCache.procid({ "format": "BDAP basemap", "path": str(collectionpath) }, lambda: inter.Collection(collectionpath).process().toLayer())
     return buildBasemap({'attribution': '&copy; <a href=\"https://jeodpp.jrc.ec.europa.eu/bdap/\">EC-JRC BDAP</a>', 
                          'max_zoom': 18,
                          'name': name,
@@ -418,23 +419,15 @@ def preprocessBasemap(bm):
     return bm
 
 
-# Retuns the list of all the basemap names
+# Retuns the list of all the basemap names (the catalogue is read from the BDAP server only once, see bdapCache)
 def basemapList(addBDAPbasemaps=True, removeBasemaps=[]):
-    c = inter.ImageCollection("BASEMAP")
-    names = list(c.listBasemaps())
+    names = bdapCache.basemaps(lambda: inter.ImageCollection("BASEMAP").listBasemaps())
     
     # Remove basemaps not working
-    names.remove('OpenStreetMap.BlackAndWhite')
-    names.remove('HikeBike.HikeBike')
-    names.remove('Hydda.Base')
-    names.remove('Hydda.Full')
-    names.remove('OpenRailwayMap')
-    names.remove('OpenMapSurfer.Grayscale')
-    names.remove('OpenMapSurfer.Roads')
-    names.remove('Stadia.AlidadeSmooth')
-    names.remove('Stadia.AlidadeSmoothDark')
-    names.remove('Stadia.OSMBright')
-    names.remove('Stadia.Outdoors')
+    for bm in ['OpenStreetMap.BlackAndWhite', 'HikeBike.HikeBike', 'Hydda.Base', 'Hydda.Full', 'OpenRailwayMap', 'OpenMapSurfer.Grayscale',
+               'OpenMapSurfer.Roads', 'Stadia.AlidadeSmooth', 'Stadia.AlidadeSmoothDark', 'Stadia.OSMBright', 'Stadia.Outdoors']:
+        if bm in names:
+            names.remove(bm)
     
     # Remove basemaps not wanted by the caller
     for bm in removeBasemaps:
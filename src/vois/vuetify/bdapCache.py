@@ -0,0 +1,186 @@
+"""Memoization of the BDAP processing ids and of the basemaps catalogue, with optional on-disk persistence shared across kernels"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2025
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+from contextlib import contextmanager
+import threading
+import hashlib
+import json
+import time
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None    # Windows: the writes of the cache_file are not locked among the kernels
+
+
+# Path of a JSON file where the processing ids and the basemaps catalogue are persisted and shared among the kernels (None means that the values are kept only in memory)
+cache_file = None
+
+# Maximum age in seconds of the values read from the cache_file (older values are computed again)
+max_age = 7*24*3600
+
+
+# In-memory cache: key --> value
+_cache = {}
+_lock  = threading.Lock()
+
+
+# Returns a key from a dictionary of parameters
+def parametersKey(parameters):
+    """
+    Returns a canonical key that identifies a dictionary of parameters: the SHA1 hash of its JSON serialization with sorted keys, so that the same parameters always give the same key, independently from the order of insertion.
+
+    Parameters
+    ----------
+    parameters : dict
+        Dictionary of parameters (for instance the output of the toDict() method of the :class:`layers.interaproLayer` class)
+    """
+    text = json.dumps(parameters, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+# Read the content of the cache_file (returns an empty dict if the file doesn't exist or is not valid)
+def readFile():
+    if cache_file is None:
+        return {}
+    try:
+        with open(cache_file, 'r') as f:
+            content = json.load(f)
+        return content if isinstance(content, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+# Context manager that locks the cache_file among the kernels, using a lock file in the same folder
+@contextmanager
+def fileLock():
+    if fcntl is None:
+        yield
+        return
+    with open(cache_file + '.lock', 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# Add a value to the cache_file (the file is read again and written atomically while holding the lock, so that the values written by other kernels are preserved)
+def writeFile(key, value):
+    if cache_file is None:
+        return
+    try:
+        folder = os.path.dirname(os.path.abspath(cache_file))
+        os.makedirs(folder, exist_ok=True)
+        with fileLock():
+            content = readFile()
+            content[key] = { 'time': time.time(), 'value': value }
+            temp = '%s.%d.tmp' % (cache_file, os.getpid())
+            with open(temp, 'w') as f:
+                json.dump(content, f)
+            os.replace(temp, cache_file)
+    except OSError:
+        pass
+
+
+# Returns the value associated to a key, calling func() only if the value is not already in memory or in the cache_file
+def cached(key, func):
+    """
+    Returns the value associated to a key. The value is searched in memory, then in the cache_file (if it is not None and the value is not older than max_age seconds). If it is not found, func() is called and its result is stored in memory and in the cache_file.
+
+    Parameters
+    ----------
+    key : str
+        Key that identifies the value
+    func : function
+        Function without arguments that computes the value (its result must be serializable in JSON)
+    """
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+
+    entry = readFile().get(key, None)
+    if isinstance(entry, dict) and time.time() - entry.get('time', 0) <= max_age:
+        value = entry.get('value', None)
+    else:
+        value = func()
+        writeFile(key, value)
+
+    with _lock:
+        _cache[key] = value
+    return value
+
+
+# Returns the processing id of a BDAP layer
+def procid(parameters, process):
+    """
+    Returns the processing id of a BDAP layer, calling process() only the first time the layer is requested with the given parameters.
+
+    Parameters
+    ----------
+    parameters : dict
+        Dictionary of parameters that identify the layer
+    process : function
+        Function without arguments that processes the layer on the BDAP server and returns its processing id
+
+    Example
+    -------
+    Memoization of the processing id of a collection::
+
+        from vois.vuetify import bdapCache
+        from jeodpp import inter
+
+        path = inter.collections.BaseData.Elevation.MERIT.Hillshade
+        procid = bdapCache.procid({'path': str(path)}, lambda: inter.Collection(path).process().toLayer())
+
+    """
+    return cached('procid:' + parametersKey(parameters), process)
+
+
+# Returns the catalogue of the basemaps
+def basemaps(listBasemaps):
+    """
+    Returns the list of the names of the basemaps available on the BDAP server, calling listBasemaps() only the first time.
+
+    Parameters
+    ----------
+    listBasemaps : function
+        Function without arguments that returns the names of the basemaps
+    """
+    return list(cached('basemaps', lambda: list(listBasemaps())))
+
+
+# Remove all the values from the cache
+def clear(disk=False):
+    """
+    Remove all the processing ids and the basemaps catalogue from the in-memory cache.
+
+    Parameters
+    ----------
+    disk : bool, optional
+        If True, the cache_file is also deleted (default is False)
+    """
+    with _lock:
+        _cache.clear()
+    if disk and not cache_file is None:
+        try:
+            os.remove(cache_file)
+        except OSError:
+            pass
@@ -20,8 +20,11 @@
 import ipyvuetify as v
 import traitlets
 import pandas as pd
+import numpy as np
 import json
 
+from vois import scheduler
+
 # DataTable managing click on a row. See https://github.com/mariobuikhuizen/ipyvuetify/issues/163
 class datatable(v.VuetifyTemplate):
     """
@@ -61,6 +64,10 @@ class datatable(v.VuetifyTemplate):
         Python function to call when the user clicks on the icon on the top of the data-table. The function will receive no parameters
     unsortable_columns : list of str, optional
         List of names of columns that must not be sortable in the datatable (please note that the DataFrame column names will be displayed in capital letters in the datatable: use in this list the original column names of the DataFrame and not the capitalized names)
+    serverside : bool, optional
+        If True, the DataFrame is kept in Python and only the rows of the current page are sent to the browser: pagination, sorting and search are executed with pandas operations each time the user changes them (default is False). This mode is suited to display DataFrames having hundreds of thousands or millions of rows
+    itemsperpage : int, optional
+        Number of rows displayed in each page when serverside is True (default is 100)
 
     Example
     -------
@@ -91,10 +98,23 @@ class datatable(v.VuetifyTemplate):
        :alt: datatable widget
 
        Last 100 days of Covid-19 data on Italy displayed in a datatable widget
+
+    Incremental update of the rows of a datatable (the DataFrame index is used as the key of the rows)::
+
+        d.appendRows(df_new)                  # DataFrame with the same columns
+        d.updateRows(df_changed[['total_cases']])
+        d.deleteRows([key1, key2])
+
+    Display of a large DataFrame in server-side mode::
+
+        d = datatable.datatable(data=df, height='500px', searchshow=True, serverside=True, itemsperpage=200)
+        display(d)
+
     """
     
     headers = traitlets.List([]).tag(sync=True, allow_null=True)
-    items = traitlets.List([]).tag(sync=True, allow_null=True)
+    items = traitlets.List([]).tag(sync=True, allow_null=True)     # Full list of rows (the incremental updates are applied to the rows displayed, not to this trait)
+    version = traitlets.Int(0).tag(sync=True)                        # Number of incremental updates applied to the rows after the last full assignment of items
     index_col = traitlets.Unicode('').tag(sync=True)
     height = traitlets.Unicode('400px').tag(sync=True)
     color = traitlets.Unicode('error').tag(sync=True)  # Color for error message in case of empty input DF
@@ -112,6 +132,11 @@ class datatable(v.VuetifyTemplate):
     font_size       = traitlets.Unicode('14px').tag(sync=True)
     font_size_title = traitlets.Unicode('16px').tag(sync=True)
     
+    serverside = traitlets.Bool(False).tag(sync=True)
+    options    = traitlets.Dict({}).tag(sync=True)      # Pagination and sorting options of the v-data-table (page, itemsPerPage, sortBy, sortDesc)
+    total      = traitlets.Int(0).tag(sync=True)        # Number of rows satisfying the search (server-side mode)
+    loading    = traitlets.Bool(False).tag(sync=True)
+    
     @traitlets.default('template')
     def _template(self):
         
@@ -140,20 +165,29 @@ class datatable(v.VuetifyTemplate):
         else:
             cardtitle = ''
         
+        if self.serverside:
+            tableprops = '''
+                :options.sync="options"
+                :server-items-length="total"
+                :loading="loading"
+                :footer-props="{'items-per-page-options': [50, 100, 200, 500, 1000]}"'''
+        else:
+            tableprops = '''
+                hide-default-footer
+                :search="search"
+                :footer-props="{'items-per-page-options': [10000000]}"'''
+        
         return '''
         <template>
         <v-card>
             %s
             <v-data-table
                 dense
-                hide-default-footer
                 fixed-header
-                :search="search"
                 :height="height"
                 :headers="headers"
-                :items="items"
-                :item-key="index_col"
-                :footer-props="{'items-per-page-options': [10000000]}">
+                :items="rows"
+                :item-key="index_col"%s>
                 <template v-slot:no-data> 
                   <v-alert :value="true" :color="color" :dark="dark" icon="mdi-alert">
                     No records to display
@@ -187,7 +221,45 @@ class datatable(v.VuetifyTemplate):
    font-size: %s !important;
 }
 </style>
-''' % (cardtitle, self.font_size)
+
+<script>
+    modules.export = {
+        data() {
+            return {
+                rows: []
+            }
+        },
+        mounted() {
+            this.rows = this.items.slice();
+            if (this.version > 0) this.fetchrows();
+        },
+        watch: {
+            items() {
+                this.rows = this.items.slice();
+            }
+        },
+        methods: {
+            jupyter_setrows(rows) {
+                this.rows = rows;
+            },
+            jupyter_appendrows(rows) {
+                this.rows.push(...rows);
+            },
+            jupyter_updaterows(rows) {
+                const positions = new Map(this.rows.map((item, i) => [item[this.index_col], i]));
+                for (const row of rows) {
+                    const i = positions.get(row[this.index_col]);
+                    if (i !== undefined) this.$set(this.rows, i, Object.assign({}, this.rows[i], row));
+                }
+            },
+            jupyter_deleterows(keys) {
+                const deleted = new Set(keys);
+                this.rows = this.rows.filter(item => !deleted.has(item[this.index_col]));
+            }
+        }
+    }
+</script>
+''' % (cardtitle, tableprops, self.font_size)
     
     on_click = None  # This must receive a function which will be called inside `self.vue_cell_click()`
 
@@ -200,6 +272,10 @@ class datatable(v.VuetifyTemplate):
     def vue_cell_click(self, data):
         if not self.on_click is None:
             self.on_click(data)
+            
+    # A view rendered after some incremental updates requests the current rows
+    def vue_fetchrows(self, data=None):
+        self.send({'method': 'setrows', 'args': [self.records]})
     
     # Initializing
     def __init__(self, *args,
@@ -218,11 +294,14 @@ class datatable(v.VuetifyTemplate):
                  font_size='14px',
                  font_size_title='16px',
                  unsortable_columns=[],
+                 serverside=False,
+                 itemsperpage=100,
                  **kwargs):
         
         self.title = title
         self.searchshow = searchshow
         self.search = search
+        self.serverside = serverside
         
         data = data.reset_index()
         self.index_col = data.columns[0]
@@ -254,6 +333,216 @@ class datatable(v.VuetifyTemplate):
         self.icon_disabled = icon_disabled
         self.font_size = font_size
         self.font_size_title = font_size_title
-        self.items = json.loads(data.to_json(orient='records'))
+        
+        if serverside:
+            self.df = data
+            self.sortcache   = {}      # (Column name, descending) --> array of row positions sorted by the column values
+            self.searchtext  = None    # Lowercase text of all the columns of each row, used for the search
+            self.searchcache = None    # Tuple (search string, boolean mask of the rows satisfying the search)
+            self.debouncer   = scheduler.Debouncer()
+            self.options = {'page': 1, 'itemsPerPage': itemsperpage, 'sortBy': [], 'sortDesc': []}
+            self.total, self.items = self.currentPage()
+        else:
+            self.records = json.loads(data.to_json(orient='records'))    # Current rows (kept out of the items trait, so the incremental updates are not synced back)
+            self.items   = list(self.records)
 
         super().__init__(*args, **kwargs)
+        
+        if serverside:
+            self.observe(self.onOptionsChange, 'options')
+            self.observe(self.onSearchChange,  'search')
+            
+            
+    # Change of page, rows per page or sorting (server-side mode)
+    def onOptionsChange(self, change):
+        self.refresh()
+
+        
+    # Change of the search string (server-side mode): searches are debounced while the user is typing
+    def onSearchChange(self, change):
+        self.loading = True
+        self.debouncer.schedule('search', self.refresh, resetpage=True)
+        
+        
+    # Returns the array of row positions sorted by a column (server-side mode)
+    def sortedPositions(self, column, descending=False):
+        key = (column, descending)
+        positions = self.sortcache.get(key, None)
+        if positions is None:
+            values = self.df[column]
+            try:
+                positions = values.sort_values(ascending=not descending, kind='mergesort', na_position='last').index.values
+            except TypeError:
+                positions = values.astype(str).sort_values(ascending=not descending, kind='mergesort').index.values
+            self.sortcache[key] = positions
+        return positions
+        
+        
+    # Returns the boolean mask of the rows satisfying a search string (server-side mode)
+    def searchMask(self, search):
+        if not self.searchcache is None and self.searchcache[0] == search:
+            return self.searchcache[1]
+        
+        if self.searchtext is None:
+            columns = list(self.df.columns)
+            text = self.df[columns[0]].astype(str).str.lower()
+            for col in columns[1:]:
+                text = text + '\x00' + self.df[col].astype(str).str.lower()
+            self.searchtext = text
+            
+        mask = self.searchtext.str.contains(search.lower(), regex=False).values
+        self.searchcache = (search, mask)
+        return mask
+    
+    
+    # Update the rows displayed (server-side mode)
+    def refresh(self, resetpage=False):
+        """
+        In server-side mode, update the rows displayed in the datatable according to the current page, sorting options and search string. It is called automatically when the user interacts with the table.
+        
+        Parameters
+        ----------
+        resetpage : bool, optional
+            If True, the first page is displayed (default is False)
+        """
+        if not self.serverside:
+            return
+        
+        if resetpage and self.options.get('page', 1) != 1:
+            options = dict(self.options)
+            options['page'] = 1
+            self.options = options    # Calls refresh again through the observer
+            return
+        
+        total, items = self.currentPage()
+        with self.hold_sync():
+            self.total   = total
+            self.items   = items
+            self.loading = False
+            
+            
+    # Returns the number of rows satisfying the search and the list of rows of the current page (server-side mode)
+    def currentPage(self):
+        options = self.options
+        order = None
+        sortby   = options.get('sortBy',   [])
+        sortdesc = options.get('sortDesc', [])
+        if len(sortby) > 0 and sortby[0] in self.df.columns:
+            order = self.sortedPositions(sortby[0], len(sortdesc) > 0 and bool(sortdesc[0]))
+                
+        search = self.search if self.searchshow else ''
+        if len(self.df.columns) > 0 and len(search) > 0:
+            mask = self.searchMask(search)
+            if order is None: order = np.flatnonzero(mask)
+            else:             order = order[mask[order]]
+        
+        if order is None: total = self.df.shape[0]
+        else:             total = len(order)
+            
+        page         = max(1, int(options.get('page', 1)))
+        itemsperpage = int(options.get('itemsPerPage', 100))
+        if itemsperpage < 0:
+            start = 0
+            end   = total
+        else:
+            start = (page-1)*itemsperpage
+            end   = start + itemsperpage
+        
+        if order is None: rows = self.df.iloc[start:end]
+        else:             rows = self.df.iloc[order[start:end]]
+        
+        return total, json.loads(rows.to_json(orient='records'))
+            
+            
+    # Move the index of a DataFrame into its first column, named as the index column of the datatable (whatever the name of the index of data)
+    def resetIndex(self, data):
+        data = data.reset_index()
+        data.columns = [self.index_col] + list(data.columns[1:])
+        return data
+    
+    
+    # Convert a DataFrame into the list of dict sent to the v-data-table
+    def toRecords(self, data):
+        return json.loads(self.resetIndex(data).to_json(orient='records'))
+    
+    
+    # Convert a list of keys into the values used in the items
+    def normalizeKeys(self, keys):
+        return json.loads(pd.Series(list(keys), dtype=object).to_json(orient='values'))
+    
+    
+    # Invalidate the cached data and display the current page (server-side mode)
+    def dataChanged(self):
+        self.sortcache   = {}
+        self.searchtext  = None
+        self.searchcache = None
+        self.refresh()
+        
+        
+    # Append rows to the datatable
+    def appendRows(self, data):
+        """
+        Append rows to the datatable. Only the new rows are sent to the browser.
+        
+        Parameters
+        ----------
+        data : Pandas DataFrame
+            DataFrame having the same index and columns of the DataFrame displayed
+        """
+        if self.serverside:
+            self.df = pd.concat([self.df, self.resetIndex(data)], ignore_index=True)
+            self.dataChanged()
+        else:
+            rows = self.toRecords(data)
+            self.records.extend(rows)
+            self.version += 1
+            self.send({'method': 'appendrows', 'args': [rows]})
+        
+        
+    # Update rows of the datatable
+    def updateRows(self, data):
+        """
+        Update rows of the datatable. The rows are identified by the values of the index of the DataFrame; only the columns present in data are modified. Only the modified rows are sent to the browser.
+        
+        Parameters
+        ----------
+        data : Pandas DataFrame
+            DataFrame having the same index of the DataFrame displayed and a subset of its columns
+        """
+        if self.serverside:
+            data = self.resetIndex(data)
+            positions = pd.Index(self.df[self.index_col]).get_indexer(data[self.index_col])
+            found = positions >= 0
+            columns = [c for c in data.columns if c != self.index_col]
+            self.df.loc[positions[found], columns] = data.loc[found, columns].values
+            self.dataChanged()
+        else:
+            rows = self.toRecords(data)
+            positions = {item[self.index_col]: i for i, item in enumerate(self.records)}
+            for row in rows:
+                i = positions.get(row[self.index_col], None)
+                if not i is None:
+                    self.records[i] = dict(self.records[i], **row)
+            self.version += 1
+            self.send({'method': 'updaterows', 'args': [rows]})
+            
+            
+    # Delete rows from the datatable
+    def deleteRows(self, keys):
+        """
+        Delete rows from the datatable. Only the keys of the deleted rows are sent to the browser.
+        
+        Parameters
+        ----------
+        keys : list
+            List of the values of the index of the rows to delete
+        """
+        if self.serverside:
+            self.df = self.df[~self.df[self.index_col].isin(list(keys))].reset_index(drop=True)
+            self.dataChanged()
+        else:
+            keys = self.normalizeKeys(keys)
+            deleted = set(keys)
+            self.records = [item for item in self.records if not item[self.index_col] in deleted]
+            self.version += 1
+            self.send({'method': 'deleterows', 'args': [keys]})
@@ -17,7 +17,96 @@
 # 
 # See the Licence for the specific language governing permissions and
 # limitations under the Licence.
+import weakref
+
 
 # Font name and URL
 font_name = 'Roboto'
 font_url  = 'https://fonts.googleapis.com/css?family=%s:400,100,100italic,300,300italic,400italic,500,500italic,700,700italic,900,900italic' % (font_name)
+
+# URLs of the font stylesheets loaded at page level by injectFont, for each Output widget that displays the <link> tags (an entry is removed when its Output is cleared or deleted)
+injected_urls = weakref.WeakKeyDictionary()
+
+
+# Returns True if the font stylesheet has been loaded at page level by injectFont in an Output widget that was not cleared
+def fontInjected():
+    """
+    Returns True if the font stylesheet has been loaded at page level by :func:`injectFont` in an Output widget that has not been cleared or deleted.
+    """
+    return any(font_url in urls for urls in list(injected_urls.values()))
+
+
+# Returns the CSS @import rule of the font to insert inside the <style> tag of an SVG drawing
+def fontImport(embed=None):
+    """
+    Returns the CSS @import rule that loads the font stylesheet, to be inserted inside the <style> tag of an SVG drawing.
+
+    Parameters
+    ----------
+    embed : bool or None, optional
+        If True the @import rule is returned, if False an empty string is returned. If None, an empty string is returned only if the stylesheet has already been loaded in the page by :func:`injectFont` (see :func:`fontInjected`), so that the browser does not download and parse the same CSS once for each drawing (default is None)
+    """
+    if embed is None:
+        embed = not fontInjected()
+    if not embed:
+        return ''
+    return "@import url('%s');" % font_url
+
+
+# Returns the HTML that loads the font stylesheet at page level
+def fontLink():
+    """
+    Returns the HTML <link> tag that loads the font stylesheet at page level.
+    """
+    return '<link rel="stylesheet" type="text/css" href="%s">' % font_url
+
+
+# Forget the font stylesheets loaded in an Output widget when it is cleared
+def onOutputChange(change):
+    if len(change['new']) == 0:
+        injected_urls.pop(change['owner'], None)
+
+
+# Load the font stylesheet once at page level
+def injectFont(output=None):
+    """
+    Load the font stylesheet at page level, by displaying a <link> tag. The function is called by :func:`vois.vuetify.app.app.show`. Calling it more than once for the same font_url and the same output has no effect, until the output is cleared. While the output is displayed, the SVG charts created by vois omit their own @import of the font stylesheet (unless they are created with embedFont=True).
+
+    Parameters
+    ----------
+    output : ipywidgets.Output, optional
+        Output widget where the <link> tag is displayed (default is None, which means the tag is displayed in the current output at each call, and the SVG charts keep their own @import since the life of the tag cannot be tracked). The widget must remain displayed for the entire life of the page
+
+    Example
+    -------
+    Use a different font in a dashboard that does not use the app class::
+
+        from ipywidgets import widgets
+        from vois.vuetify import fontsettings
+        from vois import svgMap
+        fontsettings.font_name = 'Lato'
+        fontsettings.font_url  = 'https://fonts.googleapis.com/css?family=Lato:400,700'
+
+        out = widgets.Output()
+        display(out)
+        fontsettings.injectFont(out)
+
+        svg = svgMap.svgMapEurope(df)    # Doesn't contain the @import of the font stylesheet
+
+    """
+    from IPython.display import display, HTML
+    if output is None:
+        display(HTML(fontLink()))
+        return
+
+    urls = injected_urls.get(output, None)
+    if urls is None:
+        urls = set()
+        injected_urls[output] = urls
+        output.observe(onOutputChange, 'outputs')
+    elif font_url in urls:
+        return
+
+    with output:
+        display(HTML(fontLink()))
+    urls.add(font_url)
@@ -42,6 +42,7 @@ try:
     from . import upload
     from . import dialogWait
     from . import dialogMessage
+    from . import bdapCache
 except:
     import settings
     import sortableList
@@ -55,6 +56,7 @@ except:
     import upload
     import dialogWait
     import dialogMessage
+    import bdapCache
 
     
 
@@ -177,57 +179,59 @@ class interaproLayer():
     # Return a ipyleaflet.TileLayer instance
     def tileLayer(self):
         """
-        Return a ipyleaflet.TileLayer instance
+        Return a ipyleaflet.TileLayer instance. The processing id of the layer is memoized by the parameters returned by the toDict() method (see :mod:`bdapCache`), so the layer is processed on the BDAP server only once for each set of parameters
         """
-        if not self.path is None :
-            if isinstance(self.path , str):
-                coll = inter.Collection(eval(self.path))
+        # Process the layer on the BDAP server (called only once for each set of parameters)
+        def process():
+            if not self.path is None :
+                if isinstance(self.path , str):
+                    coll = inter.Collection(eval(self.path))
+                else:
+                    coll = inter.Collection(self.path)
             else:
-                coll = inter.Collection(self.path)
-        else:
-            coll = inter.ImageCollection("SIMPLE")
-            if not self.file is None:
-                coll.parameter('file',self.file)
-            if not self.epsg is None:
-                coll.parameter('epsg',str(self.epsg))
-            if not self.nodata is None:
-                coll.parameter('nodata',str(self.nodata))
-            if not self.colorfile is None and len(self.colorfile) > 0:
-                coll.parameter('colorfile',str(self.colorfile))
-            if not self.colortable is None and len(self.colortable) > 0:
-                coll.parameter('colortable',str(self.colortable))
-            if not self.colormap is None and len(self.colormap) > 0:
-                coll.parameter('colormap',str(self.colormap))
-            if not self.valuemap is None and len(self.valuemap) > 0:
-                coll.parameter('valuemap',str(self.valuemap))
-            if not self.colorscheme is None and len(self.colorscheme) > 0:
-                coll.parameter('colorscheme',str(self.colorscheme))
-            if not self.colorcustom is None and len(self.colorcustom) > 0:
-                coll.parameter('colorcustom',str(self.colorcustom))
-            if not self.scalemin is None:
-                coll.parameter('scalemin',str(self.scalemin))
-            if not self.scalemax is None:
-                coll.parameter('scalemax',str(self.scalemax))
-            if not self.interpolate is None:
-                coll.parameter('interpolate',str(self.interpolate))
-            if not self.bands is None:
-                coll.parameter('bands',str(self.bands))
-            if not self.rmin is None:
-                coll.parameter('rmin',str(self.rmin))
-            if not self.rmax is None:
-                coll.parameter('rmax',str(self.rmax))
-            if not self.gmin is None:
-                coll.parameter('gmin',str(self.gmin))
-            if not self.gmax is None:
-                coll.parameter('gmax',str(self.gmax))
-            if not self.bmin is None:
-                coll.parameter('bmin',str(self.bmin))
-            if not self.bmax is None:
-                coll.parameter('bmax',str(self.bmax))
-
-        p = coll.process()
-        procid = p.toLayer()
-        #p.printProcess()
+                coll = inter.ImageCollection("SIMPLE")
+                if not self.file is None:
+                    coll.parameter('file',self.file)
+                if not self.epsg is None:
+                    coll.parameter('epsg',str(self.epsg))
+                if not self.nodata is None:
+                    coll.parameter('nodata',str(self.nodata))
+                if not self.colorfile is None and len(self.colorfile) > 0:
+                    coll.parameter('colorfile',str(self.colorfile))
+                if not self.colortable is None and len(self.colortable) > 0:
+                    coll.parameter('colortable',str(self.colortable))
+                if not self.colormap is None and len(self.colormap) > 0:
+                    coll.parameter('colormap',str(self.colormap))
+                if not self.valuemap is None and len(self.valuemap) > 0:
+                    coll.parameter('valuemap',str(self.valuemap))
+                if not self.colorscheme is None and len(self.colorscheme) > 0:
+                    coll.parameter('colorscheme',str(self.colorscheme))
+                if not self.colorcustom is None and len(self.colorcustom) > 0:
+                    coll.parameter('colorcustom',str(self.colorcustom))
+                if not self.scalemin is None:
+                    coll.parameter('scalemin',str(self.scalemin))
+                if not self.scalemax is None:
+                    coll.parameter('scalemax',str(self.scalemax))
+                if not self.interpolate is None:
+                    coll.parameter('interpolate',str(self.interpolate))
+                if not self.bands is None:
+                    coll.parameter('bands',str(self.bands))
+                if not self.rmin is None:
+                    coll.parameter('rmin',str(self.rmin))
+                if not self.rmax is None:
+                    coll.parameter('rmax',str(self.rmax))
+                if not self.gmin is None:
+                    coll.parameter('gmin',str(self.gmin))
+                if not self.gmax is None:
+                    coll.parameter('gmax',str(self.gmax))
+                if not self.bmin is None:
+                    coll.parameter('bmin',str(self.bmin))
+                if not self.bmax is None:
+                    coll.parameter('bmax',str(self.bmax))
+
+            return coll.process().toLayer()
+
+        procid = bdapCache.procid(self.toDict(), process)
         return ipyleaflet.TileLayer(name=self.name, visible=self.visible, opacity=self.opacity, url='https://jeodpp.jrc.ec.europa.eu/jeodpp-inter-view/?x={x}&y={y}&z={z}&procid=%s'%procid)
         
         
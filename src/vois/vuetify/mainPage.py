@@ -24,10 +24,14 @@ from ipywidgets import widgets, Layout, HTML
 from IPython.display import display
 import ipyvuetify as v
 
-import base64
-from io import BytesIO
 import os
 
+from vois import assetCache
+
+
+# Maximum size in pixels of the thumbnails generated for the buttons images given as paths of local files
+BUTTON_THUMBNAIL_SIZE = 400
+
 
 ######################################################################################################################################################
 # Check if running in Voila: check environ variable SERVER_SOFTWARE
@@ -38,12 +42,10 @@ def RunningInVoila():
     
 ######################################################################################################################################################
 # Given a local filepath of a PNG or JPEG image, returns the interned URL to use in a v.Img ipyvuetify widget
+# (the URLs are cached, and if width or height is given a downscaled thumbnail is returned)
 ######################################################################################################################################################
-def getLocalImageURL(filepath, imagetype='jpg'):
-    with open(filepath, "rb") as f:
-        buffered = BytesIO(f.read())
-        img_str = base64.b64encode(buffered.getvalue()).decode('utf-8')
-        return 'data:image/%s;base64,'%imagetype + img_str
+def getLocalImageURL(filepath, imagetype='jpg', width=None, height=None):
+    return assetCache.imageURL(filepath, imagetype=imagetype, width=width, height=height)
 
     
 ######################################################################################################################################################
@@ -361,7 +363,7 @@ class mainPage():
         tooltip : str, optional
             Tooltip to show when hovering the button title (default is '')
         image : str, optional
-            Image to show on the right side of the button (default is '')
+            Image to show on the right side of the button: URL of an image or path of a local image file, which is displayed as a cached thumbnail of at most mainPage.BUTTON_THUMBNAIL_SIZE pixels (default is '')
         onclick : function, optional
             Python function to call when the user clicks on the button. The function will receive the argument value as parameter if it is not None, otherwise it will be calle with no parameters. Default is None
         argument : any, optional
@@ -555,7 +557,7 @@ class mainPage():
                            height="%fvh"%self.button_heightpercent, imagesize="%fvh"%self.button_heightpercent,
                            title=b['title'], subtitle=b['subtitle'], tooltiptext=b['tooltip'],
                            color='#ffffff%0.2X'%int(self.button_opacity*255), subtitleweight=400,
-                           image=b['image'], on_click=b['onclick'], argument=b['argument'], button_radius=self.button_radius,
+                           image=assetCache.localURL(b['image'], width=BUTTON_THUMBNAIL_SIZE, height=BUTTON_THUMBNAIL_SIZE), on_click=b['onclick'], argument=b['argument'], button_radius=self.button_radius,
                            textcolor=self.text_color, titlesize=self.button_titlesize, subtitlesize=self.button_subtitlesize)
             
             if len(children) > 0:
@@ -796,7 +798,7 @@ class mainPage():
                            height="%fvh"%(0.7*self.button_heightpercent), imagesize="%fvh"%(0.7*self.button_heightpercent),
                            title=b['title'], subtitle=b['subtitle'], tooltiptext=b['tooltip'],
                            color='#ffffff%0.2X'%int(self.button_opacity*255), subtitleweight=400,
-                           image=b['image'], on_click=b['onclick'], argument=b['argument'], button_radius=self.button_radius,
+                           image=assetCache.localURL(b['image'], width=BUTTON_THUMBNAIL_SIZE, height=BUTTON_THUMBNAIL_SIZE), on_click=b['onclick'], argument=b['argument'], button_radius=self.button_radius,
                            textcolor=self.text_color, titlesize='calc(0.7 * %s)'%self.button_titlesize, subtitlesize='calc(0.7 * %s)'%self.button_subtitlesize)
             
             if len(children) > 0:
@@ -20,6 +20,8 @@
 import ipyvuetify as v
 import traitlets 
 
+from vois import assetCache
+
 try:
     from . import settings
 except:
@@ -33,7 +35,7 @@ class selectImage(v.VuetifyTemplate):
     Parameters
     ----------
     images : list of json element, one for each image to display, optional
-        Each of the json elements must have "name", and "image" tags. Optional tags are "max_width", "max_height", "margins"
+        Each of the json elements must have "name", and "image" tags. Optional tags are "max_width", "max_height", "margins". The "image" tag can be the URL of an image or the path of a local image file: local files are displayed as thumbnails of max_width x max_height pixels, generated once and cached (see :mod:`assetCache`)
     label : str, optional
         Label to show in the select widget (default is '')
     selection : int, optional
@@ -172,6 +174,11 @@ class selectImage(v.VuetifyTemplate):
                 img["max_height"] = str(self.max_height)
             if not "margins" in img:
                 img["margins"] = self.margins
+            if "image" in img:
+                try:
+                    img["image"] = assetCache.localURL(img["image"], width=int(img["max_width"]), height=int(img["max_height"]))
+                except ValueError:
+                    img["image"] = assetCache.localURL(img["image"])
         
         self.images          = images
         self.label           = label
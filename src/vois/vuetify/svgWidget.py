@@ -0,0 +1,161 @@
+"""Persistent widget to display an SVG drawing and to modify it with small patches"""
+# Author(s): Davide.De-Marchi@ec.europa.eu
+# Copyright © European Union 2024
+#
+# Licensed under the EUPL, Version 1.2 or as soon they will be approved by
+# the European Commission subsequent versions of the EUPL (the "Licence");
+#
+# You may not use this work except in compliance with the Licence.
+#
+# You may obtain a copy of the Licence at:
+# https://joinup.ec.europa.eu/collection/eupl/eupl-text-eupl-12
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the Licence is distributed on an "AS IS"
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+#
+# See the Licence for the specific language governing permissions and
+# limitations under the Licence.
+import ipyvuetify as v
+import traitlets
+
+
+class svgWidget(v.VuetifyTemplate):
+    """
+    Persistent widget that displays an SVG drawing and keeps its DOM alive: after the first display, the drawing can be modified by sending small patches (attributes to set on the elements identified by a CSS selector) instead of sending again the full SVG string.
+    The patches are cumulative and are applied again every time the widget is rendered, so that all the views of the widget always show the same state.
+    Clicks on the elements of the drawing that have a data-index attribute are sent to the Python function passed in the on_click parameter.
+
+    Parameters
+    ----------
+    svg : str, optional
+        String containing the SVG drawing to display (default is '')
+    on_click : function, optional
+        Python function to call when the user clicks on the drawing. The function will receive as parameter the integer value of the data-index attribute of the clicked element, or None if the clicked element (and all its ancestors) has no data-index attribute (default is None)
+
+    Example
+    -------
+    Display an SVG drawing and change the color of a rectangle when it is clicked::
+
+        from vois.vuetify import svgWidget
+        from IPython.display import display
+
+        svg = '''<svg viewBox="0 0 100 50" width="300px">
+                   <rect data-index="0" x="5"  y="5" width="40" height="40" fill="red"/>
+                   <rect data-index="1" x="55" y="5" width="40" height="40" fill="red"/>
+                 </svg>'''
+
+        def on_click(index):
+            if index is not None:
+                w.patch('[data-index="%d"]' % index, fill='green')
+
+        w = svgWidget.svgWidget(svg=svg, on_click=on_click)
+        display(w)
+
+    """
+
+    svg      = traitlets.Unicode('').tag(sync=True)    # SVG drawing
+    patches  = traitlets.Dict({}).tag(sync=True)       # Dict having as key a CSS selector and as value a dict of attribute names and values (None to remove the attribute)
+    restart  = traitlets.Int(0).tag(sync=True)         # Incremented to restart the SMIL animations of the drawing
+    on_click = traitlets.Any(None).tag(sync=False)     # Python function to call when the user clicks on the drawing
+
+
+    @traitlets.default('template')
+    def _template(self):
+        return '''
+<template>
+    <div class="pa-0 ma-0" style="line-height: 0;" v-html="svg" @click="onClickSvg($event)" />
+</template>
+
+<script>
+    modules.export = {
+        mounted() {
+            this.applyPatches();
+        },
+        updated() {
+            this.applyPatches();
+        },
+        watch: {
+            patches() {
+                this.applyPatches();
+            },
+            restart() {
+                const s = this.$el.querySelector('svg');
+                if (s && s.setCurrentTime) s.setCurrentTime(0);
+            }
+        },
+        methods: {
+            applyPatches() {
+                for (const [selector, attrs] of Object.entries(this.patches)) {
+                    this.$el.querySelectorAll(selector).forEach(e => {
+                        for (const [name, value] of Object.entries(attrs)) {
+                            if (value === null) e.removeAttribute(name);
+                            else                e.setAttribute(name, value);
+                        }
+                    });
+                }
+            },
+            onClickSvg(event) {
+                const target = event.target.closest('[data-index]');
+                this.clicked(target ? target.getAttribute('data-index') : null);
+            }
+        }
+    }
+</script>
+'''
+
+    def __init__(self, *args, svg='', on_click=None, **kwargs):
+        self.svg      = svg
+        self.on_click = on_click
+        super().__init__(*args, **kwargs)
+
+
+    # Manage "click" event
+    def vue_clicked(self, data):
+        if not self.on_click is None:
+            if data is None: self.on_click(None)
+            else:            self.on_click(int(data))
+
+
+    # Set attributes on the elements identified by a CSS selector
+    def patch(self, selector, **attributes):
+        """
+        Set attributes on the elements of the drawing identified by a CSS selector. Underscores in the attribute names are converted into hyphens (i.e. stroke_width='2' sets the stroke-width attribute). Passing None as value removes the attribute.
+
+        Parameters
+        ----------
+        selector : str
+            CSS selector of the elements to modify (for instance '[data-index="3"]')
+        **attributes
+            Names and values of the attributes to set
+        """
+        patches = dict(self.patches)
+        attrs = dict(patches.get(selector, {}))
+        for name, value in attributes.items():
+            attrs[name.replace('_','-')] = None if value is None else str(value)
+        patches[selector] = attrs
+        self.patches = patches
+
+
+    # Replace the full SVG drawing
+    def update(self, svg):
+        """
+        Replace the SVG drawing and remove all the patches.
+
+        Parameters
+        ----------
+        svg : str
+            String containing the new SVG drawing
+        """
+        with self.hold_sync():
+            self.patches = {}
+            self.svg = svg
+
+
+    # Restart the SMIL animations of the drawing
+    def restartAnimations(self):
+        """
+        Restart the SMIL animations (<animate> tags) contained in the SVG drawing.
+        """
+        self.restart += 1
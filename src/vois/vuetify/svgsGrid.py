@@ -20,25 +20,14 @@
 import ipyvuetify as v
 import traitlets
 import os
-import base64
+
+from vois import assetCache
 
 
 # Given a path of an SVG file, it reads the content and returns a string containing a IMG tab with the SVG embedded in base64 format
+# (the encoded strings are cached by path, modification time and size of the file)
 def readSVGbase64(filepath, fill=None, stroke=None):
-    svgtext = ''
-    with open(filepath,'r') as f:
-        svgtext = f.read()
-        
-    if (not fill is None) and (not stroke is None):
-        svgtext.replace('<svg ','<svg fill="%s" stroke="%s"'%(fill,stroke))
-    elif not fill is None:
-        svgtext.replace('<svg','<svg fill="%s"'%fill)
-    elif not stroke is None:
-        svgtext.replace('<svg','<svg stroke="%s"'%stroke)
-
-    base64_bytes  = base64.b64encode(bytes(svgtext,'utf-8'))
-    base64_string = base64_bytes.decode("ascii")
-    return "data:image/svg+xml;base64, %s" % base64_string
+    return assetCache.svgURL(filepath, fill=fill, stroke=stroke)
 
 
 # Given a path of an SVG file, it reads the content and returns a string containing a IMG tab with the SVG embedded in base64 format
@@ -22,6 +22,7 @@ import ipyvuetify as v
 from ipywidgets import widgets, Layout, HTML
 from IPython.display import display
 import pandas as pd
+import numpy as np
 import copy
 
 try:
@@ -88,6 +89,8 @@ class CustomTreeview(v.VuetifyTemplate):
         Icon size in pixels (default is 18)
     checkbox_size : int, optional
         Checkbox size in pixels (default is 24)
+    lazy : bool, optional
+        If True, the full tree is kept in Python and only the nodes of the opened branches are sent to the browser: the children of a node are sent when the node is opened for the first time (default is False)
         
     Note
     ----
@@ -110,6 +113,7 @@ class CustomTreeview(v.VuetifyTemplate):
     expand_selection_to_parents = traitlets.Bool(True).tag(sync=True)                    # If True, also the parent nodes are returned as selected when all children are selected
     search                      = traitlets.Unicode('').tag(sync=True)                   # Search string to filter the nodes
     opened_all                  = traitlets.Bool(False).tag(sync=True)                   # If True all the nodes are opened at start
+    lazy                        = traitlets.Bool(False).tag(sync=True)                   # If True the children of the nodes are sent to the browser only when the nodes are opened
     
     
     @traitlets.default('template')
@@ -183,6 +187,7 @@ class CustomTreeview(v.VuetifyTemplate):
 '''% (self.item_height, self.font_size, self.checkbox_size, self.icon_size)
         
         return '''
+<template>
 <v-treeview 
     :selectable="selectable"
     :activatable="activatable"
@@ -200,12 +205,38 @@ class CustomTreeview(v.VuetifyTemplate):
     :color="color"
     :selected-color="color"
     :open-on-click="open_on_click"
+    :load-children="lazy ? loadChildren : undefined"
     @input="change_selection"
     @update:active="activate"
     @update:open="onopening">
     %s
     %s
 </v-treeview>
+</template>
+
+<script>
+    modules.export = {
+        created() {
+            this.pendingLoads = {};
+        },
+        methods: {
+            loadChildren(item) {
+                return new Promise(resolve => {
+                    this.pendingLoads[item.id] = resolve;
+                    this.loadchildren(item.id);
+                }).then(result => {
+                    item.children.push(...result.children);
+                    this.$nextTick(() => { this.selected = result.selected; });
+                });
+            },
+            jupyter_loadedchildren(id, children, selected) {
+                const resolve = this.pendingLoads[id];
+                delete this.pendingLoads[id];
+                if (resolve) resolve({children: children, selected: selected});
+            }
+        }
+    }
+</script>
 '''% (tooltip_template, icons_template)
             
             
@@ -261,49 +292,253 @@ class CustomTreeview(v.VuetifyTemplate):
 ''' % (tooltip_template, icons_template, self.item_height, self.font_size, self.checkbox_size, self.icon_size)
     
     
-    # Expand the selection to parents that have all childrens selected
-    def expandSelectionToParents(self, node):
-        if 'children' in node:
-            sel = True
-            for n in node['children']:
-                self.expandSelectionToParents(n)
-                if n['id'] not in self.selected: sel = False
-            if sel and not node['id'] in self.selected:
-                self.selected.append(node['id'])
+    # Calculate the indexing of the tree nodes
+    def doindex(self):
+        """
+        Calculate the dictionaries that index the nodes of the tree. It is called automatically every time the items of the tree are changed.
+        """
+        # id2node        Map nodes id to the node dict                # key: id           value : node
+        # id2fullname    Map nodes id to the fullname                 # key: id           value : fullname of the node
+        # fullname2id    Map nodes fullname to the id                 # key: fullname     value : id of the node
+        # id2parentid    Map node id to the id of the parent node     # key: id           value : id of the parent node
+        # id2childrenid  Map node id to the list of children ids      # key: id           value : list of id of the children nodes
+        # id2depth       Map node id to its depth in the tree         # key: id           value : 0 for the root nodes
+        self.id2node       = {}
+        self.id2fullname   = {}
+        self.fullname2id   = {}
+        self.id2parentid   = {}
+        self.id2childrenid = {}
+        self.id2depth      = {}
+        self.searchindex   = None
+        
+        stack = [(node, None, 0) for node in self.getItems()]
+        while len(stack) > 0:
+            node, parentid, depth = stack.pop()
+            nodeid = node['id']
+            self.id2node[nodeid]  = node
+            self.id2depth[nodeid] = depth
+            if 'fullname' in node:
+                self.id2fullname[nodeid] = node['fullname']
+                self.fullname2id[node['fullname']] = nodeid
+            if not parentid is None:
+                self.id2parentid[nodeid] = parentid
+            if 'children' in node:
+                self.id2childrenid[nodeid] = [n['id'] for n in node['children']]
+                stack.extend([(n, nodeid, depth+1) for n in node['children']])
+                
+                
+    # Rebuild the indexing when the items are changed
+    def onItemsChange(self, change):
+        if not self.lazy:        # In lazy mode the items only contain the nodes sent to the browser: the full tree is changed by calling setItems()
+            self.doindex()
+            
+            
+    # Returns the full tree
+    def getItems(self):
+        """
+        Returns the list of the root nodes of the full tree (in lazy mode the items member only contains the nodes that have been sent to the browser).
+        """
+        if self.lazy: return self.tree
+        else:         return self.items
     
     
-    # Transform a list of id in a list of fullnames
-    def id2Names_selected(self, node, idlist):
-        if node['id'] in idlist: self.selectednames.add(node['fullname'])
-        if 'children' in node:
-            for n in node['children']:
-                self.id2Names_selected(n,idlist)
+    # Change the full tree
+    def setItems(self, items):
+        """
+        Change the full tree displayed by the treeview.
 
-    # Return the fullname given the id
-    def id2Name(self, node, id):
-        if node['id'] == id:
-            return node['fullname']
+        Parameters
+        ----------
+        items : list
+            List of the root nodes of the tree (each node is a dict having 'id' and 'name' keys, and optionally the 'children' key)
+        """
+        if self.lazy:
+            self.tree = items
+            self.doindex()
+            self.loaded       = set(x for x in self.loaded if x in self.id2childrenid)
+            self.fullselected = set(x for x in self.fullselected if x in self.id2node and not x in self.id2childrenid)
+            self.buildItems()
+        else:
+            self.items = items
+            
+    
+    # Returns the ids of the leaves of the subtree of a node
+    def leavesOf(self, nodeid):
+        leaves = []
+        stack = [nodeid]
+        while len(stack) > 0:
+            n = stack.pop()
+            if n in self.id2childrenid: stack.extend(self.id2childrenid[n])
+            else:                       leaves.append(n)
+        return leaves
+    
+    
+    # Lazy mode: returns the node to send to the browser (children are sent only for the loaded nodes, an empty list marks the nodes to load on demand)
+    def shallowNode(self, node):
+        elem = {k: v for k, v in node.items() if k != 'children'}
         if 'children' in node:
-            for n in node['children']:
-                res = self.id2Name(n,id)
-                if not res is None:
-                    return res
+            if node['id'] in self.loaded: elem['children'] = [self.shallowNode(n) for n in node['children']]
+            else:                         elem['children'] = []
+        self.shallownodes[node['id']] = elem
+        return elem
+    
+    
+    # Lazy mode: rebuild the items sent to the browser
+    def buildItems(self):
+        self.shallownodes = {}
+        with self.hold_sync():
+            self.items    = [self.shallowNode(n) for n in self.tree]
+            self.selected = self.visibleSelection()
+        
+        
+    # Lazy mode: returns the list of selected ids among the nodes sent to the browser (the folders not yet loaded are selected if all their leaves are selected)
+    def visibleSelection(self):
+        selected = []
+        for nodeid, elem in self.shallownodes.items():
+            if not nodeid in self.id2childrenid:
+                if nodeid in self.fullselected:
+                    selected.append(nodeid)
+            elif not nodeid in self.loaded:
+                leaves = self.leavesOf(nodeid)
+                if len(leaves) > 0 and all(x in self.fullselected for x in leaves):
+                    selected.append(nodeid)
+        return sorted(selected)
+    
+    
+    # Lazy mode: merge the selection received from the browser with the selection of the leaves not yet sent
+    def mergeSelection(self, data):
+        previous = set(self.selected)
+        current  = set(data)
+        for nodeid in self.shallownodes:
+            if not nodeid in self.id2childrenid:
+                if nodeid in current: self.fullselected.add(nodeid)
+                else:                 self.fullselected.discard(nodeid)
+            elif not nodeid in self.loaded and (nodeid in current) != (nodeid in previous):   # Folder not loaded checked or unchecked by the user
+                if nodeid in current: self.fullselected.update(self.leavesOf(nodeid))
+                else:                 self.fullselected.difference_update(self.leavesOf(nodeid))
+    
+    
+    # Lazy mode: load the children of a list of nodes and of all their ancestors
+    def loadNodes(self, ids):
+        """
+        In lazy mode, send to the browser the children of a list of nodes and of all their ancestors (to be called before opening nodes programmatically).
 
+        Parameters
+        ----------
+        ids : list of int
+            List of ids of the nodes to load
+        """
+        if not self.lazy:
+            return
+        toload = set()
+        for nodeid in ids:
+            while not nodeid is None and not nodeid in toload:
+                if nodeid in self.id2childrenid and not nodeid in self.loaded:
+                    toload.add(nodeid)
+                nodeid = self.id2parentid.get(nodeid, None)
+        if len(toload) > 0:
+            self.loaded.update(toload)
+            self.buildItems()
+    
+    
+    # Expand the selection to parents that have all childrens selected: only the ancestors of the selected nodes are checked
+    def expandSelectionToParents(self, selected):
+        levels = {}
+        for nodeid in selected:
+            parentid = self.id2parentid.get(nodeid, None)
+            if not parentid is None and not parentid in selected:
+                levels.setdefault(self.id2depth[parentid], set()).add(parentid)
+                
+        while len(levels) > 0:
+            depth = max(levels)
+            for parentid in levels.pop(depth):
+                if all(c in selected for c in self.id2childrenid[parentid]):
+                    selected.add(parentid)
+                    grandparentid = self.id2parentid.get(parentid, None)
+                    if not grandparentid is None and not grandparentid in selected:
+                        levels.setdefault(depth-1, set()).add(grandparentid)
+        return selected
+    
                 
     # Updates self.selectednames with the selected nodes
     def updateSelectedNames(self):
+        if self.lazy:
+            selected = set(self.fullselected)
+        else:
+            selected = set(self.selected)
         if self.expand_selection_to_parents:
-            for i in self.items:
-                self.expandSelectionToParents(i)
-        self.selected.sort()
-        self.selectednames = set()
-        for i in self.items:
-            self.id2Names_selected(i,self.selected)
-        self.selectednames = sorted(list(self.selectednames))
+            self.expandSelectionToParents(selected)
+        if not self.lazy:
+            self.selected[:] = sorted(selected)    # In place: the parents added are not sent back to the browser
+        self.selectednames = sorted(set(self.id2fullname[x] for x in selected if x in self.id2fullname))
+        return selected
+        
+        
+    # Returns the ids of the selected nodes of the full tree
+    def getSelectedIds(self):
+        """
+        Returns the list of ids of the selected nodes of the full tree (in lazy mode the selected member only contains the ids of the nodes sent to the browser).
+        """
+        if self.lazy:
+            return sorted(self.updateSelectedNames())
+        return self.selected
+    
+    
+    # Set the selected nodes of the full tree
+    def setSelectedIds(self, ids):
+        """
+        Set the selected nodes of the full tree (the selection of a node selects all its descendants).
+
+        Parameters
+        ----------
+        ids : list of int
+            List of ids of the nodes to select
+        """
+        if self.lazy:
+            self.fullselected = set()
+            for nodeid in ids:
+                if nodeid in self.id2node:
+                    self.fullselected.update(self.leavesOf(nodeid))
+            self.selected = self.visibleSelection()
+        else:
+            self.selected = ids
+            
+            
+    # Filter the nodes of the tree
+    def setSearch(self, text2search=''):
+        """
+        Display only the nodes of the tree that contain a text. In lazy mode the nodes are searched in the full tree and the ancestors of the nodes found are sent to the browser.
+
+        Parameters
+        ----------
+        text2search : str, optional
+            Text to search (default is '', which means that all the nodes of the tree are displayed)
+        """
+        if self.lazy and len(text2search) > 0:
+            if self.searchindex is None:
+                self.searchindex = [(nodeid, str(node['name']).lower()) for nodeid, node in self.id2node.items()]
+            text = text2search.lower()
+            self.loadNodes([self.id2parentid[nodeid] for nodeid, name in self.searchindex if text in name and nodeid in self.id2parentid])
+        self.search = text2search
+    
+    
+    # Manage the request of the children of a node opened for the first time (lazy mode)
+    def vue_loadchildren(self, nodeid):
+        children = []
+        if self.lazy and nodeid in self.id2node:
+            self.loaded.add(nodeid)
+            children = [self.shallowNode(n) for n in self.id2node[nodeid].get('children', [])]
+            if nodeid in self.shallownodes:
+                self.shallownodes[nodeid]['children'] = children   # In place: the browser adds the children to its own copy of the items
+            self.selected[:] = self.visibleSelection()
+        self.send({'method': 'loadedchildren', 'args': [nodeid, children, list(self.selected)]})
+    
     
     # Manage event "input": when a checkbox of the tree is clicked
     def vue_change_selection(self, data):
         #print(data)
+        if self.lazy:
+            self.mergeSelection(data)
         self.selected = data
         if self.selectable and not self.on_change is None:
             self.updateSelectedNames()
@@ -314,11 +549,9 @@ class CustomTreeview(v.VuetifyTemplate):
         if len(data) > 0:
             self.current_active = data[0]
             if self.activatable and not self.on_activated is None:
-                for i in self.items:
-                    name = self.id2Name(i,data[0])
-                    if not name is None:
-                        self.on_activated(name)
-                        break
+                name = self.id2fullname.get(data[0], None)
+                if not name is None:
+                    self.on_activated(name)
         else:
             self.current_active = None
             if self.activatable and not self.on_activated is None:
@@ -358,10 +591,13 @@ class CustomTreeview(v.VuetifyTemplate):
                  icons_folder_closed='mdi-folder',
                  tooltips=False,
                  tooltips_chars=20,
+                 lazy=False,
                  *args,
                  **kwargs):
         
-        self.items                       = items
+        self.lazy                        = lazy
+        self.tree                        = items
+        self.items                       = [] if lazy else items
         self.selectable                  = selectable
         self.activatable                 = activatable
         self.open_on_click               = open_on_click
@@ -394,6 +630,21 @@ class CustomTreeview(v.VuetifyTemplate):
         self.tooltips_chars = tooltips_chars
         super().__init__(*args, **kwargs)
         
+        self.doindex()
+        self.observe(self.onItemsChange, 'items')
+        
+        # Lazy mode: only the opened nodes and their ancestors are loaded at start
+        if self.lazy:
+            if opened_all: self.loaded = set(self.id2childrenid.keys())
+            else:          self.loaded = set()
+            self.fullselected = set()
+            for nodeid in selected:
+                if nodeid in self.id2node:
+                    self.fullselected.update(self.leavesOf(nodeid))
+            self.shallownodes = {}
+            self.loadNodes(opened)
+            self.buildItems()
+        
         
 
 ##################################################################################################################################
@@ -452,29 +703,24 @@ class treeviewOperations():
     
     # calculate indexing of the treeview nodes
     def doindex(self):
-        # Dictionaries to index the three nodes
-        # id2fullname    Map nodes id to the fullname                 # key: id           value : fullname of the node
-        # fullname2id    Map nodes fullname to the id                 # key: fullname     value : id of the node
-        # id2parentid    Map node id to the id of the parent node     # key: id           value : id of the parent node
-        # id2childrenid  Map node id to the list of children ids      # key: id           value : list of id of the children nodes
-        self.id2fullname   = {}
-        self.fullname2id   = {}
-        self.id2parentid   = {}
-        self.id2childrenid = {}
-        for i in self.treeview.items:
-            self.__indexItems(i)
-        
+        # The dictionaries that index the nodes are calculated and kept updated by the CustomTreeview instance
+        self.treeview.doindex()
         
-    # Internal recursive function to create the indexing of the treeview nodes
-    def __indexItems(self,node):
-        self.id2fullname[node['id']]       = node['fullname']
-        self.fullname2id[node['fullname']] = node['id']
-        if 'children' in node:
-            self.id2childrenid[node['id']] = []
-            for n in node['children']:
-                self.id2parentid[n['id']] = node['id']
-                self.id2childrenid[node['id']].append(n['id'])
-                self.__indexItems(n)
+    @property
+    def id2fullname(self):
+        return self.treeview.id2fullname
+    
+    @property
+    def fullname2id(self):
+        return self.treeview.fullname2id
+    
+    @property
+    def id2parentid(self):
+        return self.treeview.id2parentid
+    
+    @property
+    def id2childrenid(self):
+        return self.treeview.id2childrenid
         
 
     # Get the fullnames of the opened nodes
@@ -493,6 +739,7 @@ class treeviewOperations():
         Set the list of opened nodes of the treeview given their fullnames
         """
         ids = list(set([self.fullname2id[x] for x in fullnames]))
+        self.treeview.loadNodes(ids)
         self.treeview.opened = ids
 
         
@@ -501,7 +748,7 @@ class treeviewOperations():
         """
         Returns the list of the fullnames of the selected nodes of the treeview
         """
-        fullnames = [self.id2fullname[x] for x in self.treeview.selected]
+        fullnames = [self.id2fullname[x] for x in self.treeview.getSelectedIds()]
         return fullnames
         
         
@@ -511,7 +758,7 @@ class treeviewOperations():
         Set the list of selected nodes of the treeview given their fullnames
         """
         ids = list(set([self.fullname2id[x] for x in fullnames]))
-        self.treeview.selected = ids
+        self.treeview.setSelectedIds(ids)
         
         
     # Open all the nodes of the tree
@@ -556,6 +803,7 @@ class treeviewOperations():
             if not 1 in idparents:
                 idparents.append(1)
             
+            self.treeview.loadNodes(idparents)
             op = set(self.treeview.opened + idparents)
             self.treeview.opened = list(op)
             
@@ -577,7 +825,7 @@ class treeviewOperations():
         """
         Search for a text string in the nodes of the tree
         """
-        self.treeview.search = text2search
+        self.treeview.setSearch(text2search)
 
         
     # Retrieve the children of a node
@@ -586,23 +834,9 @@ class treeviewOperations():
         Returns the list of full names of the children of a node
         """
         
-        # Recursive function
-        def __getchildren(node, nodeid):
-            if node['id'] == nodeid:
-                if 'children' in node:
-                    return [x['id'] for x in node['children']]
-
-            if 'children' in node:
-                for n in node['children']:
-                    res = __getchildren(n, nodeid)
-                    if len(res) > 0:
-                        return res
-            return []
-        
         if nodefullname in self.fullname2id:
             nodeid = self.fullname2id[nodefullname]
-            res = __getchildren(self.treeview.items[0],nodeid)
-            return [self.id2fullname[x] for x in res]
+            return [self.id2fullname[x] for x in self.id2childrenid.get(nodeid, [])]
         
         return []
         
@@ -656,10 +890,9 @@ class treeviewOperations():
                 children.append(c)
                 nextid += 1
             
-            root = copy.deepcopy(self.treeview.items[0])
+            root = copy.deepcopy(self.treeview.getItems()[0])
             __setchildren(root, nodeid, children)
-            self.treeview.items = [root]
-            self.doindex()
+            self.treeview.setItems([root])    # The indexing is recalculated by the treeview
     
     
 ##################################################################################################################################
@@ -703,7 +936,8 @@ def createTreeviewFromList(nameslist=[],
                            item_height=24,
                            font_size=15,
                            icon_size=18,
-                           checkbox_size=24):
+                           checkbox_size=24,
+                           lazy=False):
     """
     Create a treeview form a list of strings and a separator that defines the hierarchical structure (example: ['A', 'A.1', 'A.2', 'B', 'B.3']).
 
@@ -783,6 +1017,8 @@ def createTreeviewFromList(nameslist=[],
         Icon size in pixels (default is 18)
     checkbox_size : int, optional
         Checkbox size in pixels (default is 24)
+    lazy : bool, optional
+        If True, the full tree is kept in Python and the children of each node are sent to the browser only when the node is opened for the first time, allowing for the display of very large trees (default is False)
 
     Returns
     -------
@@ -907,7 +1143,7 @@ def createTreeviewFromList(nameslist=[],
                           color=color, selectable=selectable, activatable=activatable, active=activeid, open_on_click=open_on_click,
                           tooltips=tooltips, tooltips_chars=tooltips_chars,
                           iconsshow=iconsshow, iconscolor=iconscolor, icons_folder_opened=icons_folder_opened, icons_folder_closed=icons_folder_closed,
-                          item_height=item_height, font_size=font_size, icon_size=icon_size, checkbox_size=checkbox_size)
+                          item_height=item_height, font_size=font_size, icon_size=icon_size, checkbox_size=checkbox_size, lazy=lazy)
     treehtml = v.Html(tag='div', height=height, children=[tree], style_='overflow: hidden;')
     treecard = v.Card(width=width, height=height, elevation=elevation, children=[treehtml],
                       dark=dark, style_='overflow-x: visible;')
@@ -1107,6 +1343,112 @@ def addNode(name, parent, icon,
         return elem, nextid, fullnamenodes, fullnames2id
 
     
+# Create the nested dict of the tree from some columns of a DataFrame
+def createTreeFromDF(df, columnNames, rootName='Root', separator='.',
+                     iconscolumnNames=None, iconroot=None,
+                     iconsshow=False, iconsfolder=True,
+                     repeat_parent_as_first_child=False,
+                     disabled=[]):
+    """
+    Create the nested dict of a tree from the strings contained in some columns of a Pandas DataFrame: each column defines a level of the tree.
+    The unique nodes of each level are extracted by pandas in the order of their first appearance in the DataFrame, the ids are assigned in bulk and the nested dict is built in a single pass on the unique nodes (the result is identical to the one obtained by calling :func:`addNode` for each row of the DataFrame).
+
+    Parameters
+    ----------
+    df : Pandas DataFrame
+        Pandas DataFrame containing the columns
+    columnNames : list of str
+        Names of the columns of the DataFrame, from the first level of the tree to the last one
+    rootName : str, optional
+        Name of the root of the tree (default is 'Root')
+    separator : str, optional
+        String or character used to compose the fullname of the nodes (default is '.')
+    iconscolumnNames : list of str, optional
+        Names of the columns that contain the icon names of the nodes of each level, or None for levels without icons (default is None)
+    iconroot : str, optional
+        Name of the icon for the root node of the tree (default is None)
+    iconsshow : bool, optional
+        If True, the icons are added to the nodes (default is False)
+    iconsfolder : bool, optional
+        If True (and if iconsshow is True) the nodes that have children are marked as folders (default is True)
+    repeat_parent_as_first_child : bool, optional
+        If True each parent node will have a first children with its name (default is False)
+    disabled : list of str, optional
+        List of fullnames of the nodes to display as disabled (default is [])
+
+    Returns
+    -------
+    tuple (root, fullnames2id)
+        root is the dict of the root node of the tree and fullnames2id is a dict that converts the fullname of a node to its id
+    """
+    if len(rootName) == 0: rootName = 'Root'
+    nlevels = len(columnNames)
+    if iconscolumnNames is None: iconscolumnNames = [None] * nlevels
+    disabled = set(disabled)
+    
+    root = {'id': 1, 'name': rootName, 'fullname': rootName}
+    if (not iconroot is None) and (len(iconroot) > 0): root['icon'] = iconroot
+    if rootName in disabled: root['disabled'] = True
+    fullnames2id = {rootName: 1}
+    
+    # Strings of the levels and of the icons: only the first appearance of each combination of values is kept
+    data = pd.DataFrame({'c%d' % i: df[c].astype(str).values for i, c in enumerate(columnNames)})
+    for i, c in enumerate(iconscolumnNames):
+        if iconsshow and (not c is None) and (c in df.columns):
+            data['i%d' % i] = df[c].astype(str).values
+    data = data.drop_duplicates(subset=['c%d' % i for i in range(nlevels)])
+    
+    # Unique nodes of each level with the position of their first appearance
+    levels = []
+    fullname = pd.Series(rootName, index=data.index)
+    for i in range(nlevels):
+        parentfullname = fullname
+        fullname = parentfullname + separator + data['c%d' % i]
+        level = pd.DataFrame({'pos':            data.index.values,
+                              'level':          i,
+                              'name':           data['c%d' % i].values,
+                              'fullname':       fullname.values,
+                              'parentfullname': parentfullname.values,
+                              'parentname':     data['c%d' % (i-1)].values if i > 0 else rootName,
+                              'icon':           data['i%d' % i].values if ('i%d' % i) in data.columns else ''})
+        levels.append(level.drop_duplicates(subset='fullname'))
+    
+    # Nodes in order of creation (each parent is created before its children), removing the nodes having the same fullname
+    nodes = pd.concat(levels, ignore_index=True).sort_values(['pos','level'], kind='mergesort').drop_duplicates(subset='fullname')
+    nodes = nodes[nodes['fullname'] != rootName]
+    
+    # Bulk assignment of the ids: the first child of each parent is followed by the repetition of the parent (if repeat_parent_as_first_child is True)
+    firstchild = ~nodes['parentfullname'].duplicated().values
+    repeated   = firstchild & (nodes['parentname'].values != rootName) if repeat_parent_as_first_child else np.zeros(len(nodes), dtype=bool)
+    increments = 1 + repeated.astype(np.int64)
+    ids = 2 + np.cumsum(increments) - increments
+    
+    # Creation of the nested dict in a single pass
+    fullnamenodes = {rootName: root}
+    isfolder = iconsshow and iconsfolder
+    for nodeid, name, fullname, parentfullname, icon, first, repeat in zip(ids.tolist(), nodes['name'].tolist(), nodes['fullname'].tolist(),
+                                                                          nodes['parentfullname'].tolist(), nodes['icon'].tolist(),
+                                                                          firstchild.tolist(), repeated.tolist()):
+        parent = fullnamenodes[parentfullname]
+        elem = {'id': nodeid, 'name': name, 'fullname': fullname}
+        if len(icon) > 0: elem['icon'] = icon
+        if fullname in disabled: elem['disabled'] = True
+        fullnamenodes[fullname] = elem
+        fullnames2id[fullname] = nodeid
+        
+        if first:
+            parent['children'] = []
+            if repeat:
+                firstelem = {'id': nodeid + 1, 'name': parent['name'], 'fullname': parentfullname + separator + parent['name']}
+                if parentfullname in disabled: firstelem['disabled'] = True
+                fullnames2id[firstelem['fullname']] = nodeid + 1
+                parent['children'].append(firstelem)
+        parent['children'].append(elem)
+        if isfolder: parent['isfolder'] = True
+        
+    return root, fullnames2id
+    
+    
 # Given a node: returns 
 def calculateIdsOfLeaves(node, listofids=[]):
     if not 'children' in node:
@@ -1160,7 +1502,8 @@ def createTreeviewFromDF2Columns(df,
                                  item_height=24,
                                  font_size=15,
                                  icon_size=18,
-                                 checkbox_size=24):
+                                 checkbox_size=24,
+                                 lazy=False):
     """
     Create a two levels treeview form the strings contained in two columns of a Pandas DataFrame.
 
@@ -1242,6 +1585,8 @@ def createTreeviewFromDF2Columns(df,
         Icon size in pixels (default is 18)
     checkbox_size : int, optional
         Checkbox size in pixels (default is 24)
+    lazy : bool, optional
+        If True, the full tree is kept in Python and the children of each node are sent to the browser only when the node is opened for the first time, allowing for the display of very large trees (default is False)
 
     Returns
     -------
@@ -1276,30 +1621,15 @@ def createTreeviewFromDF2Columns(df,
        Treeview widget created from a Pandas DataFrame.
     """
 
-    nextid = 1          # id of the next node
-    fullnamenodes = {}  # All the nodes inserted, key is the fullname of the node
-    fullnames2id  = {}  # Convert a fullname to its id
-    
-    if len(rootName) == 0: rootName = 'Root'
-    root, nextid, fullnamenodes, fullnames2id = addNode(rootName,None,iconroot, iconsshow,iconsfolder,repeat_parent_as_first_child,rootName,separator,nextid,fullnamenodes,fullnames2id,disabled)
-
     # Create the tree from two columns of a df
-    for index,row in df.iterrows():
-        parentname = str(row[columnName1])
-        name       = str(row[columnName2])
-
-        parenticon = None
-        if iconsshow and (not iconscolumnName1 is None) and (iconscolumnName1 in row): parenticon = str(row[iconscolumnName1])
-        parent, nextid, fullnamenodes, fullnames2id = addNode(parentname, root, parenticon, iconsshow,iconsfolder,repeat_parent_as_first_child,rootName,separator,nextid,fullnamenodes,fullnames2id,disabled)
-        
-        icon = None
-        if iconsshow and (not iconscolumnName2 is None) and (iconscolumnName2 in row): icon = str(row[iconscolumnName2])
-        elem, nextid, fullnamenodes, fullnames2id = addNode(name,parent,icon, iconsshow,iconsfolder,repeat_parent_as_first_child,rootName,separator,nextid,fullnamenodes,fullnames2id,disabled)
-
+    root, fullnames2id = createTreeFromDF(df, [columnName1, columnName2], rootName=rootName, separator=separator,
+                                          iconscolumnNames=[iconscolumnName1, iconscolumnName2], iconroot=iconroot,
+                                          iconsshow=iconsshow, iconsfolder=iconsfolder,
+                                          repeat_parent_as_first_child=repeat_parent_as_first_child, disabled=disabled)
         
     # List of selected ids
     selectedids = []
-    if select_all: selectedids = calculateIdsOfLeaves(root)
+    if select_all: selectedids = calculateIdsOfLeaves(root, [])
     else:          selectedids = [fullnames2id[x] for x in selected if x in fullnames2id]
         
         
@@ -1323,7 +1653,7 @@ def createTreeviewFromDF2Columns(df,
                           color=color, selectable=selectable, activatable=activatable, active=activeid, open_on_click=open_on_click,
                           tooltips=tooltips, tooltips_chars=tooltips_chars,
                           iconsshow=iconsshow, iconscolor=iconscolor, icons_folder_opened=icons_folder_opened, icons_folder_closed=icons_folder_closed,
-                          item_height=item_height, font_size=font_size, icon_size=icon_size, checkbox_size=checkbox_size)
+                          item_height=item_height, font_size=font_size, icon_size=icon_size, checkbox_size=checkbox_size, lazy=lazy)
             
     treehtml = v.Html(tag='div',height=height, children=[tree], style_='overflow: hidden;')
     treecard = v.Card(width=width, height=height, elevation=elevation, children=[treehtml],
@@ -1376,7 +1706,8 @@ def createTreeviewFromDF3Columns(df,
                                  item_height=24,
                                  font_size=15,
                                  icon_size=18,
-                                 checkbox_size=24):
+                                 checkbox_size=24,
+                                 lazy=False):
     """
     Create a three levels treeview form the strings contained in three columns of a Pandas DataFrame.
 
@@ -1462,6 +1793,8 @@ def createTreeviewFromDF3Columns(df,
         Icon size in pixels (default is 18)
     checkbox_size : int, optional
         Checkbox size in pixels (default is 24)
+    lazy : bool, optional
+        If True, the full tree is kept in Python and the children of each node are sent to the browser only when the node is opened for the first time, allowing for the display of very large trees (default is False)
 
     Returns
     -------
@@ -1499,35 +1832,15 @@ def createTreeviewFromDF3Columns(df,
 
     
     
-    nextid = 1          # id of the next node
-    fullnamenodes = {}  # All the nodes inserted, key is the fullname of the node
-    fullnames2id  = {}  # Convert a fullname to its id
-    
-    if len(rootName) == 0: rootName = 'Root'
-    root, nextid, fullnamenodes, fullnames2id = addNode(rootName,None,iconroot, iconsshow,iconsfolder,repeat_parent_as_first_child,rootName,separator,nextid,fullnamenodes,fullnames2id,disabled)
-
     # Create the tree from 3 columns of a df
-    for index,row in df.iterrows():
-        parentname = str(row[columnName1])
-        name       = str(row[columnName2])
-        subname    = str(row[columnName3])
-
-        parenticon = None
-        if iconsshow and (not iconscolumnName1 is None) and (iconscolumnName1 in row): parenticon = str(row[iconscolumnName1])
-        parent, nextid, fullnamenodes, fullnames2id = addNode(parentname, root, parenticon, iconsshow,iconsfolder,repeat_parent_as_first_child,rootName,separator,nextid,fullnamenodes,fullnames2id,disabled)
-        
-        icon = None
-        if iconsshow and (not iconscolumnName2 is None) and (iconscolumnName2 in row): icon = str(row[iconscolumnName2])
-        elem, nextid, fullnamenodes, fullnames2id = addNode(name,parent,icon, iconsshow,iconsfolder,repeat_parent_as_first_child,rootName,separator,nextid,fullnamenodes,fullnames2id,disabled)
-
-        icon = None
-        if iconsshow and (not iconscolumnName3 is None) and (iconscolumnName3 in row): icon = str(row[iconscolumnName3])
-        elem, nextid, fullnamenodes, fullnames2id = addNode(subname,elem,icon, iconsshow,iconsfolder,repeat_parent_as_first_child,rootName,separator,nextid,fullnamenodes,fullnames2id,disabled)
-        
+    root, fullnames2id = createTreeFromDF(df, [columnName1, columnName2, columnName3], rootName=rootName, separator=separator,
+                                          iconscolumnNames=[iconscolumnName1, iconscolumnName2, iconscolumnName3], iconroot=iconroot,
+                                          iconsshow=iconsshow, iconsfolder=iconsfolder,
+                                          repeat_parent_as_first_child=repeat_parent_as_first_child, disabled=disabled)
         
     # List of selected ids
     selectedids = []
-    if select_all: selectedids = calculateIdsOfLeaves(root)
+    if select_all: selectedids = calculateIdsOfLeaves(root, [])
     else:          selectedids = [fullnames2id[x] for x in selected if x in fullnames2id]
         
         
@@ -1551,7 +1864,7 @@ def createTreeviewFromDF3Columns(df,
                           color=color, selectable=selectable, activatable=activatable, active=activeid, open_on_click=open_on_click,
                           tooltips=tooltips, tooltips_chars=tooltips_chars,
                           iconsshow=iconsshow, iconscolor=iconscolor, icons_folder_opened=icons_folder_opened, icons_folder_closed=icons_folder_closed,
-                          item_height=item_height, font_size=font_size, icon_size=icon_size, checkbox_size=checkbox_size)
+                          item_height=item_height, font_size=font_size, icon_size=icon_size, checkbox_size=checkbox_size, lazy=lazy)
     
     treehtml = v.Html(tag='div',height=height, children=[tree], style_='overflow: hidden;')
     treecard = v.Card(width=width, height=height, elevation=elevation, children=[treehtml],
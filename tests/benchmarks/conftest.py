@@ -0,0 +1,76 @@
+import pytest
+from pathlib import Path
+import tracemalloc
+import json
+import sys
+
+pytest.importorskip('pytest_benchmark')
+
+# The benchmarks use the sources of the repository, not an installed version of vois
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from vois import svgWriter
+
+from . import inputs
+
+
+# Returns the size of the output of a benchmarked function
+def outputSize(result, svgsizes):
+    if isinstance(result, str):
+        return len(result.encode('utf-8'))
+    if isinstance(result, (bytes, bytearray)):
+        return len(result)
+    if isinstance(result, (list, tuple, dict)):
+        return len(json.dumps(result, default=str).encode('utf-8'))
+
+    # Widgets: size of the SVG drawings built during the call plus the size of the items sent to the browser by the treeviews
+    size = sum(svgsizes)
+    stack = [result]
+    while len(stack) > 0:
+        w = stack.pop()
+        if hasattr(w, 'items') and isinstance(getattr(w, 'items'), list):
+            size += len(json.dumps(w.items, default=str).encode('utf-8'))
+        stack += [c for c in getattr(w, 'children', []) if not isinstance(c, str)]
+    return size
+
+
+@pytest.fixture
+def measure(benchmark, monkeypatch):
+    """
+    Benchmark a function measuring the execution time (pytest-benchmark), the peak memory allocated by a single call (tracemalloc) and the size of the output.
+    The peak memory and the output size are stored in the extra_info of the benchmark, so they are saved by --benchmark-autosave and shown by --benchmark-compare.
+    """
+    svgsizes = []
+    getvalue = svgWriter.svgWriter.getvalue
+
+    def recordingGetvalue(self, *args, **kwargs):
+        value = getvalue(self, *args, **kwargs)
+        svgsizes.append(len(value.encode('utf-8')))
+        return value
+
+    monkeypatch.setattr(svgWriter.svgWriter, 'getvalue', recordingGetvalue)
+
+    def run(func, *args, **kwargs):
+        result = benchmark(func, *args, **kwargs)
+
+        svgsizes.clear()
+        tracemalloc.start()
+        try:
+            result = func(*args, **kwargs)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        benchmark.extra_info['peak_memory'] = peak
+        benchmark.extra_info['output_size'] = outputSize(result, svgsizes)
+        return result
+
+    return run
+
+
+@pytest.fixture(scope='session')
+def geojsonFiles():
+    """
+    Dict having as key the name of a geojson file packaged with vois and as value its content as a string
+    """
+    return { path.stem: path.read_text(encoding='utf-8') for path in sorted(inputs.DATA_FOLDER.glob('*.geojson')) }
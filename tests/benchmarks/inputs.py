@@ -0,0 +1,41 @@
+"""Inputs of the benchmarks: packaged geojson files scaled to a number of features and synthetic DataFrames"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import json
+
+
+# Folder of the geojson files packaged with vois
+DATA_FOLDER = Path(__file__).resolve().parents[2] / 'src' / 'vois' / 'data'
+
+# Scaling sizes of the inputs
+SIZES = [10, 100, 1000]
+
+
+# Returns a geojson string containing the features of a geojson string repeated to reach a number of features
+def scaledGeojson(geojson, size):
+    data = json.loads(geojson)
+    features = data['features']
+    data['features'] = [features[i % len(features)] for i in range(size)]
+    return json.dumps(data)
+
+
+# Returns a synthetic DataFrame with a 'label' column of unique codes and a 'value' column of random values
+def syntheticDataFrame(size, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = ['C%05d' % i for i in range(size)]
+    return pd.DataFrame({ 'code': codes, 'label': codes, 'value': rng.normal(100.0, 25.0, size) }).set_index('code')
+
+
+# Returns a synthetic DataFrame with three columns of hierarchical names (size leaves)
+def syntheticHierarchy(size, branching=10):
+    names = ['L%05d' % i for i in range(size)]
+    return pd.DataFrame({ 'level1': ['A%d' % (i // (branching*branching)) for i in range(size)],
+                          'level2': ['B%d' % (i // branching) for i in range(size)],
+                          'level3': names })
+
+
+# Returns a synthetic DataFrame of random values in [0,1] having nrows rows and ncols columns
+def syntheticMatrix(nrows, ncols, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.random((nrows, ncols)), index=['Row %d' % i for i in range(nrows)], columns=['Column %d' % i for i in range(ncols)])
@@ -0,0 +1,28 @@
+import pytest
+
+from vois import colors
+
+from . import inputs
+
+
+PALETTE = ['#0d0887', '#46039f', '#7201a8', '#9c179e', '#bd3786', '#d8576b', '#ed7953', '#fb9f3a', '#fdca26', '#f0f921']
+
+
+class Test_colorInterpolator:
+
+    @pytest.mark.parametrize('size', [size*10 for size in inputs.SIZES])
+    def test_GetColor(self, measure, size):
+        values = list(inputs.syntheticDataFrame(size)['value'])
+
+        def getColors():
+            c = colors.colorInterpolator(PALETTE, 0.0, 200.0)
+            return [c.GetColor(value) for value in values]
+
+        result = measure(getColors)
+        assert len(result) == size
+
+    @pytest.mark.parametrize('size', inputs.SIZES)
+    def test_GetColors(self, measure, size):
+        c = colors.colorInterpolator(PALETTE, 0.0, 200.0)
+        result = measure(c.GetColors, size)
+        assert len(result) == size
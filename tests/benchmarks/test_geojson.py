@@ -0,0 +1,37 @@
+import pytest
+
+from vois import geojsonUtils
+
+from . import inputs
+
+
+FILES = [path.stem for path in sorted(inputs.DATA_FOLDER.glob('*.geojson'))]
+
+
+class Test_geojsonUtils:
+
+    @pytest.mark.parametrize('name', FILES)
+    def test_geojsonJson(self, measure, geojsonFiles, name):
+        data = measure(geojsonUtils.geojsonJson, geojsonFiles[name])
+        assert data['type'] == 'FeatureCollection'
+
+    @pytest.mark.parametrize('name', FILES)
+    def test_geojsonAttributes(self, measure, geojsonFiles, name):
+        measure(geojsonUtils.geojsonAttributes, geojsonFiles[name])
+
+    @pytest.mark.parametrize('size', [size*10 for size in inputs.SIZES])
+    def test_geojsonAll(self, measure, geojsonFiles, size):
+        geojson = inputs.scaledGeojson(geojsonFiles['ne_110m_admin_0_countries'], size)
+        values = measure(geojsonUtils.geojsonAll, geojson, 'ISO_A2')
+        assert len(values) == size
+
+    @pytest.mark.parametrize('size', [size*10 for size in inputs.SIZES])
+    def test_geojsonJoin(self, measure, geojsonFiles, size):
+        geojson = inputs.scaledGeojson(geojsonFiles['ne_110m_admin_0_countries'], size)
+        keytovalue = { code: i for i, code in enumerate(geojsonUtils.geojsonAll(geojson, 'ISO_A2')) }
+        measure(geojsonUtils.geojsonJoin, geojson, 'ISO_A2', 'value', keytovalue, innerMode=True)
+
+    @pytest.mark.parametrize('size', [size*10 for size in inputs.SIZES])
+    def test_geojsonFilter(self, measure, geojsonFiles, size):
+        geojson = inputs.scaledGeojson(geojsonFiles['landuse'], size)
+        measure(geojsonUtils.geojsonFilter, geojson, 'fclass', ['residential', 'forest'])
@@ -0,0 +1,49 @@
+import pytest
+
+from vois import svgMap, svgUtils, svgHeatmap, svgBarChart, svgPackedCirclesChart
+
+from . import inputs
+
+
+class Test_svgMap:
+
+    @pytest.mark.parametrize('size', [5, 20, len(svgMap.country_codes)])
+    def test_svgMapEurope(self, measure, size):
+        df = inputs.syntheticDataFrame(size)
+        df.index = svgMap.country_codes[:size]
+        svg = measure(svgMap.svgMapEurope, df, codes_selected=svgMap.country_codes[:size:5])
+        assert svg.endswith('</svg>')
+
+
+class Test_svgUtils:
+
+    @pytest.mark.parametrize('size', inputs.SIZES)
+    def test_graduatedLegend(self, measure, size):
+        df = inputs.syntheticDataFrame(size).reset_index()
+        svg = measure(svgUtils.graduatedLegend, df, code_column='code', codes_selected=list(df['code'][:3]), legendtitle='Title', legendunits='Units')
+        assert svg.endswith('</svg>')
+
+
+class Test_svgHeatmap:
+
+    @pytest.mark.parametrize('size', inputs.SIZES[:-1] + [200])
+    def test_heatmapChart(self, measure, size):
+        df = inputs.syntheticMatrix(size, 20)
+        measure(svgHeatmap.heatmapChart, df)
+
+
+class Test_svgBarChart:
+
+    @pytest.mark.parametrize('size', inputs.SIZES)
+    def test_svgBarChart(self, measure, size):
+        df = inputs.syntheticDataFrame(size)
+        measure(svgBarChart.svgBarChart, title='Benchmark', names=list(df.index), values=list(df['value']), showvalues=True)
+
+
+class Test_svgPackedCirclesChart:
+
+    @pytest.mark.parametrize('size', [10, 50, 100])
+    def test_circlify(self, measure, size):
+        values = sorted(inputs.syntheticDataFrame(size)['value'].abs() + 1.0, reverse=True)
+        circles = measure(svgPackedCirclesChart.circlify, values)
+        assert len(circles) == size
@@ -0,0 +1,26 @@
+import pytest
+
+from vois.vuetify import treeview
+
+from . import inputs
+
+
+class Test_treeview:
+
+    @pytest.mark.parametrize('size', [size*10 for size in inputs.SIZES])
+    def test_createTreeFromDF(self, measure, size):
+        df = inputs.syntheticHierarchy(size)
+        root, fullnames2id = measure(treeview.createTreeFromDF, df, ['level1', 'level2', 'level3'])
+        assert len(fullnames2id) > size
+
+    @pytest.mark.parametrize('lazy', [False, True])
+    @pytest.mark.parametrize('size', [size*10 for size in inputs.SIZES])
+    def test_createTreeviewFromList(self, measure, size, lazy):
+        df = inputs.syntheticHierarchy(size)
+        names = list(df['level1'] + '.' + df['level2'] + '.' + df['level3'])
+        measure(treeview.createTreeviewFromList, names, lazy=lazy)
+
+    @pytest.mark.parametrize('size', [size*10 for size in inputs.SIZES])
+    def test_createTreeviewFromDF3Columns(self, measure, size):
+        df = inputs.syntheticHierarchy(size)
+        measure(treeview.createTreeviewFromDF3Columns, df, 'level1', 'level2', 'level3')
@@ -0,0 +1,17 @@
+import pytest
+from pathlib import Path
+import sys
+
+# The tests use the sources of the repository, not an installed version of vois
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+# Folder of the data files packaged with vois
+DATA_FOLDER = Path(__file__).resolve().parents[2] / 'src' / 'vois' / 'data'
+
+
+@pytest.fixture(scope='session')
+def dataFolder():
+    """
+    Path of the folder containing the data files packaged with vois (geojson files, etc.)
+    """
+    return DATA_FOLDER
@@ -0,0 +1,97 @@
+import pytest
+
+from vois.vuetify import bdapCache, layers, basemaps
+
+
+# Local stand-in for the jeodpp.inter module, counting the calls made to the BDAP server
+class FakeCollection:
+
+    def __init__(self, inter, *args):
+        self.inter = inter
+        self.parameters = {}
+
+    def parameter(self, name, value):
+        self.parameters[name] = value
+        return self
+
+    def process(self):
+        self.inter.processed.append(dict(self.parameters))
+        return self
+
+    def toLayer(self):
+        return 'procid%d' % len(self.inter.processed)
+
+    def listBasemaps(self):
+        self.inter.listed += 1
+        return ['OpenStreetMap.Mapnik', 'Esri.WorldImagery', 'Stadia.Outdoors']
+
+
+class FakeInter:
+
+    def __init__(self):
+        self.processed = []
+        self.listed = 0
+
+    def Collection(self, *args):
+        return FakeCollection(self, *args)
+
+    def ImageCollection(self, *args):
+        return FakeCollection(self, *args)
+
+
+@pytest.fixture
+def inter(monkeypatch, tmp_path):
+    fake = FakeInter()
+    monkeypatch.setattr(layers,    'inter', fake, raising=False)
+    monkeypatch.setattr(basemaps,  'inter', fake, raising=False)
+    monkeypatch.setattr(bdapCache, 'cache_file', None)
+    bdapCache.clear()
+    yield fake
+    bdapCache.clear()
+
+
+class Test_bdapCache:
+
+    def test_parametersKey(self):
+        assert bdapCache.parametersKey({'a': 1, 'b': [1, 2]}) == bdapCache.parametersKey({'b': [1, 2], 'a': 1})
+        assert bdapCache.parametersKey({'a': 1}) != bdapCache.parametersKey({'a': 2})
+
+    def test_tileLayer(self, inter):
+        layer1 = layers.interaproLayer('a', file='/data/a.tif', epsg=4326, colorscheme='Viridis')
+        layer2 = layers.interaproLayer('b', file='/data/a.tif', epsg=4326, colorscheme='Viridis')
+        layer3 = layers.interaproLayer('c', file='/data/b.tif', epsg=4326, colorscheme='Viridis')
+
+        url1 = layer1.tileLayer().url
+        assert layer1.tileLayer().url == url1
+        assert layer2.tileLayer().url == url1
+        assert len(inter.processed) == 1
+
+        url3 = layer3.tileLayer().url
+        assert url3 != url1
+        assert len(inter.processed) == 2
+
+        layer1.scalemax = 10.0
+        layer1.tileLayer()
+        assert len(inter.processed) == 3
+
+    def test_basemapList(self, inter):
+        names = basemaps.basemapList()
+        assert basemaps.basemapList() == names
+        basemaps.basemapList(addBDAPbasemaps=False, removeBasemaps=['Esri.WorldImagery'])
+        assert inter.listed == 1
+        assert 'OpenStreetMap.Mapnik' in names
+        assert not 'Stadia.Outdoors' in names
+
+    def test_cacheFile(self, inter, monkeypatch, tmp_path):
+        monkeypatch.setattr(bdapCache, 'cache_file', str(tmp_path / 'bdap.json'))
+        layer = layers.interaproLayer('a', file='/data/a.tif')
+        url = layer.tileLayer().url
+
+        # Another kernel: empty memory, same cache_file
+        bdapCache.clear()
+        assert layer.tileLayer().url == url
+        assert len(inter.processed) == 1
+
+        bdapCache.clear(disk=True)
+        layer.tileLayer()
+        assert len(inter.processed) == 2
@@ -0,0 +1,121 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from vois.vuetify import datatable
+
+
+# DataFrame of 25 countries with repeated and missing values
+@pytest.fixture
+def df():
+    codes  = ['C%02d' % i for i in range(25)]
+    values = [float(i % 5) for i in range(25)]
+    values[3]  = np.nan
+    values[17] = np.nan
+    names  = ['Name %d%s' % (i, ' island' if i % 7 == 0 else '') for i in range(25)]
+    return pd.DataFrame({'code': codes, 'value': values, 'name': names}).set_index('code')
+
+
+# Set the pagination and sorting options of a server-side datatable and returns the keys of the displayed rows
+def page(d, page=1, itemsperpage=10, sortby=[], sortdesc=[]):
+    d.options = {'page': page, 'itemsPerPage': itemsperpage, 'sortBy': sortby, 'sortDesc': sortdesc}
+    return [item['code'] for item in d.items]
+
+
+# Expected keys of the rows sorted with a stable sort that puts the missing values at the end
+def expected(df, column, descending):
+    return list(df.sort_values(column, ascending=not descending, kind='mergesort', na_position='last').index)
+
+
+class Test_datatable:
+
+    def test_serverside_paging(self, df):
+        d = datatable.datatable(data=df, serverside=True, itemsperpage=10)
+        assert d.total == 25
+        assert [item['code'] for item in d.items] == list(df.index[:10])
+        assert page(d, page=3) == list(df.index[20:])
+        assert page(d, itemsperpage=-1) == list(df.index)
+
+    @pytest.mark.parametrize('descending', [False, True])
+    def test_serverside_sort(self, df, descending):
+        d = datatable.datatable(data=df, serverside=True)
+        keys = page(d, page=1, sortby=['value'], sortdesc=[descending]) + page(d, page=2, sortby=['value'], sortdesc=[descending]) + \
+               page(d, page=3, sortby=['value'], sortdesc=[descending])
+        assert keys == expected(df, 'value', descending)
+        assert keys[-2:] == ['C03', 'C17']
+
+    def test_serverside_search(self, df):
+        d = datatable.datatable(data=df, serverside=True, searchshow=True)
+        d.search = 'ISLAND'
+        d.debouncer.flush()
+        keys = [code for code, name in zip(df.index, df['name']) if 'island' in name]
+        assert d.total == len(keys)
+        assert [item['code'] for item in d.items] == keys
+
+        # The search is combined with the sorting and the pagination
+        assert page(d, itemsperpage=2, sortby=['value'], sortdesc=[True]) == [k for k in expected(df, 'value', True) if k in keys][:2]
+
+        # The first page is displayed when the search changes
+        page(d, page=2, itemsperpage=2)
+        d.search = ''
+        d.debouncer.flush()
+        assert d.options['page'] == 1
+        assert d.total == 25
+
+    @pytest.mark.parametrize('serverside', [False, True])
+    def test_appendRows(self, df, serverside):
+        d = datatable.datatable(data=df.head(5), serverside=serverside)
+        sent = []
+        d.send = sent.append
+        d.appendRows(df.iloc[5:8])
+        if serverside:
+            assert d.total == 8
+            assert [item['code'] for item in d.items] == list(df.index[:8])
+        else:
+            assert [item['code'] for item in d.records] == list(df.index[:8])
+            assert len(d.items) == 5
+            assert d.version == 1
+            assert sent == [{'method': 'appendrows', 'args': [[{'code': 'C05', 'value': 0.0, 'name': 'Name 5'},
+                                                              {'code': 'C06', 'value': 1.0, 'name': 'Name 6'},
+                                                              {'code': 'C07', 'value': 2.0, 'name': 'Name 7 island'}]]}]
+
+            # A view rendered after the update receives all the current rows
+            d.vue_fetchrows()
+            assert sent[-1] == {'method': 'setrows', 'args': [d.records]}
+
+    @pytest.mark.parametrize('serverside', [False, True])
+    def test_updateRows(self, df, serverside):
+        d = datatable.datatable(data=df, serverside=serverside)
+        sent = []
+        d.send = sent.append
+
+        # The index of the DataFrame passed has a different name from the index of the datatable
+        changes = pd.DataFrame({'value': [100.0, 200.0]}, index=pd.Index(['C01', 'C04'], name='key'))
+        d.updateRows(changes)
+
+        rows = d.items if serverside else d.records
+        byCode = {item['code']: item for item in rows}
+        assert byCode['C01']['value'] == 100.0 and byCode['C01']['name'] == 'Name 1'
+        assert byCode['C04']['value'] == 200.0
+        assert byCode['C02']['value'] == 2.0
+        if not serverside:
+            assert sent == [{'method': 'updaterows', 'args': [[{'code': 'C01', 'value': 100.0}, {'code': 'C04', 'value': 200.0}]]}]
+
+        # The sorting reflects the updated values
+        if serverside:
+            assert page(d, itemsperpage=2, sortby=['value'], sortdesc=[True]) == ['C04', 'C01']
+
+    @pytest.mark.parametrize('serverside', [False, True])
+    def test_deleteRows(self, df, serverside):
+        d = datatable.datatable(data=df, serverside=serverside)
+        sent = []
+        d.send = sent.append
+        d.deleteRows(['C00', 'C10', 'missing'])
+        keys = [k for k in df.index if not k in ['C00', 'C10']]
+        if serverside:
+            assert d.total == 23
+            assert page(d, itemsperpage=-1) == keys
+        else:
+            assert [item['code'] for item in d.records] == keys
+            assert d.version == 1
+            assert sent == [{'method': 'deleterows', 'args': [['C00', 'C10', 'missing']]}]
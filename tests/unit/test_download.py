@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import pandas as pd
+import zipfile
+import gzip
+import json
+import io
+
+from vois import download
+
+
+@pytest.fixture
+def df():
+    n = 2500
+    return pd.DataFrame({'id':      np.arange(n),
+                         'value':   np.linspace(0.0, 1.0, n),
+                         'country': ['IT', 'FR', 'Côte d’Ivoire', 'DE', 'ES'] * (n // 5)})
+
+
+@pytest.fixture
+def featureCollection():
+    return {'type': 'FeatureCollection', 'features': [{'type': 'Feature', 'properties': {'id': i, 'name': 'é%d' % i},
+                                                       'geometry': {'type': 'Point', 'coordinates': [float(i), -float(i)]}} for i in range(250)]}
+
+
+# Returns the decompressed content of an export
+def content(chunks, compression):
+    data = b''.join(chunks)
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'zip':
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert zf.namelist() == ['data.out']
+            return zf.read('data.out')
+    return data
+
+
+class Test_exportChunks:
+
+    @pytest.mark.parametrize('compression', [None, 'gzip', 'zip'])
+    def test_csv(self, df, compression):
+        chunks = list(download.exportChunks(df, 'csv', compression, chunkrows=1000, memberName='data.out'))
+        assert len(chunks) > 1
+        result = pd.read_csv(io.BytesIO(content(chunks, compression)))
+        pd.testing.assert_frame_equal(result, df)
+
+    @pytest.mark.parametrize('compression', [None, 'gzip', 'zip'])
+    def test_parquet(self, df, compression):
+        pytest.importorskip('pyarrow')
+        chunks = list(download.exportChunks(df, 'parquet', compression, chunkrows=1000, memberName='data.out'))
+        result = pd.read_parquet(io.BytesIO(content(chunks, compression)))
+        pd.testing.assert_frame_equal(result, df)
+
+        import pyarrow.parquet as pq
+        assert pq.ParquetFile(io.BytesIO(content(chunks, compression))).num_row_groups == 3
+
+    @pytest.mark.parametrize('compression', [None, 'gzip', 'zip'])
+    def test_geojson(self, featureCollection, compression):
+        chunks = download.exportChunks(featureCollection, 'geojson', compression, chunkrows=100, memberName='data.out')
+        assert json.loads(content(chunks, compression).decode('utf-8')) == featureCollection
+
+    def test_emptyDataFrame(self, df):
+        result = pd.read_csv(io.BytesIO(b''.join(download.exportChunks(df.iloc[:0]))))
+        assert list(result.columns) == list(df.columns) and len(result) == 0
+
+    def test_exportFormat(self):
+        assert download.exportFormat('data.csv')         == ('csv',     None)
+        assert download.exportFormat('data.CSV.GZ')      == ('csv',     'gzip')
+        assert download.exportFormat('data.parquet.zip') == ('parquet', 'zip')
+        assert download.exportFormat('data.geojson.gz')  == ('geojson', 'gzip')
+        with pytest.raises(ValueError):
+            download.exportChunks(pd.DataFrame(), 'xlsx')
+        with pytest.raises(ValueError):
+            download.exportChunks(pd.DataFrame(), 'csv', 'bz2')
@@ -0,0 +1,109 @@
+import pytest
+import json
+import random
+
+from vois.geo import spatialIndex
+
+
+# Returns the list of segments ((x0,y0),(x1,y1)) of the polygon rings of a feature
+def ringSegments(feature):
+    segments = []
+    for polygon in feature['geometry']['coordinates']:
+        for ring in polygon:
+            segments.extend(zip(ring[:-1], ring[1:]))
+    return segments
+
+
+# Brute-force even-odd test of a point against all the rings of a feature
+def containsPoint(segments, x, y):
+    inside = False
+    for (x0, y0), (x1, y1) in segments:
+        if (y0 > y) != (y1 > y) and x < (x1 - x0) * (y - y0) / (y1 - y0) + x0:
+            inside = not inside
+    return inside
+
+
+# Brute-force test of a segment against a box (Liang-Barsky clipping)
+def segmentInBox(segment, xmin, ymin, xmax, ymax):
+    (x0, y0), (x1, y1) = segment
+    dx, dy = x1 - x0, y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in [(-dx, x0 - xmin), (dx, xmax - x0), (-dy, y0 - ymin), (dy, ymax - y0)]:
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0: t0 = max(t0, t)
+            else:     t1 = min(t1, t)
+            if t0 > t1:
+                return False
+    return True
+
+
+# FeatureCollection of a geojson file packaged with vois and list of the segments of the rings of each of its features
+@pytest.fixture(scope='module', params=['ne_110m_admin_0_countries', 'ItalyProvinces', 'example'])
+def collection(request, dataFolder):
+    fc = json.loads((dataFolder / (request.param + '.geojson')).read_text(encoding='utf-8'))
+    return fc, [ringSegments(f) for f in fc['features']]
+
+
+# Returns the bounding box of a list of features
+def extent(segments):
+    xs = [p[0] for s in segments for seg in s for p in seg]
+    ys = [p[1] for s in segments for seg in s for p in seg]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+# Random positions: half uniformly distributed in the extent and half close to the edges of random features
+def randomPositions(segments, count, seed):
+    xmin, ymin, xmax, ymax = extent(segments)
+    jitter = max(xmax - xmin, ymax - ymin) / 1000.0
+    rnd = random.Random(seed)
+    positions = []
+    for i in range(count):
+        if i % 2 == 0:
+            positions.append((rnd.uniform(xmin, xmax), rnd.uniform(ymin, ymax)))
+        else:
+            (x0, y0), (x1, y1) = rnd.choice(rnd.choice(segments))
+            positions.append(((x0 + x1) / 2.0 + rnd.uniform(-jitter, jitter), (y0 + y1) / 2.0 + rnd.uniform(-jitter, jitter)))
+    return positions
+
+
+class Test_spatialIndex:
+
+    def test_identify(self, collection):
+        fc, segments = collection
+        index = spatialIndex.spatialIndex(fc)
+        for x, y in randomPositions(segments, 60, 1):
+            expected = [k for k, s in enumerate(segments) if containsPoint(s, x, y)]
+            assert index.identify(x, y) == expected
+
+    def test_queryBox(self, collection):
+        fc, segments = collection
+        index = spatialIndex.spatialIndex(fc)
+        xmin, ymin, xmax, ymax = extent(segments)
+        rnd = random.Random(2)
+        for x, y in randomPositions(segments, 20, 2):
+            w = rnd.uniform(0.0, (xmax - xmin) / 20.0)
+            h = rnd.uniform(0.0, (ymax - ymin) / 20.0)
+            expected = [k for k, s in enumerate(segments) if any(segmentInBox(seg, x, y, x + w, y + h) for seg in s) or containsPoint(s, x, y)]
+            assert index.queryBox(x, y, x + w, y + h) == expected
+
+    def test_pointsAndLines(self):
+        fc = {'type': 'FeatureCollection', 'features': [
+            {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [1.0, 1.0]}},
+            {'type': 'Feature', 'geometry': {'type': 'LineString', 'coordinates': [[0.0, 0.0], [10.0, 0.0]]}},
+            {'type': 'Feature', 'geometry': {'type': 'Polygon', 'coordinates': [[[2.0, 2.0], [6.0, 2.0], [6.0, 6.0], [2.0, 6.0], [2.0, 2.0]]]}},
+            {'type': 'Feature', 'geometry': None},
+        ]}
+        index = spatialIndex.spatialIndex(fc)
+        assert index.identify(1.05, 1.0) == []
+        assert index.identify(1.05, 1.0, tolerance=0.1) == [0]
+        assert index.identify(5.0, 0.05, tolerance=0.1) == [1]
+        assert index.identify(4.0, 4.0) == [2]
+        assert index.identify(6.05, 4.0, tolerance=0.1) == [2]
+        assert index.queryBox(0.5, 0.5, 1.5, 1.5) == [0]
+        assert index.queryBox(3.0, -1.0, 4.0, 3.0) == [1, 2]
+        assert index.queryBox(3.0, 3.0, 4.0, 4.0) == [2]    # Box inside the polygon
+        assert index.queryBox(20.0, 20.0, 30.0, 30.0) == []
@@ -0,0 +1,121 @@
+import pytest
+
+from vois.vuetify import treeview
+
+
+NAMES = ['A', 'A.1', 'A.1.1', 'A.1.2', 'A.2', 'B', 'B.1', 'B.2', 'C']
+
+
+# Returns the CustomTreeview instance and the treeviewOperations instance of a treeview created from a list of names
+def createTree(**kwargs):
+    treecard = treeview.createTreeviewFromList(NAMES, rootName='Root', **kwargs)
+    top = treeview.treeviewOperations(treecard)
+    return top.treeview, top
+
+
+# Walk the nodes of a tree and returns a dict fullname --> (parent fullname, list of children fullnames)
+def walk(items):
+    result = {}
+    stack = [(node, None) for node in items]
+    while len(stack) > 0:
+        node, parent = stack.pop()
+        result[node['fullname']] = (parent, [n['fullname'] for n in node.get('children', [])])
+        stack.extend([(n, node['fullname']) for n in node.get('children', [])])
+    return result
+
+
+class Test_CustomTreeview:
+
+    def test_index(self):
+        tree, top = createTree()
+        expected = walk(tree.items)
+        assert set(top.fullname2id) == set(expected)
+        for fullname, (parent, children) in expected.items():
+            nodeid = top.fullname2id[fullname]
+            assert top.id2fullname[nodeid] == fullname
+            assert tree.id2node[nodeid]['fullname'] == fullname
+            if parent is None: assert not nodeid in top.id2parentid
+            else:              assert top.id2fullname[top.id2parentid[nodeid]] == parent
+            assert top.getChildren(fullname) == children
+        assert top.getFirstChildFullname('A') == 'A.1'
+        assert top.getFirstChildFullname('C') is None
+        assert tree.id2depth[top.fullname2id['A.1.2']] == 3
+
+    def test_index_setItems(self):
+        tree, top = createTree()
+        tree.setItems([{'id': 1, 'name': 'Root', 'fullname': 'Root', 'children': [{'id': 2, 'name': 'X', 'fullname': 'X'}]}])
+        assert top.fullname2id == {'Root': 1, 'X': 2}
+        assert top.getChildren('Root') == ['X']
+
+    def test_expandSelectionToParents(self):
+        changes = []
+        tree, top = createTree(select_all=False, on_change=changes.append)
+        ids = top.fullname2id
+        tree.vue_change_selection([ids['A.1.1'], ids['A.1.2'], ids['B.1']])
+        assert changes[-1] == ['A.1', 'A.1.1', 'A.1.2', 'B.1']
+
+        tree.vue_change_selection([ids['A.1.1'], ids['A.1.2'], ids['A.2'], ids['B.1'], ids['B.2'], ids['C']])
+        assert changes[-1] == sorted(NAMES + ['Root'])
+
+    def test_selection(self):
+        tree, top = createTree(select_all=False, selected=['A.2', 'C'])
+        assert sorted(top.getSelected()) == ['A.2', 'C']
+        top.setSelected(['B.1'])
+        assert top.getSelected() == ['B.1']
+
+
+class Test_lazyTreeview:
+
+    def test_initialItems(self):
+        tree, top = createTree(lazy=True)
+        sent = walk(tree.items)
+        assert sent['Root'][1] == ['A', 'B', 'C']     # Root is opened by default
+        assert sent['A'][1] == [] and sent['B'][1] == []
+        assert not 'A.1' in sent
+        assert set(top.fullname2id) == set(NAMES + ['Root'])    # The index covers the full tree
+
+    def test_loadchildren(self):
+        tree, top = createTree(lazy=True, select_all=True)
+        sent = []
+        tree.send = sent.append
+        ida = top.fullname2id['A']
+        tree.vue_loadchildren(ida)
+
+        method, (nodeid, children, selected) = sent[-1]['method'], sent[-1]['args']
+        assert method == 'loadedchildren' and nodeid == ida
+        assert [c['fullname'] for c in children] == ['A.1', 'A.2']
+        assert children[0]['children'] == []    # A.1 is a folder not yet loaded
+        assert 'children' not in children[1]
+        assert top.fullname2id['A.1'] in selected and top.fullname2id['A.2'] in selected
+        assert [c['fullname'] for c in tree.shallownodes[ida]['children']] == ['A.1', 'A.2']
+
+        # Unknown nodes return no children
+        tree.vue_loadchildren(12345)
+        assert sent[-1]['args'][:2] == [12345, []]
+
+    def test_selectionOfNodesNotLoaded(self):
+        changes = []
+        tree, top = createTree(lazy=True, select_all=True, on_change=changes.append)
+        assert sorted(top.getSelected()) == sorted(NAMES + ['Root'])
+
+        # The user unchecks the folder B, whose children have not been sent to the browser
+        ids = top.fullname2id
+        tree.vue_change_selection([x for x in tree.selected if x != ids['B'] and x != ids['Root']])
+        assert changes[-1] == sorted(['A', 'A.1', 'A.1.1', 'A.1.2', 'A.2', 'C'])
+
+        # Selecting a folder not loaded selects all its leaves
+        top.setSelected(['A.1', 'B.2'])
+        assert top.getSelected() == ['A.1', 'A.1.1', 'A.1.2', 'B.2']
+
+    def test_setOpenedAndSearch(self):
+        tree, top = createTree(lazy=True)
+        top.setOpened(['A.1'])
+        sent = walk(tree.items)
+        assert sent['A'][1] == ['A.1', 'A.2']
+        assert sent['A.1'][1] == ['A.1.1', 'A.1.2']
+        assert sent['B'][1] == []
+
+        top.setSearch('b.2')
+        sent = walk(tree.items)
+        assert sent['B'][1] == ['B.1', 'B.2']
+        assert tree.search == 'b.2'